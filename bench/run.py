@@ -0,0 +1,479 @@
+#!/usr/bin/env python
+
+"""Benchmark the CLI paths on synthetic athletes against a local mock API.
+
+Each case builds fresh synthetic athletes (see synthetic.py) in a temporary
+directory, points IntervalsClient at src/mock_server.py running in a child
+process (via INTERVALS_BASE_URL), and times one CLI path. Results are
+printed as JSON:
+
+    python bench/run.py                                 # default matrix
+    python bench/run.py --years 1,5,10 --athletes 1,50,500 --output bench.json
+    python bench/run.py --cases fetch_full,push --no-memory
+    python bench/run.py --baseline bench.json           # exit 1 on regressions
+    python bench/run.py --cases fetch_full --latency 0.05 --fail-every 7 --rate-limit-every 11
+
+Single-athlete cases run once per --years value; batch_* cases run once per
+--athletes value with --batch-years of history each. Every result has the
+wall time (best of --repeat runs), the peak traced Python memory of a
+separate run, the API requests made per route, and the faults the mock
+injected. Injected 429s sleep for their Retry-After (--retry-after).
+
+Batch cases must scale linearly: if the time per athlete at the largest
+--athletes value exceeds --scaling-limit times that at the smallest, the
+run exits 1 even without a baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import planner  # noqa: E402
+from analyzer import analyze_weeks, current_week_number, season_weeks  # noqa: E402
+from fetcher import get_store  # noqa: E402
+from forecast import forecast_plan  # noqa: E402
+from main import main as cli  # noqa: E402
+from mock_server import Faults, MockAthlete, MockIntervals  # noqa: E402
+from pusher import prepare_events  # noqa: E402
+from session import Session  # noqa: E402
+from synthetic import AthleteFixture, make_athlete  # noqa: E402
+
+DEFAULT_YEARS = "1,5,10"
+DEFAULT_ATHLETES = "1,10,50"
+PLAN_WEEKS = 52
+BLOCK_WEEKS = 13
+BENCH_RATE = 1000.0  # req/s for the client throttle; the mock has no limit
+TOLERANCE = 0.25  # allowed relative slowdown / memory growth against a baseline
+MIN_WALL_DELTA = 0.02  # seconds; smaller differences are timer noise
+SCALING_LIMIT = 2.0  # allowed growth of per-athlete batch time from the smallest to the largest roster
+
+
+# ── Mock server in a child process ──────────────────────
+#
+# Keeps the server's threads and response buffers out of the timings and
+# the traced memory of the process under test.
+
+def _serve(conn, faults: dict) -> None:
+    server = MockIntervals(faults=Faults(**faults))
+    conn.send(server.start())
+    while True:
+        command, arg = conn.recv()
+        if command == "athlete":
+            server.add_athlete(MockAthlete(*arg))
+            conn.send(None)
+        elif command == "counts":
+            conn.send((server.counts(), server.injected_counts()))
+        elif command == "reset":
+            server.reset_counts()
+            conn.send(None)
+        elif command == "stop":
+            server.stop()
+            conn.send(None)
+            return
+
+
+class MockProcess:
+    def __init__(self, faults: Faults):
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(child, asdict(faults)), daemon=True,
+        )
+        self._process.start()
+        self.base_url = self._conn.recv()
+
+    def call(self, command: str, arg=None):
+        self._conn.send((command, arg))
+        return self._conn.recv()
+
+    def add_athlete(self, fixture: AthleteFixture, ftp: int) -> None:
+        self.call("athlete", (fixture.athlete_id, fixture.activities, fixture.wellness, ftp))
+
+    def stop(self) -> None:
+        self.call("stop")
+        self._process.join()
+
+
+# ── Workspaces ──────────────────────────────────────────
+
+@dataclass
+class Workspace:
+    root: Path
+    roster: Path
+    athletes: list[AthleteFixture]
+    years: float
+    options: argparse.Namespace
+
+    def session(self, index: int = 0) -> Session:
+        a = self.athletes[index]
+        return Session(a.config_path, a.data_dir, a.plan_dir)
+
+    def batch(self, command: str, *argv: str) -> None:
+        """Run `main.py batch <command>` over every athlete in the workspace."""
+        run_cli(
+            "batch", command, "--roster", str(self.roster),
+            "--rate", str(self.options.rate), "--workers", str(self.options.workers),
+            *argv,
+        )
+
+    def fetch(self, full: bool = True) -> None:
+        self.batch("fetch", "--days", str(int(self.years * 365)), *(["--full"] if full else []))
+
+
+def make_workspace(
+    root: Path,
+    server: MockProcess,
+    athletes: int,
+    years: float,
+    options: argparse.Namespace,
+    legacy_json: bool = False,
+) -> Workspace:
+    fixtures = [
+        make_athlete(root, i, years, options.plan_weeks, options.block_weeks, legacy_json)
+        for i in range(athletes)
+    ]
+    roster = root / "roster.toml"
+    roster.write_text("".join(
+        f'[[athlete]]\nname = "{f.root.name}"\nathlete_id = "{f.athlete_id}"\n'
+        f'api_key = "bench"\ndir = "{f.root.name}"\n\n'
+        for f in fixtures
+    ))
+    ws = Workspace(root, roster, fixtures, years, options)
+    for i, f in enumerate(fixtures):
+        server.add_athlete(f, ws.session(i).config["athlete"]["ftp"])
+
+    os.environ["INTERVALS_BASE_URL"] = server.base_url
+    # Module-level state a fresh CLI process would not have
+    planner._caches.clear()
+    return ws
+
+
+def run_cli(*argv: str) -> None:
+    saved = sys.argv
+    sys.argv = ["main.py", *argv]
+    try:
+        cli()
+    except SystemExit as exc:
+        if exc.code:
+            raise RuntimeError(f"main.py {' '.join(argv)} exited with status {exc.code}") from None
+    finally:
+        sys.argv = saved
+
+
+# ── Cases: setup(workspace) -> the call being measured ──
+
+def _import(ws: Workspace) -> Callable:
+    return lambda: get_store(ws.athletes[0].data_dir).count("activities")
+
+
+def _fetch_full(ws: Workspace) -> Callable:
+    return ws.fetch
+
+
+def _fetch_incremental(ws: Workspace) -> Callable:
+    ws.fetch()
+    return lambda: ws.fetch(full=False)
+
+
+def _with_data(command: str, *argv: str) -> Callable[[Workspace], Callable]:
+    def setup(ws: Workspace) -> Callable:
+        ws.fetch()
+        planner._caches.clear()
+        return lambda: ws.batch(command, *argv)
+    return setup
+
+
+def _analyze_season(ws: Workspace) -> Callable:
+    ws.fetch()
+    return lambda: analyze_weeks(*season_weeks(ws.session()), ws.session())
+
+
+def _forecast(ws: Workspace) -> Callable:
+    ws.fetch()
+    return lambda: forecast_plan(ws.session())
+
+
+def _all_weeks(ws: Workspace) -> list[int]:
+    return list(range(1, ws.options.plan_weeks + 1))
+
+
+def _parse_block_cold(ws: Workspace) -> Callable:
+    return lambda: planner.parse_weeks(_all_weeks(ws), ws.athletes[0].plan_dir, ws.athletes[0].data_dir)
+
+
+def _parse_block_warm(ws: Workspace) -> Callable:
+    planner.parse_weeks(_all_weeks(ws), ws.athletes[0].plan_dir, ws.athletes[0].data_dir)
+
+    def run() -> None:
+        planner._caches.clear()  # reload the pickled plan cache like a new process
+        planner.parse_weeks(_all_weeks(ws), ws.athletes[0].plan_dir, ws.athletes[0].data_dir)
+    return run
+
+
+def _prepare_events(ws: Workspace) -> Callable:
+    """Fatigue-adjusted payloads for every plan week, one week at a time."""
+    ws.fetch()
+
+    def run() -> None:
+        session = ws.session()
+        by_week = planner.parse_weeks(_all_weeks(ws), session.plan_dir, session.data_dir)
+        for week, workouts in by_week.items():
+            prepare_events(workouts, fatigue_adjust=True, week=week, session=session)
+    return run
+
+
+def _push(ws: Workspace) -> Callable:
+    ws.fetch()
+    week = current_week_number(ws.session()) + 1
+    return lambda: ws.batch("push", "--week", str(week))
+
+
+SINGLE_CASES: dict[str, Callable[[Workspace], Callable]] = {
+    "import": _import,
+    "fetch_full": _fetch_full,
+    "fetch_incremental": _fetch_incremental,
+    "status": _with_data("status"),
+    "analyze_week": _with_data("analyze"),
+    "analyze_season": _analyze_season,
+    "compliance": _with_data("compliance"),
+    "forecast": _forecast,
+    "parse_block_cold": _parse_block_cold,
+    "parse_block_warm": _parse_block_warm,
+    "prepare_events": _prepare_events,
+    "push": _push,
+}
+
+BATCH_CASES: dict[str, Callable[[Workspace], Callable]] = {
+    "batch_fetch": _fetch_full,
+    "batch_status": _with_data("status"),
+    "batch_analyze": _with_data("analyze"),
+}
+
+
+# ── Measurement ─────────────────────────────────────────
+
+def measure(
+    name: str,
+    setup: Callable[[Workspace], Callable],
+    server: MockProcess,
+    athletes: int,
+    years: float,
+    options: argparse.Namespace,
+) -> dict:
+    """Time one case (best of options.repeat) and trace its peak memory.
+
+    Every run gets a fresh workspace; only the call returned by setup is
+    measured, with its output discarded.
+    """
+    def prepared(tmp: str) -> Callable:
+        ws = make_workspace(Path(tmp), server, athletes, years, options, legacy_json=name == "import")
+        with contextlib.redirect_stdout(io.StringIO()):
+            call = setup(ws)
+        server.call("reset")
+        return call
+
+    walls = []
+    requests: dict[str, int] = {}
+    injected: dict[int, int] = {}
+    for _ in range(options.repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            call = prepared(tmp)
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                call()
+                walls.append(time.perf_counter() - start)
+            requests, injected = server.call("counts")
+
+    peak = None
+    if options.memory:
+        with tempfile.TemporaryDirectory() as tmp:
+            call = prepared(tmp)
+            with contextlib.redirect_stdout(io.StringIO()):
+                tracemalloc.start()
+                try:
+                    call()
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+    return {
+        "case": name,
+        "years": years,
+        "athletes": athletes,
+        "wall_s": round(min(walls), 4),
+        "wall_runs": [round(w, 4) for w in walls],
+        "peak_mib": round(peak / 2 ** 20, 2) if peak is not None else None,
+        "requests": sum(requests.values()),
+        "requests_by_route": dict(sorted(requests.items())),
+        "injected": {str(status): n for status, n in sorted(injected.items())},
+    }
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of results against a previous run's JSON output."""
+    previous = {(r["case"], r["years"], r["athletes"]): r for r in baseline.get("results", [])}
+    problems = []
+    for r in results:
+        base = previous.get((r["case"], r["years"], r["athletes"]))
+        if not base:
+            continue
+        label = f"{r['case']} ({r['years']}y × {r['athletes']})"
+        if (r["wall_s"] > base["wall_s"] * (1 + tolerance)
+                and r["wall_s"] - base["wall_s"] > MIN_WALL_DELTA):
+            problems.append(f"{label}: wall {base['wall_s']:.3f}s → {r['wall_s']:.3f}s")
+        if r["peak_mib"] and base.get("peak_mib") and r["peak_mib"] > base["peak_mib"] * (1 + tolerance):
+            problems.append(f"{label}: peak memory {base['peak_mib']:.1f} → {r['peak_mib']:.1f} MiB")
+        if r["requests"] > base["requests"]:
+            problems.append(f"{label}: requests {base['requests']} → {r['requests']}")
+    return problems
+
+
+def scaling(results: list[dict], limit: float) -> list[str]:
+    """Batch cases whose time per athlete grows with the roster size.
+
+    Needs no baseline: a batch command should be linear in the roster, so
+    the per-athlete time of the largest roster is compared with that of
+    the smallest one in the same run.
+    """
+    problems = []
+    for name in BATCH_CASES:
+        runs = sorted((r for r in results if r["case"] == name), key=lambda r: r["athletes"])
+        if len(runs) < 2 or runs[0]["athletes"] == runs[-1]["athletes"]:
+            continue
+        small, large = runs[0], runs[-1]
+        per_small = small["wall_s"] / small["athletes"]
+        per_large = large["wall_s"] / large["athletes"]
+        if per_large > per_small * limit and large["wall_s"] - per_small * large["athletes"] > MIN_WALL_DELTA:
+            problems.append(
+                f"{name}: {per_small * 1000:.1f} ms/athlete at {small['athletes']} → "
+                f"{per_large * 1000:.1f} ms/athlete at {large['athletes']} (superlinear)"
+            )
+    return problems
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _numbers(text: str, kind: type = int) -> list:
+    return [kind(n) for n in text.split(",") if n]
+
+
+def main() -> None:
+    cases = [*SINGLE_CASES, *BATCH_CASES]
+    parser = argparse.ArgumentParser(description="Benchmark CLI paths on synthetic athletes")
+    parser.add_argument("--years", default=DEFAULT_YEARS,
+                        help=f"History lengths for single-athlete cases (default: {DEFAULT_YEARS})")
+    parser.add_argument("--athletes", default=DEFAULT_ATHLETES,
+                        help=f"Roster sizes for batch_* cases (default: {DEFAULT_ATHLETES})")
+    parser.add_argument("--batch-years", type=float, default=1,
+                        help="Years of history per athlete in batch_* cases (default: 1)")
+    parser.add_argument("--plan-weeks", type=int, default=PLAN_WEEKS,
+                        help=f"Plan length in weeks (default: {PLAN_WEEKS})")
+    parser.add_argument("--block-weeks", type=int, default=BLOCK_WEEKS,
+                        help=f"Weeks per plan/block_*.md file (default: {BLOCK_WEEKS})")
+    parser.add_argument("--cases", help=f"Comma-separated subset of: {', '.join(cases)}")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per case, best reported")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="Skip the tracemalloc run")
+    parser.add_argument("--rate", type=float, default=BENCH_RATE,
+                        help=f"Client request rate (default: {BENCH_RATE:.0f}/s)")
+    parser.add_argument("--workers", type=int, default=8, help="Batch workers (default: 8)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock: seconds added per response")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Mock: every Nth request gets a 429")
+    parser.add_argument("--retry-after", type=float, default=0.1,
+                        help="Mock: Retry-After seconds sent with 429s (default: 0.1)")
+    parser.add_argument("--fail-every", type=int, default=0, help="Mock: every Nth request gets a 503")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help=f"Allowed relative regression (default: {TOLERANCE})")
+    parser.add_argument("--scaling-limit", type=float, default=SCALING_LIMIT,
+                        help="Allowed growth of per-athlete batch time across --athletes; "
+                             f"exceeding it exits 1 (default: {SCALING_LIMIT:g}×)")
+    args = parser.parse_args()
+
+    selected = args.cases.split(",") if args.cases else cases
+    unknown = set(selected) - set(cases)
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+
+    plan = [(name, SINGLE_CASES[name], 1, years)
+            for name in SINGLE_CASES if name in selected
+            for years in _numbers(args.years, float)]
+    plan += [(name, BATCH_CASES[name], athletes, args.batch_years)
+             for name in BATCH_CASES if name in selected
+             for athletes in _numbers(args.athletes)]
+
+    faults = Faults(
+        latency=args.latency,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+        fail_every=args.fail_every,
+    )
+    server = MockProcess(faults)
+    results = []
+    try:
+        for name, setup, athletes, years in plan:
+            result = measure(name, setup, server, athletes, years, args)
+            peak = "—" if result["peak_mib"] is None else f"{result['peak_mib']:.1f}"
+            print(f"{name:<18} {years:>4g}y × {athletes:<4} {result['wall_s']:8.3f}s "
+                  f"{peak:>8} MiB {result['requests']:6} req", file=sys.stderr)
+            results.append(result)
+    finally:
+        server.stop()
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "plan_weeks": args.plan_weeks,
+            "block_weeks": args.block_weeks,
+            "repeat": args.repeat,
+            "faults": asdict(faults),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    problems = scaling(results, args.scaling_limit)
+    if args.baseline:
+        problems += compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
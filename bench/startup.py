@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+
+"""Time CLI process startup: interpreter start, imports and the command itself.
+
+Runs ``python src/main.py <command>`` as fresh subprocesses against the
+repository's own config, plan and data, and reports the best wall time
+over --repeat runs. One extra run per command with ``-X importtime``
+gives the total import time and whether the heavy third-party modules
+(requests, dotenv, tabulate) were loaded at all:
+
+    python bench/startup.py
+    python bench/startup.py --commands status,plan-week --repeat 20 --output startup.json
+    python bench/startup.py --baseline startup.json     # exit 1 on regressions
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN = ROOT / "src" / "main.py"
+
+DEFAULT_COMMANDS = "--help,status,plan-week,analyze,forecast,fetch --help"
+HEAVY_MODULES = ("requests", "dotenv", "tabulate")
+TOLERANCE = 0.25  # allowed relative slowdown against a baseline
+MIN_WALL_DELTA = 0.01  # seconds; smaller differences are process-spawn noise
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _run(argv: list[str], *flags: str) -> subprocess.CompletedProcess:
+    # No terminal: commands that prompt (zones) would block, so none are defaults
+    return subprocess.run(
+        [sys.executable, *flags, str(MAIN), *argv],
+        cwd=ROOT,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": ""},
+    )
+
+
+def wall_time(argv: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _run(argv)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def import_profile(argv: list[str], top: int) -> dict:
+    """Total import time, heavy modules loaded and the slowest top-level imports."""
+    stderr = _run(argv, "-X", "importtime").stderr
+    total_us = 0
+    modules: dict[str, int] = {}
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        modules[name] = cumulative
+        if indent == 1:  # imported directly by the script, not by another module
+            total_us += cumulative
+    slowest = sorted(modules.items(), key=lambda m: m[1], reverse=True)
+    return {
+        "import_s": round(total_us / 1e6, 4),
+        "heavy": [m for m in HEAVY_MODULES if m in modules],
+        "slowest": {name: round(us / 1e6, 4) for name, us in slowest[:top]},
+    }
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    previous = {r["command"]: r for r in baseline}
+    regressions = []
+    for r in results:
+        before = previous.get(r["command"])
+        if before is None:
+            continue
+        delta = r["wall_s"] - before["wall_s"]
+        if delta > MIN_WALL_DELTA and delta > before["wall_s"] * tolerance:
+            regressions.append(
+                f"{r['command']}: wall {before['wall_s']:.3f}s → {r['wall_s']:.3f}s"
+            )
+        for module in set(r["heavy"]) - set(before["heavy"]):
+            regressions.append(f"{r['command']}: now imports {module}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", default=DEFAULT_COMMANDS,
+                        help=f"Comma-separated CLI invocations (default: {DEFAULT_COMMANDS})")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per command; the best is kept (default: 10)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports listed per command (default: 5)")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    parser.add_argument("--baseline", help="Results JSON to compare against; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help=f"Allowed relative slowdown (default: {TOLERANCE})")
+    args = parser.parse_args()
+
+    results = []
+    for command in args.commands.split(","):
+        argv = command.split()
+        results.append({
+            "command": command,
+            "wall_s": round(wall_time(argv, args.repeat), 4),
+            **import_profile(argv, args.top),
+        })
+        print(f"  {command:<16} {results[-1]['wall_s'] * 1000:7.1f} ms", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
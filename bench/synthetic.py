@@ -0,0 +1,207 @@
+"""Deterministic synthetic athletes: activity/wellness histories, config and plan blocks."""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CONFIG_TEMPLATE = ROOT / "config.toml"
+
+RIDE_TYPES = ("Ride", "Ride", "VirtualRide", "MountainBikeRide")
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Rotating structured workouts for plan blocks
+WORKOUTS = (
+    "- Warmup 10m 55%\n- 5m 75%\n\n{n}x\n- Work 8m 90% 90rpm\n- Recovery 4m 55%\n\n- Cooldown 5m 50%",
+    "- Warmup 10m 55%\n\n{n}x\n- Over 1m 105%\n- Under 2m 88%\n\n- 5m 55%\n- Cooldown 6m 50%",
+    "- Warmup Ramp 10m 50-75%\n\n{n}x\n- VO2 3m 115%\n- Recovery 3m 50%\n\n- Cooldown 7m 50%",
+    "- Warmup 10m 55%\n- Ramp 10m 85-95% 90rpm\n- Recovery 5m 65%\n- 20m 70% 85-95rpm\n- Cooldown 5m 50%",
+)
+
+
+@dataclass
+class AthleteFixture:
+    athlete_id: str
+    root: Path
+    config_path: Path
+    plan_dir: Path
+    data_dir: Path
+    activities: list[dict]
+    wellness: list[dict]
+
+
+def generate_history(
+    years: float,
+    seed: int = 0,
+    end: date | None = None,
+) -> tuple[list[dict], list[dict]]:
+    """Daily activities and wellness for ``years`` ending at ``end`` (oldest first).
+
+    Wellness CTL/ATL follow the same exponential model as fitness.py so the
+    local engine has something realistic to validate against.
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    days = int(years * 365)
+    start = end - timedelta(days=days - 1)
+    k_ctl, k_atl = 1 - math.exp(-1 / 42), 1 - math.exp(-1 / 7)
+    ctl = atl = 40.0
+    eftp = 250.0
+    activities: list[dict] = []
+    wellness: list[dict] = []
+    for i in range(days):
+        day = start + timedelta(days=i)
+        load = 0.0
+        sessions = 0 if rng.random() < 0.18 else (2 if rng.random() < 0.12 else 1)
+        for s in range(sessions):
+            strength = s == 1 and rng.random() < 0.5
+            moving = rng.randint(1800, 2700) if strength else int(rng.triangular(2400, 14400, 3600))
+            intensity = 0.0 if strength else rng.uniform(0.55, 0.92)
+            tss = moving / 3600 * 30 if strength else moving / 3600 * intensity ** 2 * 100
+            load += tss
+            watts = None if strength else round(eftp * intensity * 0.93)
+            activities.append({
+                "id": f"i{seed}-{i}-{s}",
+                "start_date_local": f"{day.isoformat()}T{7 + 9 * s:02d}:00:00",
+                "name": "Strength" if strength else "Ride",
+                "type": "WeightTraining" if strength else rng.choice(RIDE_TYPES),
+                "moving_time": moving,
+                "distance": 0.0 if strength else moving * rng.uniform(6.5, 9.5),
+                "icu_training_load": round(tss, 1),
+                "icu_intensity": round(intensity * 100, 1),
+                "icu_average_watts": watts,
+                "icu_weighted_avg_watts": round(eftp * intensity) if watts else None,
+                "average_heartrate": rng.randint(110, 155),
+                "total_elevation_gain": 0.0 if strength else rng.randint(0, 2000),
+            })
+        ctl += (load - ctl) * k_ctl
+        atl += (load - atl) * k_atl
+        eftp += rng.uniform(-0.5, 0.52)
+        wellness.append({
+            "id": day.isoformat(),
+            "ctl": round(ctl, 2),
+            "atl": round(atl, 2),
+            "restingHR": rng.randint(44, 55),
+            "weight": round(76 + rng.uniform(-1, 1), 1),
+            "sleepSecs": rng.randint(6 * 3600, 9 * 3600),
+            "soreness": rng.randint(1, 3),
+            "fatigue": rng.randint(1, 3),
+            "mood": rng.randint(1, 3),
+            "Ride_eftp": round(eftp, 1),
+        })
+    return activities, wellness
+
+
+def write_config(path: Path, plan_start: date, weeks: int) -> None:
+    """Repo config.toml with the plan moved to ``plan_start`` and its phases
+    stretched to ``weeks``."""
+    text = CONFIG_TEMPLATE.read_text()
+    template_weeks = int(re.search(r"^weeks = (\d+)", text, flags=re.M).group(1))
+
+    def stretch(match: re.Match) -> str:
+        first, last = (int(w) for w in match.group(1, 2))
+        first = (first - 1) * weeks // template_weeks + 1
+        last = last * weeks // template_weeks
+        return f"= [{first}, {max(first, last)},"
+
+    text = re.sub(r"= \[(\d+), (\d+),", stretch, text)
+    text = re.sub(r'^start_date = ".*"', f'start_date = "{plan_start.isoformat()}"', text, flags=re.M)
+    text = re.sub(r"^weeks = \d+", f"weeks = {weeks}", text, flags=re.M)
+    text = re.sub(r'^event_date = ".*"',
+                  f'event_date = "{(plan_start + timedelta(weeks=weeks, days=-1)).isoformat()}"',
+                  text, flags=re.M)
+    path.write_text(text)
+
+
+def write_plan_block(path: Path, first_week: int, weeks: int, plan_start: date, seed: int = 0) -> None:
+    """A block file in the same markdown shape as plan/block_*.md."""
+    rng = random.Random(seed)
+    lines = [f"# Block: Synthetic (Weeks {first_week}–{first_week + weeks - 1})", ""]
+    for week in range(first_week, first_week + weeks):
+        monday = plan_start + timedelta(weeks=week - 1)
+        monday -= timedelta(days=monday.weekday())
+        sunday = monday + timedelta(days=6)
+        end = f"{sunday.day}" if sunday.month == monday.month else f"{MONTHS[sunday.month - 1]} {sunday.day}"
+        lines += [
+            # The parser takes the year from the end of the range
+            f"## Week {week} ({MONTHS[monday.month - 1]} {monday.day} – {end}, {monday.year}) — Build",
+            "",
+            "| Day | Session | Duration | Description | Zones |",
+            "|-----|---------|----------|-------------|-------|",
+        ]
+        names = [
+            ("Mon", "Strength AM", "35min", "Lower body + core", "—"),
+            ("Mon", "Easy spin PM (indoor)", "40m", "Z1 flush ride", "Z1"),
+            ("Tue", "Indoor: Intervals A", f"{rng.randint(60, 80)}m", "Structured", "Z3-Z4 (see workout)"),
+            ("Wed", "Easy outdoor ride", "1h15", "Keep it conversational", "Z2"),
+            ("Thu", "Indoor: Intervals B", f"{rng.randint(60, 80)}m", "Structured", "Z3-Z5 (see workout)"),
+            ("Fri", "Strength", "35min", "Lower body + core", "—"),
+            ("Sat", "Long outdoor ride", f"{rng.randint(3, 5)}h00", "Endurance in hills", "Z2 avg"),
+            ("Sun", "Moderate outdoor ride", "1h45", "Include climbs", "Z2-Z3"),
+        ]
+        for day, name, duration, description, zones in names:
+            day_of_month = (monday + timedelta(days=DAYS.index(day))).day
+            lines.append(f"| **{day} {day_of_month}** | {name} | {duration} | {description} | {zones} |")
+        for heading, template in (("Tuesday", WORKOUTS[week % 4]), ("Thursday", WORKOUTS[(week + 1) % 4])):
+            lines += [
+                "",
+                f"### {heading} — Intervals",
+                "",
+                "```",
+                template.format(n=rng.randint(3, 5)),
+                "```",
+            ]
+        lines += ["", "---", ""]
+    path.write_text("\n".join(lines))
+
+
+def make_athlete(
+    root: Path,
+    index: int,
+    years: float,
+    plan_weeks: int = 25,
+    block_weeks: int = 25,
+    legacy_json: bool = False,
+) -> AthleteFixture:
+    """Create an athlete directory (config.toml, plan/, data/) plus its history.
+
+    The plan is ``plan_weeks`` long with today in its middle week, split
+    into block files of ``block_weeks``. With
+    ``legacy_json`` the history is also written as data/activities.json and
+    data/wellness.json, as older versions of the fetcher did.
+    """
+    athlete_dir = root / f"athlete{index}"
+    plan_dir = athlete_dir / "plan"
+    data_dir = athlete_dir / "data"
+    plan_dir.mkdir(parents=True, exist_ok=True)
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    today = date.today()
+    plan_start = today - timedelta(weeks=plan_weeks // 2, days=today.weekday())
+    write_config(athlete_dir / "config.toml", plan_start, plan_weeks)
+    for block, first in enumerate(range(1, plan_weeks + 1, block_weeks)):
+        write_plan_block(
+            plan_dir / f"block_{block + 1:02d}_synthetic.md",
+            first, min(block_weeks, plan_weeks - first + 1), plan_start, seed=index,
+        )
+
+    activities, wellness = generate_history(years, seed=index, end=today)
+    if legacy_json:
+        (data_dir / "activities.json").write_text(json.dumps(activities))
+        (data_dir / "wellness.json").write_text(json.dumps(wellness))
+    return AthleteFixture(
+        athlete_id=f"i{index}",
+        root=athlete_dir,
+        config_path=athlete_dir / "config.toml",
+        plan_dir=plan_dir,
+        data_dir=data_dir,
+        activities=activities,
+        wellness=wellness,
+    )
@@ -2,28 +2,24 @@
 
 from __future__ import annotations
 
-import tomllib
 from datetime import date, timedelta
-from pathlib import Path
 
+from fitness import FitnessSeries, compute_fitness
 from models import Activity, WellnessDay, WeekSummary, FitnessSnapshot
-from fetcher import load_json
+from planned_load import planned_tss
+from planner import parse_weeks
+from profiler import span
+from session import Session, default_session
 
-CONFIG_PATH = Path(__file__).parent.parent / "config.toml"
 
-
-def load_config() -> dict:
-    return tomllib.loads(CONFIG_PATH.read_text())
-
-
-def get_plan_start() -> date:
-    cfg = load_config()
+def get_plan_start(session: Session | None = None) -> date:
+    cfg = (session or default_session()).config
     return date.fromisoformat(cfg["plan"]["start_date"])
 
 
-def week_dates(week_number: int) -> tuple[date, date]:
+def week_dates(week_number: int, session: Session | None = None) -> tuple[date, date]:
     """Return (Monday, Sunday) for a given training week number."""
-    start = get_plan_start()
+    start = get_plan_start(session)
     week_start = start + timedelta(weeks=week_number - 1)
     # Align to Monday
     week_start -= timedelta(days=week_start.weekday())
@@ -31,9 +27,9 @@ def week_dates(week_number: int) -> tuple[date, date]:
     return week_start, week_end
 
 
-def get_phase(week_number: int) -> tuple[str, float, float]:
+def get_phase(week_number: int, session: Session | None = None) -> tuple[str, float, float]:
     """Return (phase_name, min_hours, max_hours) for a week number."""
-    cfg = load_config()
+    cfg = (session or default_session()).config
     for name, bounds in cfg["phases"].items():
         start_w, end_w, min_h, max_h = bounds
         if start_w <= week_number <= end_w:
@@ -42,34 +38,38 @@ def get_phase(week_number: int) -> tuple[str, float, float]:
     return "Unknown", 0, 0
 
 
-def current_week_number() -> int:
+def current_week_number(session: Session | None = None) -> int:
     """Calculate which training week we're in based on plan start date."""
-    start = get_plan_start()
+    start = get_plan_start(session)
     today = date.today()
     delta = (today - start).days
     return max(1, delta // 7 + 1)
 
 
-def load_activities() -> list[Activity]:
-    data = load_json("activities.json")
-    if not data:
-        return []
-    return [Activity.from_api(a) for a in data]
+def load_activities(
+    start: date | None = None,
+    end: date | None = None,
+    session: Session | None = None,
+) -> list[Activity]:
+    """Load cached activities, optionally limited to a date range (inclusive)."""
+    records = (session or default_session()).records("activities", start, end)
+    return [Activity.from_api(a) for a in records]
 
 
-def load_wellness() -> list[WellnessDay]:
-    data = load_json("wellness.json")
-    if not data:
-        return []
-    return [WellnessDay.from_api(w) for w in data]
+def load_wellness(
+    start: date | None = None,
+    end: date | None = None,
+    session: Session | None = None,
+) -> list[WellnessDay]:
+    """Load cached wellness days, optionally limited to a date range (inclusive)."""
+    records = (session or default_session()).records("wellness", start, end)
+    return [WellnessDay.from_api(w) for w in records]
 
 
-def get_latest_fitness() -> FitnessSnapshot | None:
-    wellness = load_wellness()
-    if not wellness:
-        return None
-    # Find the most recent day with CTL data
-    for w in reversed(wellness):
+def _latest_fitness(store) -> FitnessSnapshot | None:
+    # Walk back from the most recent day until one has CTL data
+    for record in store.iter_records("wellness", newest_first=True):
+        w = WellnessDay.from_api(record)
         if w.ctl is not None:
             return FitnessSnapshot(
                 date=w.date,
@@ -80,20 +80,114 @@ def get_latest_fitness() -> FitnessSnapshot | None:
     return None
 
 
-def analyze_week(week_number: int) -> WeekSummary:
+def get_latest_fitness(session: Session | None = None) -> FitnessSnapshot | None:
+    return (session or default_session()).query("latest_fitness", _latest_fitness)
+
+
+def local_fitness(end: date | None = None, session: Session | None = None) -> FitnessSeries:
+    """CTL/ATL series computed locally from cached activity loads through ``end``.
+
+    Seeded from the first cached wellness day with server CTL/ATL (so it lines
+    up with Intervals.icu despite the truncated history), otherwise from zero
+    at the first activity.
+    """
+    session = session or default_session()
+    end = end or date.today()
+
+    def build(store) -> FitnessSeries:
+        with span("fitness.compute"):
+            seed = next(
+                (WellnessDay.from_api(r) for r in store.iter_records("wellness")
+                 if r.get("ctl") is not None and r.get("atl") is not None),
+                None,
+            )
+            activities = load_activities(session=session)
+            if seed:
+                return compute_fitness(activities, seed.date + timedelta(days=1), end, seed.ctl, seed.atl)
+            start = activities[0].date if activities else end
+            return compute_fitness(activities, start, end)
+
+    return session.query(("local_fitness", end), build)
+
+
+def analyze_week(week_number: int, session: Session | None = None) -> WeekSummary:
     """Build a WeekSummary from cached data."""
-    start, end = week_dates(week_number)
-    phase, min_h, max_h = get_phase(week_number)
+    start, end = week_dates(week_number, session)
+    with span("analyze.week", week=week_number):
+        return _summarize_week(
+            week_number,
+            load_activities(start, end, session),
+            load_wellness(start, end, session),
+            session,
+            planned_week_tss([week_number], session).get(week_number, 0.0),
+        )
 
-    activities = load_activities()
-    wellness = load_wellness()
 
-    # Filter activities for this week
-    week_activities = [
-        a for a in activities
-        if start <= a.date <= end
+def analyze_weeks(
+    first_week: int,
+    last_week: int,
+    session: Session | None = None,
+) -> list[WeekSummary]:
+    """Build WeekSummary rows for a range of weeks in a single pass.
+
+    Loads the whole date range once and buckets activities and wellness by
+    week offset instead of re-querying per week.
+    """
+    if last_week < first_week:
+        return []
+    with span("analyze.weeks", weeks=last_week - first_week + 1):
+        return _analyze_weeks(first_week, last_week, session)
+
+
+def _analyze_weeks(first_week: int, last_week: int, session: Session | None) -> list[WeekSummary]:
+    range_start, _ = week_dates(first_week, session)
+    _, range_end = week_dates(last_week, session)
+
+    n_weeks = last_week - first_week + 1
+    activity_buckets: list[list[Activity]] = [[] for _ in range(n_weeks)]
+    wellness_buckets: list[list[WellnessDay]] = [[] for _ in range(n_weeks)]
+    for a in load_activities(range_start, range_end, session):
+        activity_buckets[(a.date - range_start).days // 7].append(a)
+    for w in load_wellness(range_start, range_end, session):
+        wellness_buckets[(w.date - range_start).days // 7].append(w)
+
+    planned = planned_week_tss(list(range(first_week, last_week + 1)), session)
+    return [
+        _summarize_week(
+            first_week + i, activity_buckets[i], wellness_buckets[i], session,
+            planned.get(first_week + i, 0.0),
+        )
+        for i in range(n_weeks)
     ]
 
+
+def planned_week_tss(weeks: list[int], session: Session | None = None) -> dict[int, float]:
+    """Estimated TSS of each week's planned workouts (0 for unplanned weeks)."""
+    session = session or default_session()
+    cfg = session.config
+    return {
+        week: sum(planned_tss(workouts, cfg["athlete"]["ftp"], cfg["zones"]))
+        for week, workouts in parse_weeks(weeks, session.plan_dir, session.data_dir).items()
+    }
+
+
+def season_weeks(session: Session | None = None) -> tuple[int, int]:
+    """Return (first_week, last_week) covering the whole plan."""
+    cfg = (session or default_session()).config
+    return 1, int(cfg["plan"]["weeks"])
+
+
+def _summarize_week(
+    week_number: int,
+    week_activities: list[Activity],
+    week_wellness: list[WellnessDay],
+    session: Session | None = None,
+    planned: float = 0.0,
+) -> WeekSummary:
+    """Summarize one week's already-filtered activities and wellness."""
+    start, end = week_dates(week_number, session)
+    phase, min_h, max_h = get_phase(week_number, session)
+
     # Totals
     total_hours = sum(a.hours for a in week_activities)
     total_tss = sum(a.icu_training_load for a in week_activities)
@@ -106,9 +200,6 @@ def analyze_week(week_number: int) -> WeekSummary:
         if a.type == "WeightTraining"
     )
 
-    # Wellness for this week
-    week_wellness = [w for w in wellness if start <= w.date <= end]
-
     ctl_start = None
     ctl_end = None
     atl_end = None
@@ -148,6 +239,7 @@ def analyze_week(week_number: int) -> WeekSummary:
         strength_count=strength_count,
         planned_hours_min=min_h,
         planned_hours_max=max_h,
+        planned_tss=planned,
         ctl_start=ctl_start,
         ctl_end=ctl_end,
         atl_end=atl_end,
@@ -159,13 +251,28 @@ def analyze_week(week_number: int) -> WeekSummary:
     )
 
 
-def check_fatigue(week_number: int) -> dict:
+def check_fatigue(week_number: int, session: Session | None = None) -> dict:
     """Check if athlete is overly fatigued, suggest adjustments."""
-    cfg = load_config()
+    return _fatigue_result(analyze_week(week_number, session), session)
+
+
+def check_fatigue_weeks(
+    first_week: int,
+    last_week: int,
+    session: Session | None = None,
+) -> dict[int, dict]:
+    """check_fatigue for a range of weeks from a single analyze_weeks pass."""
+    return {
+        s.week_number: _fatigue_result(s, session)
+        for s in analyze_weeks(first_week, last_week, session)
+    }
+
+
+def _fatigue_result(summary: WeekSummary, session: Session | None = None) -> dict:
+    cfg = (session or default_session()).config
     tsb_warning = cfg["fatigue"]["tsb_warning"]
     power_reduction = cfg["fatigue"]["power_reduction"]
 
-    summary = analyze_week(week_number)
     result = {
         "fatigued": False,
         "tsb": summary.tsb_end,
@@ -183,12 +290,12 @@ def check_fatigue(week_number: int) -> dict:
     return result
 
 
-def check_zones(config_ftp: int) -> dict:
+def check_zones(config_ftp: int, session: Session | None = None) -> dict:
     """Compare configured FTP vs detected eFTP."""
-    cfg = load_config()
+    cfg = (session or default_session()).config
     drift_threshold = cfg["fatigue"]["eftp_drift_threshold"]
 
-    fitness = get_latest_fitness()
+    fitness = get_latest_fitness(session)
     if not fitness or not fitness.eftp:
         return {"drift": 0, "eftp": None, "message": "No eFTP data available."}
 
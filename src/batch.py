@@ -0,0 +1,220 @@
+"""Run fetch/analyze/compliance/push/status for every athlete in a roster file."""
+
+from __future__ import annotations
+
+import contextvars
+import io
+import os
+import sys
+import tomllib
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from analyzer import analyze_week, current_week_number, get_latest_fitness
+from compliance import compliance_report
+from display import bad, format_hours, format_ratio, format_tsb, header, ok, section, table
+from fetcher import HTTP_CACHE_DIR, fetch_all
+from intervals_client import REQUEST_RATE, IntervalsClient, RateLimiter, load_env
+from planner import parse_week
+from pusher import push_week
+from session import Session
+
+ROSTER_PATH = Path(__file__).parent.parent / "roster.toml"
+BATCH_WORKERS = 8
+
+
+@dataclass
+class Athlete:
+    name: str
+    athlete_id: str
+    api_key: str
+    config_path: Path
+    data_dir: Path
+    plan_dir: Path
+
+    def session(self) -> Session:
+        return Session(self.config_path, self.data_dir, self.plan_dir)
+
+    def client(self, limiter: RateLimiter, cache: bool = True) -> IntervalsClient:
+        # Only fetch and push talk to the API; the local commands work without a key
+        if not self.api_key:
+            raise ValueError(f"no API key for athlete '{self.name}'")
+        return IntervalsClient(
+            self.api_key,
+            self.athlete_id,
+            limiter=limiter,
+            cache_dir=self.data_dir / HTTP_CACHE_DIR if cache else None,
+        )
+
+
+def load_roster(path: Path = ROSTER_PATH) -> tuple[list[Athlete], dict]:
+    """Parse a roster file into athletes plus its [batch] settings.
+
+    Each [[athlete]] has a name, athlete_id, an api_key or api_key_env
+    (needed by fetch and push only), and a dir holding config.toml, plan/
+    and data/ (each overridable). Relative paths resolve against the roster
+    file's directory.
+    """
+    load_env()  # for api_key_env
+    roster = tomllib.loads(path.read_text())
+    base = path.parent
+    athletes = []
+    for entry in roster.get("athlete", []):
+        name = entry["name"]
+        root = base / entry.get("dir", name)
+        athletes.append(Athlete(
+            name=name,
+            athlete_id=str(entry["athlete_id"]),
+            api_key=entry.get("api_key") or os.getenv(entry.get("api_key_env", ""), ""),
+            config_path=base / entry["config"] if "config" in entry else root / "config.toml",
+            data_dir=base / entry["data_dir"] if "data_dir" in entry else root / "data",
+            plan_dir=base / entry["plan_dir"] if "plan_dir" in entry else root / "plan",
+        ))
+    return athletes, roster.get("batch", {})
+
+
+_output_buffer: contextvars.ContextVar[io.StringIO | None] = contextvars.ContextVar(
+    "batch_output", default=None,
+)
+
+
+class ContextOutput(io.TextIOBase):
+    """stdout replacement that captures each athlete's output separately.
+
+    The buffer lives in a context variable so threads spawned with the
+    caller's context (e.g. fetch_all's pool) write to the same athlete log.
+    """
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+
+    def capture(self) -> io.StringIO:
+        buffer = io.StringIO()
+        _output_buffer.set(buffer)
+        return buffer
+
+    def write(self, text: str) -> int:
+        return (_output_buffer.get() or self.fallback).write(text)
+
+    def flush(self) -> None:
+        self.fallback.flush()
+
+
+# ── Per-athlete tasks: each returns one row of the result table ──
+
+def _fetch(athlete: Athlete, limiter: RateLimiter, options: dict) -> list:
+    full = options.get("full", False)
+    results = fetch_all(
+        athlete.client(limiter, cache=not full),
+        days=options["days"],
+        full=full,
+        data_dir=athlete.data_dir,
+    )
+    return [len(results["activities"]), len(results["wellness"])]
+
+
+def _analyze(athlete: Athlete, limiter: RateLimiter, options: dict) -> list:
+    session = athlete.session()
+    week = options.get("week") or current_week_number(session)
+    s = analyze_week(week, session)
+    return [week, s.phase, format_hours(s.total_hours), s.compliance,
+            f"{s.total_tss:.0f}", format_tsb(s.tsb_end)]
+
+
+def _compliance(athlete: Athlete, limiter: RateLimiter, options: dict) -> list:
+    session = athlete.session()
+    week = options.get("week") or current_week_number(session)
+    _, weeks, _ = compliance_report(week, week, session)
+    c = weeks[week]
+    return [week, c.planned, c.done, c.partial + c.over, c.missed, c.extra,
+            format_ratio(c.duration_ratio), format_ratio(c.tss_ratio)]
+
+
+def _push(athlete: Athlete, limiter: RateLimiter, options: dict) -> list:
+    session = athlete.session()
+    week = options.get("week") or current_week_number(session) + 1
+    workouts = parse_week(week, athlete.plan_dir, athlete.data_dir)
+    if not workouts:
+        raise ValueError(f"no workouts found for week {week}")
+    counts = push_week(
+        athlete.client(limiter), workouts, week,
+        dry_run=options.get("dry_run", False), session=session,
+    )
+    return [week, counts["created"], counts["updated"], counts["unchanged"], counts["deleted"]]
+
+
+def _status(athlete: Athlete, limiter: RateLimiter, options: dict) -> list:
+    session = athlete.session()
+    fitness = get_latest_fitness(session)
+    ftp = session.config["athlete"]["ftp"]
+    if not fitness:
+        return ["—", "—", "—", "—", f"{ftp}W", "no data"]
+    return [f"{fitness.ctl:.1f}", f"{fitness.atl:.1f}", format_tsb(fitness.tsb),
+            f"{fitness.eftp:.0f}W" if fitness.eftp else "—", f"{ftp}W", str(fitness.date)]
+
+
+BATCH_COMMANDS: dict[str, tuple[Callable[[Athlete, RateLimiter, dict], list], list[str]]] = {
+    "fetch": (_fetch, ["Activities", "Wellness"]),
+    "analyze": (_analyze, ["Week", "Phase", "Hours", "Compliance", "TSS", "TSB"]),
+    "compliance": (_compliance, ["Week", "Planned", "Done", "Off target", "Missed", "Extra",
+                                 "Time vs plan", "TSS vs plan"]),
+    "push": (_push, ["Week", "Created", "Updated", "Unchanged", "Deleted"]),
+    "status": (_status, ["CTL", "ATL", "TSB", "eFTP", "FTP", "Data from"]),
+}
+
+
+def run_batch(
+    command: str,
+    athletes: list[Athlete],
+    options: dict,
+    workers: int = BATCH_WORKERS,
+    rate: float = REQUEST_RATE,
+    verbose: bool = False,
+) -> list[tuple[Athlete, list | None, str]]:
+    """Run a command for every athlete in parallel under one shared rate budget.
+
+    Returns (athlete, row, error) per athlete in roster order and prints a
+    consolidated table. Per-athlete output is captured and shown with verbose.
+    """
+    task, columns = BATCH_COMMANDS[command]
+    limiter = RateLimiter(rate=rate)
+    output = ContextOutput(sys.stdout)
+
+    def run(athlete: Athlete) -> tuple[list | None, str, str]:
+        buffer = output.capture()
+        try:
+            return task(athlete, limiter, options), "", buffer.getvalue()
+        except Exception as exc:  # one failing athlete must not abort the batch
+            return None, f"{type(exc).__name__}: {exc}", buffer.getvalue()
+
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, run, athlete)
+                for athlete in athletes
+            ]
+            outcomes = [future.result() for future in futures]
+    finally:
+        sys.stdout = output.fallback
+
+    if verbose:
+        for athlete, (_, _, log) in zip(athletes, outcomes):
+            print(section(f"\n{athlete.name}"))
+            print(log.rstrip() or "  (no output)")
+
+    print(header(f"Batch {command} — {len(athletes)} athlete(s)"))
+    rows = []
+    for athlete, (row, error, _) in zip(athletes, outcomes):
+        if row is None:
+            rows.append([athlete.name, bad("error")] + [""] * len(columns) + [error])
+        else:
+            rows.append([athlete.name, ok("ok")] + row + [""])
+    print(table(rows, ["Athlete", "Status"] + columns + ["Error"]))
+
+    failed = sum(1 for row, _, _ in outcomes if row is None)
+    if failed:
+        print(bad(f"\n  {failed} of {len(athletes)} athlete(s) failed."))
+    return [(a, row, error) for a, (row, error, _) in zip(athletes, outcomes)]
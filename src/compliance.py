@@ -0,0 +1,211 @@
+"""Pair planned workouts with the activities done on the day and score compliance."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+
+from analyzer import get_phase, load_activities, week_dates
+from models import Activity, PlannedWorkout
+from planned_load import estimate_tss, workout_loads
+from planner import parse_weeks
+from session import Session, default_session
+
+RIDE_TYPES = {"Ride", "VirtualRide", "MountainBikeRide", "GravelRide"}
+DURATION_LOW = 0.8  # below this share of planned time a session is "partial"
+DURATION_HIGH = 1.2  # above this it is "over"
+
+
+@dataclass
+class SessionMatch:
+    date: date
+    week_number: int
+    planned: PlannedWorkout | None
+    activity: Activity | None
+    planned_tss: float = 0.0
+    planned_if: float | None = None
+
+    @property
+    def status(self) -> str:
+        """done / partial / over / missed, or extra for unplanned activities."""
+        if self.planned is None:
+            return "extra"
+        if self.activity is None:
+            return "missed"
+        ratio = self.duration_ratio
+        if ratio is not None and ratio < DURATION_LOW:
+            return "partial"
+        if ratio is not None and ratio > DURATION_HIGH:
+            return "over"
+        return "done"
+
+    @property
+    def duration_ratio(self) -> float | None:
+        if not self.planned or not self.activity or not self.planned.duration_minutes:
+            return None
+        return self.activity.moving_time / (self.planned.duration_minutes * 60)
+
+    @property
+    def tss_ratio(self) -> float | None:
+        if not self.activity or not self.planned_tss:
+            return None
+        return self.activity.icu_training_load / self.planned_tss
+
+    @property
+    def intensity_ratio(self) -> float | None:
+        if not self.activity or not self.planned_if or not self.activity.icu_intensity:
+            return None
+        return _intensity_factor(self.activity) / self.planned_if
+
+
+@dataclass
+class ComplianceSummary:
+    planned: int = 0
+    done: int = 0
+    partial: int = 0
+    over: int = 0
+    missed: int = 0
+    extra: int = 0
+    planned_minutes: float = 0.0
+    actual_minutes: float = 0.0
+    planned_tss: float = 0.0
+    actual_tss: float = 0.0
+
+    def add(self, match: SessionMatch) -> None:
+        status = match.status
+        setattr(self, status, getattr(self, status) + 1)
+        if match.planned:
+            self.planned += 1
+            self.planned_minutes += match.planned.duration_minutes
+            self.planned_tss += match.planned_tss
+        if match.activity:
+            self.actual_minutes += match.activity.moving_time / 60
+            self.actual_tss += match.activity.icu_training_load
+
+    @property
+    def completion(self) -> float | None:
+        """Share of planned sessions that were ridden (done or over)."""
+        return (self.done + self.over) / self.planned if self.planned else None
+
+    @property
+    def duration_ratio(self) -> float | None:
+        return self.actual_minutes / self.planned_minutes if self.planned_minutes else None
+
+    @property
+    def tss_ratio(self) -> float | None:
+        return self.actual_tss / self.planned_tss if self.planned_tss else None
+
+
+def _intensity_factor(activity: Activity) -> float:
+    # Intervals.icu reports intensity as a percentage (e.g. 78.5)
+    value = activity.icu_intensity
+    return value / 100 if value > 3 else value
+
+
+def _kind(workout_type: str) -> str:
+    return "ride" if workout_type in RIDE_TYPES else workout_type
+
+
+def _similarity(planned: PlannedWorkout, activity: Activity) -> float:
+    """0–2 score: duration closeness plus a bonus for the exact type."""
+    planned_secs = planned.duration_minutes * 60
+    if planned_secs and activity.moving_time:
+        closeness = min(planned_secs, activity.moving_time) / max(planned_secs, activity.moving_time)
+    else:
+        closeness = 0.0
+    return closeness + (1.0 if planned.workout_type == activity.type else 0.5)
+
+
+def match_sessions(
+    workouts: list[PlannedWorkout],
+    activities: list[Activity],
+    ftp: float,
+    zones: dict,
+) -> list[SessionMatch]:
+    """Pair each planned workout with at most one same-day activity of its kind.
+
+    Activities are indexed by date so each workout only looks at its own
+    day; within a day the most similar pairs (type, duration) win. Rest
+    days (no duration) are ignored and unmatched activities come back as
+    extra sessions. Results are ordered by date.
+    """
+    by_day: dict[date, list[Activity]] = defaultdict(list)
+    for a in activities:
+        by_day[a.date].append(a)
+
+    planned_by_day: dict[date, list[int]] = defaultdict(list)
+    for i, w in enumerate(workouts):
+        if w.duration_minutes:
+            planned_by_day[w.date].append(i)
+
+    loads = workout_loads(workouts, ftp, zones)
+    matches: list[SessionMatch] = []
+    for day in sorted(planned_by_day.keys() | by_day.keys()):
+        planned = planned_by_day.get(day, [])
+        done = by_day.get(day, [])
+        candidates = sorted(
+            (
+                (_similarity(workouts[i], a), i, j)
+                for i in planned
+                for j, a in enumerate(done)
+                if _kind(workouts[i].workout_type) == _kind(a.type)
+            ),
+            reverse=True,
+        )
+        paired: dict[int, int] = {}
+        used: set[int] = set()
+        for _, i, j in candidates:
+            if i not in paired and j not in used:
+                paired[i] = j
+                used.add(j)
+
+        for i in planned:
+            w, load = workouts[i], loads[i]
+            matches.append(SessionMatch(
+                date=day,
+                week_number=w.week,
+                planned=w,
+                activity=done[paired[i]] if i in paired else None,
+                planned_tss=estimate_tss(w, load),
+                planned_if=load.intensity if load else None,
+            ))
+        for j, a in enumerate(done):
+            if j not in used:
+                matches.append(SessionMatch(date=day, week_number=0, planned=None, activity=a))
+    return matches
+
+
+def compliance_report(
+    first_week: int,
+    last_week: int,
+    session: Session | None = None,
+) -> tuple[list[SessionMatch], dict[int, ComplianceSummary], dict[str, ComplianceSummary]]:
+    """Match a range of weeks and aggregate per week and per phase.
+
+    Plan blocks and activities are each loaded once for the whole range.
+    """
+    session = session or default_session()
+    cfg = session.config
+    weeks = list(range(first_week, last_week + 1))
+    range_start, _ = week_dates(first_week, session)
+    _, range_end = week_dates(last_week, session)
+
+    workouts = [w for ws in parse_weeks(weeks, session.plan_dir, session.data_dir).values() for w in ws]
+    matches = match_sessions(
+        workouts,
+        load_activities(range_start, range_end, session),
+        cfg["athlete"]["ftp"],
+        cfg["zones"],
+    )
+
+    by_week = {week: ComplianceSummary() for week in weeks}
+    by_phase: dict[str, ComplianceSummary] = {}
+    phases = {week: get_phase(week, session)[0] for week in weeks}
+    for m in matches:
+        # Extra activities are attributed to the plan week they fall in
+        week = m.week_number or first_week + (m.date - range_start).days // 7
+        m.week_number = week
+        by_week[week].add(m)
+        by_phase.setdefault(phases[week], ComplianceSummary()).add(m)
+    return matches, by_week, by_phase
@@ -0,0 +1,170 @@
+"""Power-curve analytics: best efforts, CP/W' fits and window-to-window deltas.
+
+Curves from power_curves.json are resampled onto one shared duration grid
+and kept as rows of a flat array, so best efforts, the CP/W' regression
+and deltas are the same few loops however many curves are compared.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from session import Session, default_session
+
+STANDARD_DURATIONS = (5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+# Work-time regression window for the 2-parameter CP model (3–20 min)
+CP_FIT_MIN = 180
+CP_FIT_MAX = 1200
+CP_FIT_STEP = 30
+
+
+@dataclass
+class PowerCurve:
+    id: str
+    label: str
+    start: str
+    end: str
+    secs: array  # ascending durations ('I')
+    watts: array  # best power at each duration ('d')
+
+    @classmethod
+    def from_api(cls, data: dict) -> PowerCurve:
+        points = sorted(
+            (s, w) for s, w in zip(data.get("secs") or [], data.get("watts") or data.get("values") or [])
+            if s and w
+        )
+        return cls(
+            id=str(data.get("id", "")),
+            label=data.get("label") or str(data.get("id", "")),
+            start=(data.get("start_date_local") or "")[:10],
+            end=(data.get("end_date_local") or "")[:10],
+            secs=array("I", (s for s, _ in points)),
+            watts=array("d", (w for _, w in points)),
+        )
+
+    def at(self, duration: int) -> float | None:
+        """Best power for a duration, interpolated between recorded points."""
+        secs, watts = self.secs, self.watts
+        i = bisect_left(secs, duration)
+        if i == len(secs):
+            return None
+        if secs[i] == duration:
+            return watts[i]
+        if i == 0:
+            return None
+        frac = (duration - secs[i - 1]) / (secs[i] - secs[i - 1])
+        return watts[i - 1] + (watts[i] - watts[i - 1]) * frac
+
+
+@dataclass
+class CPFit:
+    cp: float  # watts
+    w_prime: float  # joules
+    r2: float
+    points: int
+
+
+@dataclass
+class CurveAnalysis:
+    curves: list[PowerCurve]
+    durations: tuple[int, ...]
+    efforts: array  # len(curves) × len(durations), row-major; 0 = no data
+    fits: list[CPFit | None]
+
+    def effort(self, curve: int, col: int) -> float | None:
+        """Best power of curve at durations[col]."""
+        value = self.efforts[curve * len(self.durations) + col]
+        return value or None
+
+    def delta(self, curve: int, reference: int, col: int) -> float | None:
+        """Relative change of one curve against another at durations[col]."""
+        value, base = self.effort(curve, col), self.effort(reference, col)
+        if value is None or not base:
+            return None
+        return value / base - 1
+
+
+def load_curves(data: dict | list | None) -> list[PowerCurve]:
+    """Parse the power-curves response ({"list": [...]} or a bare list)."""
+    if not data:
+        return []
+    entries = data.get("list", []) if isinstance(data, dict) else data
+    return [c for c in map(PowerCurve.from_api, entries) if len(c.secs)]
+
+
+def _sample(curves: list[PowerCurve], durations: tuple[int, ...] | range) -> array:
+    """Row-major matrix of each curve sampled at each duration (0 where missing)."""
+    matrix = array("d", bytes(8 * len(curves) * len(durations)))
+    for row, curve in enumerate(curves):
+        base = row * len(durations)
+        for col, duration in enumerate(durations):
+            matrix[base + col] = curve.at(duration) or 0.0
+    return matrix
+
+
+def fit_critical_power(curves: list[PowerCurve]) -> list[CPFit | None]:
+    """Least-squares fit of work = CP·t + W' over 3–20 min for every curve.
+
+    Every curve is sampled on the same duration grid and reduced to a few
+    running sums, so each fit is a closed-form solve with no iteration.
+    """
+    grid = range(CP_FIT_MIN, CP_FIT_MAX + 1, CP_FIT_STEP)
+    power = _sample(curves, grid)
+    n_grid = len(grid)
+    fits: list[CPFit | None] = []
+    for row in range(len(curves)):
+        base = row * n_grid
+        n = sum_t = sum_tt = sum_w = sum_tw = sum_ww = 0.0
+        for col, t in enumerate(grid):
+            p = power[base + col]
+            if not p:
+                continue
+            work = p * t
+            n += 1
+            sum_t += t
+            sum_tt += t * t
+            sum_w += work
+            sum_tw += t * work
+            sum_ww += work * work
+        denom = n * sum_tt - sum_t * sum_t
+        if n < 3 or not denom:
+            fits.append(None)
+            continue
+        cp = (n * sum_tw - sum_t * sum_w) / denom
+        w_prime = (sum_w - cp * sum_t) / n
+        # r² from the sums: explained share of the work variance
+        ss_tot = sum_ww - sum_w * sum_w / n
+        ss_res = sum_ww - 2 * (cp * sum_tw + w_prime * sum_w) + (
+            cp * cp * sum_tt + 2 * cp * w_prime * sum_t + n * w_prime * w_prime
+        )
+        fits.append(CPFit(
+            cp=cp,
+            w_prime=w_prime,
+            r2=1 - ss_res / ss_tot if ss_tot else 1.0,
+            points=int(n),
+        ))
+    return fits
+
+
+def analyze_curves(
+    curves: list[PowerCurve],
+    durations: tuple[int, ...] = STANDARD_DURATIONS,
+) -> CurveAnalysis:
+    return CurveAnalysis(
+        curves=curves,
+        durations=durations,
+        efforts=_sample(curves, durations),
+        fits=fit_critical_power(curves),
+    )
+
+
+def cached_curves(session: Session | None = None) -> CurveAnalysis:
+    """Analysis of the cached power_curves.json, recomputed when it changes."""
+    session = session or default_session()
+    return session.cached(
+        "curve_analysis",
+        session.data_dir / "power_curves.json",
+        lambda: analyze_curves(load_curves(session.power_curves)),
+    )
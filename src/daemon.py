@@ -0,0 +1,352 @@
+"""Long-running `serve` mode: warm caches behind a small local JSON API.
+
+One process keeps a Session (config, store queries and parsed plan blocks
+stay cached until their files change) and an IntervalsClient (keep-alive
+connections, rate limiter and response cache) alive, syncs activities and
+wellness incrementally every poll interval, and answers:
+
+    GET  /status                     fitness snapshot, as `status`
+    GET  /analyze?week=N             week summary, as `analyze` (from=&to= for a range)
+    POST /push?week=N&dry_run=1      push a plan week, as `push` (force=1 to resend)
+    POST /sync                       sync now instead of waiting for the next poll
+    GET  /health                     uptime, sync state and API counters
+
+over TCP (localhost by default) or a Unix socket. Responses are JSON.
+
+Any local web page can make a browser send simple requests to
+127.0.0.1, so over TCP requests carrying an Origin header or a Host
+other than the bound address are refused, and the POST routes (which
+reach the real calendar) need ``Authorization: Bearer <token>``. The
+token is written to data/serve.token (mode 0600) on start. The Unix
+socket is itself mode 0600 and needs no token.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hmac
+import json
+import os
+import re
+import secrets
+import socketserver
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from analyzer import analyze_week, analyze_weeks, current_week_number, get_latest_fitness, season_weeks
+from batch import ContextOutput
+from display import warn
+from fetcher import fetch_all
+from intervals_client import IntervalsClient
+from planner import parse_week
+from pusher import push_week
+from session import Session
+
+DEFAULT_PORT = 8766
+POLL_INTERVAL = 15 * 60  # seconds between incremental syncs
+SYNC_DAYS = 7 * 4 * 6  # history window for a first sync; later ones resume from the watermarks
+TOKEN_FILE = "serve.token"  # bearer token for POST routes over TCP, under the data dir
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class BadRequest(ValueError):
+    """Invalid query parameters; answered with 400."""
+
+
+class Daemon:
+    """The warm Session and client plus the handlers behind each route.
+
+    Queries and pushes share the Session under one lock. Syncs only write
+    the store (whose mtime then invalidates the Session's cached queries),
+    so they run under their own lock and never block reads.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        client: IntervalsClient,
+        interval: float = POLL_INTERVAL,
+        days: int = SYNC_DAYS,
+    ):
+        self.session = session
+        self.client = client
+        self.interval = interval
+        self.days = days
+        self.output = ContextOutput(sys.stdout)
+        self.started = time.time()
+        self.last_sync: datetime | None = None
+        self.last_sync_s: float | None = None
+        self.last_error: str | None = None
+        self.syncs = 0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._poller: threading.Thread | None = None
+
+    # ── Routes ──────────────────────────────────────────────
+
+    def status(self, params: dict) -> dict:
+        with self._lock:
+            fitness = get_latest_fitness(self.session)
+            week = current_week_number(self.session)
+            ftp = self.session.config["athlete"]["ftp"]
+        if not fitness:
+            return {"fitness": None, "config_ftp": ftp, "week": week, "last_sync": self.last_sync}
+        return {
+            "fitness": {**asdict(fitness), "tsb": fitness.tsb},
+            "config_ftp": ftp,
+            "week": week,
+            "last_sync": self.last_sync,
+        }
+
+    def analyze(self, params: dict) -> dict | list:
+        with self._lock:
+            if "from" in params or "to" in params or "season" in params:
+                first, last = season_weeks(self.session)
+                if "season" not in params:
+                    first = _int(params, "from", first)
+                    last = _int(params, "to", max(first, current_week_number(self.session)))
+                return [_summary(s) for s in analyze_weeks(first, last, self.session)]
+            week = _int(params, "week", None) or current_week_number(self.session)
+            return _summary(analyze_week(week, self.session))
+
+    def push(self, params: dict) -> dict:
+        dry_run = _flag(params, "dry_run")
+        with self._lock:
+            week = _int(params, "week", None) or current_week_number(self.session) + 1
+            workouts = parse_week(week, self.session.plan_dir, self.session.data_dir)
+            if not workouts:
+                raise BadRequest(f"No workouts found for week {week}")
+            buffer = self.output.capture()
+            counts = push_week(
+                self.client, workouts, week,
+                dry_run=dry_run, session=self.session, force=_flag(params, "force"),
+            )
+        return {"week": week, "dry_run": dry_run, **counts, "output": _ANSI.sub("", buffer.getvalue())}
+
+    def sync(self, params: dict | None = None) -> dict:
+        """Incremental fetch of every endpoint; returns what the poller logs."""
+        with self._sync_lock:
+            self.output.capture()  # fetch_all's progress lines are not wanted here
+            started = time.perf_counter()
+            try:
+                results = fetch_all(self.client, days=self.days, data_dir=self.session.data_dir)
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                raise
+            self.last_sync_s = time.perf_counter() - started
+            self.last_sync = datetime.now().replace(microsecond=0)
+            self.last_error = None
+            self.syncs += 1
+        return {
+            "activities": len(results["activities"]),
+            "wellness": len(results["wellness"]),
+            "seconds": round(self.last_sync_s, 3),
+            "at": self.last_sync,
+        }
+
+    def health(self, params: dict) -> dict:
+        return {
+            "uptime_s": round(time.time() - self.started),
+            "syncs": self.syncs,
+            "last_sync": self.last_sync,
+            "last_sync_s": self.last_sync_s and round(self.last_sync_s, 3),
+            "last_error": self.last_error,
+            "poll_interval_s": self.interval,
+            "api": asdict(self.client.stats),
+        }
+
+    # ── Polling ─────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Capture stdout per request, warm the caches and start polling.
+
+        Config, the store and this week's plan are loaded before the first
+        request; the poller syncs now and then every ``interval`` seconds,
+        unless the interval is 0.
+        """
+        sys.stdout = self.output
+        self.analyze({})
+        self.status({})
+        if self.interval <= 0:
+            return
+        self._poller = threading.Thread(target=contextvars.copy_context().run, args=(self._poll,), daemon=True)
+        self._poller.start()
+
+    def _poll(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                result = self.sync()
+                self.log(f"sync: {result['activities']} activities, {result['wellness']} wellness days "
+                         f"in {result['seconds']:.2f}s")
+            except Exception:
+                self.log(warn(f"sync failed: {self.last_error}"))
+            self._stopping.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._poller:
+            self._poller.join(timeout=5)
+        sys.stdout = self.output.fallback
+
+    def log(self, text: str) -> None:
+        """Print past the per-request capture."""
+        self.output.fallback.write(f"  {datetime.now():%H:%M:%S} {text}\n")
+        self.output.fallback.flush()
+
+    def routes(self) -> dict[tuple[str, str], Callable[[dict], object]]:
+        return {
+            ("GET", "/status"): self.status,
+            ("GET", "/analyze"): self.analyze,
+            ("POST", "/push"): self.push,
+            ("POST", "/sync"): self.sync,
+            ("GET", "/health"): self.health,
+        }
+
+
+def _summary(summary) -> dict:
+    return {
+        **asdict(summary),
+        "compliance": summary.compliance,
+        "activities": [{**asdict(a), "hours": a.hours} for a in summary.activities],
+    }
+
+
+def _int(params: dict, name: str, default: int | None) -> int | None:
+    if name not in params:
+        return default
+    try:
+        return int(params[name])
+    except ValueError:
+        raise BadRequest(f"'{name}' must be an integer, got '{params[name]}'") from None
+
+
+def _flag(params: dict, name: str) -> bool:
+    return params.get(name, "0").lower() not in ("0", "false", "no", "")
+
+
+def write_token(data_dir: Path) -> tuple[str, Path]:
+    """Create a fresh bearer token readable only by this user."""
+    token = secrets.token_urlsafe(32)
+    path = data_dir / TOKEN_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token + "\n")
+    return token, path
+
+
+def _host_name(header: str) -> str:
+    """'127.0.0.1:8766' → '127.0.0.1', '[::1]:8766' → '::1'."""
+    if header.startswith("["):
+        return header[1:].partition("]")[0]
+    return header.rpartition(":")[0] if header.count(":") == 1 else header
+
+
+def _handler(
+    daemon: Daemon,
+    token: str | None = None,
+    hosts: set[str] | None = None,
+) -> type[BaseHTTPRequestHandler]:
+    """Request handler; ``hosts`` and ``token`` guard the TCP listener."""
+    routes = daemon.routes()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+        def _dispatch(self, method: str) -> None:
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+            if int(self.headers.get("Content-Length") or 0):
+                self.rfile.read(int(self.headers["Content-Length"]))  # parameters come in the query
+            refused = self._refused(method)
+            if refused:
+                return self._send(*refused)
+            route = routes.get((method, url.path.rstrip("/") or "/"))
+            if route is None:
+                allowed = [m for m, path in routes if path == url.path.rstrip("/")]
+                if allowed:
+                    return self._send(405, {"error": f"Use {allowed[0]} for {url.path}"})
+                return self._send(404, {"error": "Not found", "routes": [f"{m} {p}" for m, p in routes]})
+            started = time.perf_counter()
+            try:
+                status, payload = 200, route(params)
+            except BadRequest as exc:
+                status, payload = 400, {"error": str(exc)}
+            except Exception as exc:  # one failing request must not take the daemon down
+                status, payload = 500, {"error": f"{type(exc).__name__}: {exc}"}
+            self._send(status, payload, {"X-Elapsed-Ms": f"{(time.perf_counter() - started) * 1000:.1f}"})
+
+        def _refused(self, method: str) -> tuple[int, dict] | None:
+            """Why this request must not run: browser-originated, rebound host or no token."""
+            if self.headers.get("Origin"):
+                return 403, {"error": "Cross-origin requests are not accepted"}
+            if hosts is not None and _host_name(self.headers.get("Host", "")).lower() not in hosts:
+                return 403, {"error": "Unexpected Host header"}
+            if token and method == "POST":
+                sent = self.headers.get("Authorization", "")
+                if not hmac.compare_digest(sent.encode(), f"Bearer {token}".encode()):
+                    return 401, {"error": f"POST routes need 'Authorization: Bearer <token>' (see {TOKEN_FILE})"}
+            return None
+
+        def _send(self, status: int, payload, headers: dict | None = None) -> None:
+            data = json.dumps(payload, default=str).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(
+    daemon: Daemon,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    socket_path: Path | None = None,
+    token: str | None = None,
+) -> socketserver.BaseServer:
+    """HTTP server for the daemon's routes, on a Unix socket if one is given.
+
+    Over TCP, ``token`` is required by the POST routes and only Host
+    headers naming localhost or ``host`` are served.
+    """
+    if socket_path is None:
+        handler = _handler(daemon, token, LOCAL_HOSTS | {host.lower()})
+        # Headers and body are separate writes; without TCP_NODELAY each
+        # keep-alive response waits out the client's delayed ACK (~40 ms)
+        handler.disable_nagle_algorithm = True
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+        return server
+    if socket_path.exists():
+        socket_path.unlink()  # left behind by a daemon that was killed
+    server = _UnixHTTPServer(str(socket_path), _handler(daemon))
+    os.chmod(socket_path, 0o600)  # same user only: the API can push to the calendar
+    return server
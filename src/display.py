@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
+
 from tabulate import tabulate
 
+from profiler import span
+
 # ANSI color codes
 RESET = "\033[0m"
 BOLD = "\033[1m"
@@ -48,11 +52,13 @@ def info(text: str) -> str:
 
 
 def table(rows: list[list], headers: list[str], fmt: str = "simple") -> str:
-    return tabulate(rows, headers=headers, tablefmt=fmt)
+    with span("render.table", rows=len(rows)):
+        return tabulate(rows, headers=headers, tablefmt=fmt)
 
 
 def kv_table(pairs: list[tuple[str, str]]) -> str:
-    return tabulate(pairs, tablefmt="plain")
+    with span("render.table", rows=len(pairs)):
+        return tabulate(pairs, tablefmt="plain")
 
 
 # ── Formatters for specific data ────────────────────────
@@ -136,6 +142,7 @@ def print_week_summary(summary) -> None:
         ["Planned Range", f"{s.planned_hours_min:.0f}–{s.planned_hours_max:.0f}h"],
         ["Compliance", format_compliance(s.compliance)],
         ["Total TSS", f"{s.total_tss:.0f}"],
+        ["Planned TSS", f"{s.planned_tss:.0f}" if s.planned_tss else "—"],
         ["Rides", str(s.ride_count)],
         ["Strength", str(s.strength_count)],
     ]
@@ -168,12 +175,166 @@ def print_week_summary(summary) -> None:
         ))
 
 
-def print_planned_workouts(workouts: list, week: int) -> None:
+def print_season_table(summaries: list) -> None:
+    if not summaries:
+        return
+    first, last = summaries[0], summaries[-1]
+    print(header(f"Weeks {first.week_number}–{last.week_number} Summary"))
+    print(f"  {first.start_date} → {last.end_date}")
+    print()
+
+    rows = []
+    for s in summaries:
+        rows.append([
+            s.week_number,
+            str(s.start_date),
+            s.phase,
+            format_hours(s.total_hours),
+            f"{s.planned_hours_min:.0f}–{s.planned_hours_max:.0f}h",
+            format_compliance(s.compliance),
+            f"{s.total_tss:.0f}",
+            f"{s.planned_tss:.0f}" if s.planned_tss else "—",
+            s.ride_count,
+            s.strength_count,
+            f"{s.ctl_end:.1f}" if s.ctl_end is not None else "—",
+            format_tsb(s.tsb_end),
+        ])
+    print(table(
+        rows,
+        ["Week", "Start", "Phase", "Hours", "Planned", "Compliance",
+         "TSS", "Plan TSS", "Rides", "Strength", "CTL", "TSB"],
+    ))
+
+    total_hours = sum(s.total_hours for s in summaries)
+    total_tss = sum(s.total_tss for s in summaries)
+    print(f"\n  Total: {format_hours(total_hours)} | TSS {total_tss:.0f} | "
+          f"{sum(s.ride_count for s in summaries)} rides | "
+          f"{sum(s.strength_count for s in summaries)} strength")
+
+
+def print_power_curves(analysis, ftp: float, weight: float | None = None) -> None:
+    """Best efforts per window with deltas against the first, then CP/W' fits."""
+    print(header("Power Curves"))
+    curves = analysis.curves
+    if not curves:
+        print(warn("  No power curves cached. Run 'python main.py fetch' first."))
+        return
+    for c in curves:
+        window = f" ({c.start} → {c.end})" if c.start else ""
+        print(f"  {c.label}{window}")
+
+    rows = []
+    for col, secs in enumerate(analysis.durations):
+        row = [_format_secs(secs)]
+        for i in range(len(curves)):
+            watts = analysis.effort(i, col)
+            cell = f"{watts:.0f}W" if watts else "—"
+            delta = analysis.delta(i, 0, col) if i else None
+            if delta is not None:
+                text = f"{delta * 100:+.1f}%"
+                cell += f" {ok(text) if delta >= 0 else warn(text)}"
+            row.append(cell)
+        if weight:
+            best = analysis.effort(0, col)
+            row.append(f"{best / weight:.2f}" if best else "—")
+        rows.append(row)
+    headers = ["Duration"] + [c.label for c in curves] + (["W/kg"] if weight else [])
+    print()
+    print(table(rows, headers))
+
+    fit_rows = []
+    for c, fit in zip(curves, analysis.fits):
+        if fit is None:
+            fit_rows.append([c.label, "—", "—", "—", "—"])
+            continue
+        fit_rows.append([
+            c.label,
+            f"{fit.cp:.0f}W",
+            f"{fit.w_prime / 1000:.1f}kJ",
+            f"{fit.r2 * 100:.2f}%",
+            f"{fit.cp / ftp * 100:.0f}%" if ftp else "—",
+        ])
+    print(section("\nCritical power (3–20 min fit):"))
+    print(table(fit_rows, ["Window", "CP", "W'", "r²", "CP / FTP"]))
+
+
+def _format_secs(secs: int) -> str:
+    if secs < 60:
+        return f"{secs}s"
+    if secs < 3600:
+        return f"{secs // 60}m" + (f"{secs % 60}s" if secs % 60 else "")
+    return f"{secs // 3600}h" + (f"{secs % 3600 // 60}m" if secs % 3600 else "")
+
+
+def print_fitness_comparison(series, wellness: list, report, days: int = 14) -> None:
+    """Local CTL/ATL/TSB model vs server values for the last ``days`` days."""
+    print(header("Local Fitness Model"))
+    if not len(series):
+        print(warn("  No activity history cached."))
+        return
+    server = {w.date: w for w in wellness}
+    print(f"  {series.start} → {series.end} ({len(series)} days)")
+    print()
+    print(kv_table([
+        ["Days compared", str(report.days)],
+        ["CTL error (mean / max)", f"{report.ctl_mae:.2f} / {report.ctl_max_error:.2f}"],
+        ["ATL error (mean / max)", f"{report.atl_mae:.2f} / {report.atl_max_error:.2f}"],
+    ]))
+
+    rows = []
+    first = max(0, len(series) - days)
+    for i in range(first, len(series)):
+        day = series.start + timedelta(days=i)
+        w = server.get(day)
+        rows.append([
+            str(day),
+            f"{series.load[i]:.0f}",
+            f"{series.ctl[i]:.1f}",
+            f"{w.ctl:.1f}" if w and w.ctl is not None else "—",
+            f"{series.atl[i]:.1f}",
+            f"{w.atl:.1f}" if w and w.atl is not None else "—",
+            format_tsb(series.ctl[i] - series.atl[i]),
+        ])
+    print()
+    print(table(rows, ["Date", "Load", "CTL", "CTL (server)", "ATL", "ATL (server)", "TSB"]))
+
+
+def print_forecast(forecasts: list, tsb_warning: float) -> None:
+    """Projected end-of-week fitness for the remaining plan weeks."""
+    print(header("Plan Forecast"))
+    if not forecasts:
+        print(warn("  No remaining plan weeks to project."))
+        return
+    rows = []
+    for f in forecasts:
+        rows.append([
+            f.week_number,
+            str(f.start_date),
+            f.phase,
+            f"{f.planned_tss:.0f}",
+            f"{f.ctl_end:.1f}",
+            f"{f.atl_end:.1f}",
+            format_tsb(f.tsb_end),
+            format_tsb(f.tsb_min),
+            bad("FATIGUE") if f.flagged else "",
+        ])
+    print(table(rows, ["Week", "Start", "Phase", "Planned TSS", "CTL", "ATL", "TSB", "Min TSB", ""]))
+
+    flagged = [f.week_number for f in forecasts if f.flagged]
+    if flagged:
+        print(warn(f"\n  TSB projected below {tsb_warning} in week(s) "
+                   f"{', '.join(map(str, flagged))}."))
+    else:
+        print(ok(f"\n  TSB stays above {tsb_warning} through the plan."))
+
+
+def print_planned_workouts(workouts: list, week: int, loads: list | None = None) -> None:
+    """Planned workouts; with loads (planned_load.workout_loads) adds TSS/IF/NP/zone time."""
     print(header(f"Week {week} — Planned Workouts"))
     rows = []
-    for w in workouts:
+    for i, w in enumerate(workouts):
         has_structure = "Yes" if w.workout_text else "No"
-        rows.append([
+        row = [
             str(w.date),
             _day_name(w.day_of_week),
             w.name[:35],
@@ -181,24 +342,163 @@ def print_planned_workouts(workouts: list, week: int) -> None:
             f"{w.duration_minutes}min" if w.duration_minutes else "—",
             w.zones,
             has_structure,
+        ]
+        if loads is not None:
+            load = loads[i]
+            row += [
+                f"{load.tss:.0f}" if load else "—",
+                f"{load.intensity:.2f}" if load else "—",
+                f"{load.normalized_power:.0f}W" if load else "—",
+                _zone_minutes(load.zone_seconds) if load else "",
+            ]
+        rows.append(row)
+    headers = ["Date", "Day", "Name", "Type", "Duration", "Zones", "Structured"]
+    if loads is not None:
+        headers += ["TSS", "IF", "NP", "Time in zone"]
+    print(table(rows, headers))
+
+    if loads is not None:
+        total = sum(load.tss for load in loads if load)
+        print(f"\n  Structured TSS: {total:.0f}")
+
+
+def _zone_minutes(zone_seconds: list[float]) -> str:
+    """'Z1:12m Z3:24m' for zones with at least a minute."""
+    return " ".join(
+        f"Z{z}:{seconds / 60:.0f}m" for z, seconds in enumerate(zone_seconds, 1) if seconds >= 60
+    )
+
+
+def format_ratio(ratio: float | None) -> str:
+    """Actual/planned ratio as a percentage, colored by how close it is to 100%."""
+    if ratio is None:
+        return "—"
+    text = f"{ratio * 100:.0f}%"
+    if 0.8 <= ratio <= 1.2:
+        return ok(text)
+    if 0.5 <= ratio <= 1.5:
+        return warn(text)
+    return bad(text)
+
+
+def _format_session_status(status: str) -> str:
+    if status == "done":
+        return ok(status)
+    if status in ("partial", "over"):
+        return warn(status)
+    if status == "missed":
+        return bad(status)
+    return info(status)
+
+
+def print_compliance_sessions(matches: list) -> None:
+    """Planned-vs-actual pairing, one row per planned workout or extra activity."""
+    rows = []
+    for m in matches:
+        p, a = m.planned, m.activity
+        rows.append([
+            str(m.date),
+            _day_name(m.date.weekday()),
+            p.name[:30] if p else "—",
+            a.name[:30] if a else "—",
+            f"{p.duration_minutes}min" if p else "—",
+            format_hours(a.hours) if a else "—",
+            f"{m.planned_tss:.0f}" if p else "—",
+            f"{a.icu_training_load:.0f}" if a else "—",
+            format_ratio(m.intensity_ratio),
+            _format_session_status(m.status),
         ])
     print(table(
         rows,
-        ["Date", "Day", "Name", "Type", "Duration", "Zones", "Structured"],
+        ["Date", "Day", "Planned", "Actual", "Plan time", "Time",
+         "Plan TSS", "TSS", "IF vs plan", "Status"],
     ))
 
 
-def print_push_preview(events: list[dict]) -> None:
-    print(header("Push Preview — Events to Send"))
+def print_compliance_summary(rows_by_key: dict, label: str) -> None:
+    """Aggregated ComplianceSummary rows keyed by week number or phase name."""
     rows = []
-    for e in events:
+    for key, c in rows_by_key.items():
         rows.append([
+            key,
+            c.planned,
+            c.done,
+            c.partial,
+            c.over,
+            c.missed,
+            c.extra,
+            f"{c.completion * 100:.0f}%" if c.completion is not None else "—",
+            format_ratio(c.duration_ratio),
+            format_ratio(c.tss_ratio),
+        ])
+    print(table(
+        rows,
+        [label, "Planned", "Done", "Partial", "Over", "Missed", "Extra",
+         "Completion", "Time vs plan", "TSS vs plan"],
+    ))
+
+
+def print_stream_metrics(metrics: list) -> None:
+    """Per-ride stream analysis plus the week's combined time in zone."""
+    print(section("\nStream analysis:"))
+    rows = []
+    power_total: list[float] = []
+    hr_total: list[float] = []
+    for m in metrics:
+        rows.append([
+            m.date,
+            format_hours(m.seconds / 3600),
+            f"{m.average_power:.0f}W" if m.average_power else "—",
+            f"{m.normalized_power:.0f}W" if m.normalized_power else "—",
+            f"{m.intensity:.2f}" if m.intensity else "—",
+            f"{m.average_hr:.0f}" if m.average_hr else "—",
+            _format_decoupling(m.decoupling),
+            _zone_minutes(m.power_zone_seconds),
+        ])
+        power_total = _add_zones(power_total, m.power_zone_seconds)
+        hr_total = _add_zones(hr_total, m.hr_zone_seconds)
+    print(table(rows, ["Date", "Time", "Avg W", "NP", "IF", "Avg HR", "Pa:HR", "Power zones"]))
+    if power_total:
+        print(f"\n  Power zones: {_zone_minutes(power_total)}")
+    if hr_total:
+        labels = ("<LT1", "LT1–LTHR", ">LTHR")
+        print("  HR zones:    " + " ".join(
+            f"{label}:{seconds / 60:.0f}m" for label, seconds in zip(labels, hr_total)
+        ))
+
+
+def _add_zones(total: list[float], seconds: list[float]) -> list[float]:
+    if not seconds:
+        return total
+    total = total + [0.0] * (len(seconds) - len(total))
+    return [t + s for t, s in zip(total, seconds)] + total[len(seconds):]
+
+
+def _format_decoupling(decoupling: float | None) -> str:
+    # Under 5% drift is the usual marker of a solid aerobic base
+    if decoupling is None:
+        return "—"
+    text = f"{decoupling:+.1f}%"
+    return ok(text) if decoupling < 5 else warn(text)
+
+
+def print_push_preview(events: list[dict], actions: list[str] | None = None) -> None:
+    print(header("Push Preview — Events to Send"))
+    rows = []
+    for i, e in enumerate(events):
+        row = [
             e.get("start_date_local", "")[:10],
             e.get("name", ""),
             e.get("type", ""),
             e.get("external_id", ""),
-        ])
-    print(table(rows, ["Date", "Name", "Type", "External ID"]))
+        ]
+        if actions:
+            row.append(actions[i] if actions[i] != "unchanged" else colored(actions[i], DIM))
+        rows.append(row)
+    headers = ["Date", "Name", "Type", "External ID"]
+    if actions:
+        headers.append("Action")
+    print(table(rows, headers))
 
 
 def print_clean_preview(stale: list[dict]) -> None:
@@ -214,5 +514,35 @@ def print_clean_preview(stale: list[dict]) -> None:
     print(table(rows, ["Date", "Name", "Type", "External ID"]))
 
 
+def print_profile(summaries: list, wall: float) -> None:
+    """Per-span timing table for --profile (nested spans overlap)."""
+    print(header(f"Profile — {wall * 1000:.0f} ms wall"))
+    rows = []
+    for s in summaries:
+        details = []
+        if s.sums.get("bytes"):
+            details.append(f"{s.sums['bytes'] / 1024:.0f} KiB")
+        if s.sums.get("rows"):
+            details.append(f"{s.sums['rows']} rows")
+        if s.sums.get("retries"):
+            details.append(warn(f"{s.sums['retries']} retries"))
+        waited = s.sums.get("throttle_wait", 0) + s.sums.get("backoff_wait", 0)
+        if waited >= 0.001:
+            details.append(f"waited {waited:.2f}s")
+        if s.statuses:
+            details.append(" ".join(f"{status}×{n}" for status, n in sorted(s.statuses.items(), key=str)))
+        rows.append([
+            s.name,
+            s.calls,
+            f"{s.total * 1000:.1f}",
+            f"{s.mean * 1000:.2f}",
+            f"{s.max * 1000:.1f}",
+            f"{s.total / wall * 100:.0f}%" if wall else "—",
+            ", ".join(details),
+        ])
+    # Plain tabulate: table() is itself a span
+    print(tabulate(rows, headers=["Span", "Calls", "Total ms", "Mean ms", "Max ms", "Wall", "Details"]))
+
+
 def _day_name(dow: int) -> str:
     return ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"][dow]
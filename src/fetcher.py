@@ -1,81 +1,314 @@
-"""Pull data from Intervals.icu API and cache to data/*.json."""
+"""Pull data from Intervals.icu API and cache to data/ (SQLite store + JSON)."""
 
 from __future__ import annotations
 
+import contextvars
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from intervals_client import IntervalsClient
+from profiler import span
+from store import DB_FILE, Store
+from streams import CHANNELS, STREAM_ACTIVITY_TYPES, StreamStore
+
+if TYPE_CHECKING:  # requests is only imported once there is something to fetch
+    from intervals_client import IntervalsClient
 
 DATA_DIR = Path(__file__).parent.parent / "data"
+SYNC_STATE_FILE = "sync_state.json"
+HTTP_CACHE_DIR = "http_cache"  # IntervalsClient response cache, under the data dir
+SYNC_OVERLAP_DAYS = 3  # re-fetch this many days behind the watermark for late edits
+POWER_CURVE_WINDOWS = ("42d", "84d", "1y")  # curves compared by `curves`
+FETCH_WORKERS = 5  # one per endpoint; the client's rate limiter bounds total traffic
+STREAM_WORKERS = 4  # concurrent activity stream downloads
+
+# Guards read-modify-write of sync_state.json and first-time store creation
+# when datasets are fetched concurrently.
+_state_lock = threading.Lock()
 
 
-def ensure_data_dir() -> None:
-    DATA_DIR.mkdir(exist_ok=True)
+def ensure_data_dir(data_dir: Path = DATA_DIR) -> None:
+    data_dir.mkdir(parents=True, exist_ok=True)
 
 
-def save_json(filename: str, data: dict | list) -> Path:
-    ensure_data_dir()
-    path = DATA_DIR / filename
-    path.write_text(json.dumps(data, indent=2, default=str))
+def save_json(filename: str, data: dict | list, data_dir: Path = DATA_DIR) -> Path:
+    ensure_data_dir(data_dir)
+    path = data_dir / filename
+    with span("json.save", file=filename) as attrs:
+        text = json.dumps(data, indent=2, default=str)
+        path.write_text(text)
+        attrs["bytes"] = len(text)
     return path
 
 
-def load_json(filename: str) -> dict | list | None:
-    path = DATA_DIR / filename
+def load_json(filename: str, data_dir: Path = DATA_DIR) -> dict | list | None:
+    path = data_dir / filename
     if path.exists():
-        return json.loads(path.read_text())
+        with span("json.load", file=filename) as attrs:
+            text = path.read_text()
+            attrs["bytes"] = len(text)
+            return json.loads(text)
     return None
 
 
-def fetch_activities(client: IntervalsClient, days: int = 28) -> list[dict]:
-    newest = date.today().isoformat()
-    oldest = (date.today() - timedelta(days=days)).isoformat()
+def get_store(data_dir: Path = DATA_DIR) -> Store:
+    """Open the local store, importing legacy JSON caches on first use."""
+    store = Store(data_dir / DB_FILE)
+    if not store.exists():
+        with _state_lock:
+            if not store.exists():
+                for dataset in ("activities", "wellness"):
+                    legacy = load_json(f"{dataset}.json", data_dir)
+                    if legacy:
+                        store.replace_range(dataset, legacy)
+    return store
+
+
+def save_records(
+    dataset: str,
+    records: list[dict],
+    oldest: str | None = None,
+    newest: str | None = None,
+    export_json: bool = False,
+    data_dir: Path = DATA_DIR,
+) -> Store:
+    """Store fetched records as the authoritative content for [oldest, newest].
+
+    With ``export_json`` the full dataset is also written to data/<dataset>.json.
+    """
+    store = get_store(data_dir)
+    store.replace_range(dataset, records, oldest, newest)
+    if export_json:
+        save_json(f"{dataset}.json", store.records(dataset), data_dir)
+    return store
+
+
+def load_records(
+    dataset: str,
+    start: date | None = None,
+    end: date | None = None,
+    data_dir: Path = DATA_DIR,
+) -> list[dict]:
+    """Load cached records for a date range (inclusive) from the local store."""
+    return get_store(data_dir).records(
+        dataset,
+        start.isoformat() if start else None,
+        end.isoformat() if end else None,
+    )
+
+
+def load_sync_state(data_dir: Path = DATA_DIR) -> dict:
+    """Per-dataset watermarks: {dataset: {"oldest": iso, "newest": iso}}."""
+    return load_json(SYNC_STATE_FILE, data_dir) or {}
+
+
+def save_sync_state(state: dict, data_dir: Path = DATA_DIR) -> Path:
+    return save_json(SYNC_STATE_FILE, state, data_dir)
+
+
+def _sync_window(
+    dataset: str,
+    days: int,
+    full: bool,
+    overlap: int,
+    data_dir: Path = DATA_DIR,
+) -> tuple[str, str, bool]:
+    """Return (oldest, newest, incremental) for the next fetch of a dataset.
+
+    An incremental fetch starts ``overlap`` days before the previous
+    high-water mark; it falls back to the full window when there is no
+    watermark, the store is empty, or the requested window reaches further
+    back than the cache.
+    """
+    today = date.today()
+    newest = today.isoformat()
+    oldest = (today - timedelta(days=days)).isoformat()
+    if full:
+        return oldest, newest, False
+
+    mark = load_sync_state(data_dir).get(dataset)
+    if not mark or oldest < mark["oldest"] or not get_store(data_dir).count(dataset):
+        return oldest, newest, False
+
+    since = date.fromisoformat(mark["newest"]) - timedelta(days=overlap)
+    return max(oldest, since.isoformat()), newest, True
+
+
+def _record_watermark(
+    dataset: str,
+    oldest: str,
+    newest: str,
+    incremental: bool,
+    data_dir: Path = DATA_DIR,
+) -> None:
+    with _state_lock:
+        state = load_sync_state(data_dir)
+        previous = state.get(dataset, {})
+        if incremental and previous.get("oldest"):
+            oldest = min(oldest, previous["oldest"])
+        state[dataset] = {"oldest": oldest, "newest": newest}
+        save_sync_state(state, data_dir)
+
+
+def fetch_activities(
+    client: IntervalsClient,
+    days: int = 28,
+    full: bool = False,
+    overlap: int = SYNC_OVERLAP_DAYS,
+    export_json: bool = False,
+    data_dir: Path = DATA_DIR,
+) -> list[dict]:
+    oldest, newest, incremental = _sync_window("activities", days, full, overlap, data_dir)
     data = client.get_activities(oldest, newest)
-    save_json("activities.json", data)
-    print(f"  Activities: {len(data)} fetched ({oldest} to {newest})")
+    if incremental:
+        store = save_records("activities", data, oldest, newest, export_json, data_dir)
+    else:
+        store = save_records("activities", data, export_json=export_json, data_dir=data_dir)
+    _record_watermark("activities", oldest, newest, incremental, data_dir)
+    mode = "incremental" if incremental else "full"
+    print(f"  Activities: {len(data)} fetched ({oldest} to {newest}, {mode}), "
+          f"{store.count('activities')} cached")
     return data
 
 
-def fetch_wellness(client: IntervalsClient, days: int = 28) -> list[dict]:
-    newest = date.today().isoformat()
-    oldest = (date.today() - timedelta(days=days)).isoformat()
+def fetch_wellness(
+    client: IntervalsClient,
+    days: int = 28,
+    full: bool = False,
+    overlap: int = SYNC_OVERLAP_DAYS,
+    export_json: bool = False,
+    data_dir: Path = DATA_DIR,
+) -> list[dict]:
+    oldest, newest, incremental = _sync_window("wellness", days, full, overlap, data_dir)
     data = client.get_wellness(oldest, newest)
-    save_json("wellness.json", data)
-    print(f"  Wellness: {len(data)} days fetched")
+    if incremental:
+        store = save_records("wellness", data, oldest, newest, export_json, data_dir)
+    else:
+        store = save_records("wellness", data, export_json=export_json, data_dir=data_dir)
+    _record_watermark("wellness", oldest, newest, incremental, data_dir)
+    mode = "incremental" if incremental else "full"
+    print(f"  Wellness: {len(data)} days fetched ({mode}), {store.count('wellness')} cached")
     return data
 
 
-def fetch_power_curves(client: IntervalsClient) -> dict | list:
-    data = client.get_power_curves(sport="Ride", curves="42d")
-    save_json("power_curves.json", data)
-    print(f"  Power curves: fetched (42-day)")
+def fetch_power_curves(client: IntervalsClient, data_dir: Path = DATA_DIR) -> dict | list:
+    windows = ",".join(POWER_CURVE_WINDOWS)
+    data = client.get_power_curves(sport="Ride", curves=windows)
+    save_json("power_curves.json", data, data_dir)
+    print(f"  Power curves: fetched ({windows})")
     return data
 
 
-def fetch_sport_settings(client: IntervalsClient) -> dict:
+def fetch_sport_settings(client: IntervalsClient, data_dir: Path = DATA_DIR) -> dict:
     data = client.get_sport_settings("Ride")
-    save_json("sport_settings.json", data)
+    save_json("sport_settings.json", data, data_dir)
     print(f"  Sport settings: fetched")
     return data
 
 
-def fetch_profile(client: IntervalsClient) -> dict:
+def fetch_profile(client: IntervalsClient, data_dir: Path = DATA_DIR) -> dict:
     data = client.get_profile()
-    save_json("profile.json", data)
+    save_json("profile.json", data, data_dir)
     print(f"  Profile: fetched (athlete {data.get('id', '?')})")
     return data
 
 
-def fetch_all(client: IntervalsClient, days: int = 28) -> dict:
-    """Fetch all data sources and cache them."""
+def fetch_streams(
+    client: IntervalsClient,
+    days: int = 28,
+    full: bool = False,
+    data_dir: Path = DATA_DIR,
+) -> int:
+    """Download streams for rides in the window that aren't stored yet.
+
+    Recorded streams never change, so each activity is fetched once;
+    activities the API has no streams for (e.g. Strava imports) are
+    remembered and skipped unless ``full`` is set. Returns the number
+    of activities downloaded.
+    """
+    import requests
+
+    oldest = (date.today() - timedelta(days=days)).isoformat()
+    streams = StreamStore(data_dir)
+    pending = [
+        a for a in get_store(data_dir).iter_records("activities", start=oldest)
+        if a.get("type") in STREAM_ACTIVITY_TYPES
+        and (full or not streams.has(str(a["id"])))
+    ]
+
+    def download(activity: dict) -> bool:
+        activity_id = str(activity["id"])
+        meta = {"date": activity["start_date_local"][:10], "type": activity.get("type")}
+        try:
+            data = client.get_activity_streams(activity_id, list(CHANNELS))
+        except requests.HTTPError as exc:
+            status = exc.response.status_code if exc.response is not None else None
+            if status in (403, 404, 422):
+                streams.mark_unavailable(activity_id, meta, f"HTTP {status}")
+                return False
+            raise
+        streams.write(activity_id, meta, data)
+        return True
+
+    with ThreadPoolExecutor(max_workers=STREAM_WORKERS) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, download, a) for a in pending]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except requests.RequestException:
+                outcomes.append(None)  # transient; retried on the next fetch
+    streams.save_index()
+
+    downloaded = sum(1 for o in outcomes if o)
+    unavailable = sum(1 for o in outcomes if o is False)
+    failed = sum(1 for o in outcomes if o is None)
+    print(f"  Streams: {downloaded} downloaded, {unavailable} unavailable, {failed} failed, "
+          f"{len(streams.activity_ids())} stored")
+    return downloaded
+
+
+def fetch_all(
+    client: IntervalsClient,
+    days: int = 28,
+    full: bool = False,
+    overlap: int = SYNC_OVERLAP_DAYS,
+    export_json: bool = False,
+    data_dir: Path = DATA_DIR,
+    streams: bool = False,
+) -> dict:
+    """Fetch all data sources and cache them.
+
+    Endpoints are requested concurrently (each worker runs in a copy of the
+    caller's context); the client's shared rate limiter
+    keeps total traffic under the API limit. Activities and wellness are
+    synced incrementally from their watermarks unless ``full`` is set, and
+    stored in the local SQLite store. With ``streams``, per-second streams
+    of new rides are downloaded once the activity sync has finished.
+    """
     print(f"Fetching data from Intervals.icu ({days} days)...")
-    results = {}
-    results["profile"] = fetch_profile(client)
-    results["activities"] = fetch_activities(client, days)
-    results["wellness"] = fetch_wellness(client, days)
-    results["power_curves"] = fetch_power_curves(client)
-    results["sport_settings"] = fetch_sport_settings(client)
+    ensure_data_dir(data_dir)
+    get_store(data_dir)
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        def submit(fn, *args):
+            return pool.submit(contextvars.copy_context().run, fn, *args)
+
+        futures = {
+            "profile": submit(fetch_profile, client, data_dir),
+            "activities": submit(
+                fetch_activities, client, days, full, overlap, export_json, data_dir,
+            ),
+            "wellness": submit(
+                fetch_wellness, client, days, full, overlap, export_json, data_dir,
+            ),
+            "power_curves": submit(fetch_power_curves, client, data_dir),
+            "sport_settings": submit(fetch_sport_settings, client, data_dir),
+        }
+        results = {name: future.result() for name, future in futures.items()}
+    if streams:
+        results["streams"] = fetch_streams(client, days, full, data_dir)
     print("Done.")
     return results
@@ -0,0 +1,135 @@
+"""Local CTL/ATL/TSB model computed from activity training loads.
+
+Uses the standard exponentially weighted training load model (as
+Intervals.icu does): each day
+    ctl += (load - ctl) * (1 - exp(-1 / 42))
+    atl += (load - atl) * (1 - exp(-1 / 7))
+Series are kept in array('d') columns indexed by day offset, so a
+multi-year history is a few flat arrays and can be extended as days arrive.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from models import Activity, FitnessSnapshot, WellnessDay
+
+CTL_DAYS = 42
+ATL_DAYS = 7
+
+
+class FitnessSeries:
+    """Daily load/CTL/ATL columns starting at ``start``."""
+
+    def __init__(self, start: date, ctl: float = 0.0, atl: float = 0.0):
+        self.start = start
+        self.initial_ctl = ctl
+        self.initial_atl = atl
+        self.load = array("d")
+        self.ctl = array("d")
+        self.atl = array("d")
+
+    def __len__(self) -> int:
+        return len(self.load)
+
+    @property
+    def end(self) -> date | None:
+        """Last day in the series, or None if empty."""
+        if not self.load:
+            return None
+        return self.start + timedelta(days=len(self.load) - 1)
+
+    def copy(self) -> FitnessSeries:
+        other = FitnessSeries(self.start, self.initial_ctl, self.initial_atl)
+        other.load, other.ctl, other.atl = array("d", self.load), array("d", self.ctl), array("d", self.atl)
+        return other
+
+    def index(self, day: date) -> int:
+        return (day - self.start).days
+
+    def extend(self, daily_loads: Iterable[float]) -> None:
+        """Append consecutive days of load after the current end."""
+        k_ctl = 1 - math.exp(-1 / CTL_DAYS)
+        k_atl = 1 - math.exp(-1 / ATL_DAYS)
+        ctl = self.ctl[-1] if self.ctl else self.initial_ctl
+        atl = self.atl[-1] if self.atl else self.initial_atl
+        # Bind the appends once: this loop runs for every day of history
+        load_append, ctl_append, atl_append = self.load.append, self.ctl.append, self.atl.append
+        for load in daily_loads:
+            ctl += (load - ctl) * k_ctl
+            atl += (load - atl) * k_atl
+            load_append(load)
+            ctl_append(ctl)
+            atl_append(atl)
+
+    def recompute_from(self, day: date, daily_loads: Iterable[float]) -> None:
+        """Replace everything from ``day`` on (e.g. after late edits) and extend."""
+        i = max(0, min(self.index(day), len(self.load)))
+        del self.load[i:], self.ctl[i:], self.atl[i:]
+        self.extend(daily_loads)
+
+    def snapshot(self, day: date) -> FitnessSnapshot | None:
+        i = self.index(day)
+        if not 0 <= i < len(self.load):
+            return None
+        return FitnessSnapshot(date=day, ctl=self.ctl[i], atl=self.atl[i])
+
+    def latest(self) -> FitnessSnapshot | None:
+        return self.snapshot(self.end) if self.end else None
+
+
+def daily_loads(activities: Iterable[Activity], start: date, end: date) -> array:
+    """Sum icu_training_load per day over [start, end] into a flat array."""
+    loads = array("d", bytes(8 * ((end - start).days + 1)))
+    for a in activities:
+        i = (a.date - start).days
+        if 0 <= i < len(loads):
+            loads[i] += a.icu_training_load
+    return loads
+
+
+def compute_fitness(
+    activities: list[Activity],
+    start: date,
+    end: date,
+    ctl: float = 0.0,
+    atl: float = 0.0,
+) -> FitnessSeries:
+    """Build a FitnessSeries over [start, end] seeded with the day-before values."""
+    series = FitnessSeries(start, ctl, atl)
+    series.extend(daily_loads(activities, start, end))
+    return series
+
+
+@dataclass
+class ValidationReport:
+    days: int = 0
+    ctl_mae: float = 0.0
+    atl_mae: float = 0.0
+    ctl_max_error: float = 0.0
+    atl_max_error: float = 0.0
+
+
+def validate(series: FitnessSeries, wellness: list[WellnessDay]) -> ValidationReport:
+    """Compare the local series with server CTL/ATL on overlapping days."""
+    report = ValidationReport()
+    ctl_total = atl_total = 0.0
+    for w in wellness:
+        i = series.index(w.date)
+        if w.ctl is None or w.atl is None or not 0 <= i < len(series):
+            continue
+        ctl_err = abs(series.ctl[i] - w.ctl)
+        atl_err = abs(series.atl[i] - w.atl)
+        report.days += 1
+        ctl_total += ctl_err
+        atl_total += atl_err
+        report.ctl_max_error = max(report.ctl_max_error, ctl_err)
+        report.atl_max_error = max(report.atl_max_error, atl_err)
+    if report.days:
+        report.ctl_mae = ctl_total / report.days
+        report.atl_mae = atl_total / report.days
+    return report
@@ -0,0 +1,87 @@
+"""Project CTL/ATL/TSB through the rest of the plan from estimated workout TSS."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from analyzer import get_phase, local_fitness, season_weeks, week_dates
+from fitness import FitnessSeries
+from planned_load import planned_tss
+from planner import parse_weeks
+from session import Session, default_session
+
+
+@dataclass
+class WeekForecast:
+    week_number: int
+    start_date: date
+    end_date: date
+    phase: str
+    planned_tss: float
+    ctl_end: float
+    atl_end: float
+    tsb_end: float
+    tsb_min: float
+    flagged: bool = False
+
+
+def forecast_plan(
+    session: Session | None = None,
+    today: date | None = None,
+) -> tuple[FitnessSeries, list[WeekForecast]]:
+    """Project fitness day by day from today through the last plan week.
+
+    Planned loads start tomorrow; the series up to today comes from the local
+    fitness engine. Weeks whose minimum projected TSB drops below
+    fatigue.tsb_warning are flagged.
+    """
+    session = session or default_session()
+    cfg = session.config
+    today = today or date.today()
+    ftp = cfg["athlete"]["ftp"]
+    tsb_warning = cfg["fatigue"]["tsb_warning"]
+
+    first, last = season_weeks(session)
+    _, plan_end = week_dates(last, session)
+    tomorrow = today + timedelta(days=1)
+    weeks = [w for w in range(first, last + 1) if week_dates(w, session)[1] >= tomorrow]
+
+    # Copy so extending doesn't touch the session-cached history
+    series = local_fitness(today, session).copy()
+    if not len(series):
+        # Seeded from today's wellness: nothing computed yet, but keep its CTL/ATL
+        series = FitnessSeries(tomorrow, series.initial_ctl, series.initial_atl)
+
+    planned = array("d", bytes(8 * max(0, (plan_end - today).days)))
+    planned_by_week: dict[int, float] = {}
+    for week, workouts in parse_weeks(weeks, session.plan_dir, session.data_dir).items():
+        for w, tss in zip(workouts, planned_tss(workouts, ftp, cfg["zones"])):
+            planned_by_week[week] = planned_by_week.get(week, 0.0) + tss
+            i = (w.date - tomorrow).days
+            if 0 <= i < len(planned):
+                planned[i] += tss
+    series.recompute_from(tomorrow, planned)
+
+    forecasts = []
+    for week in weeks:
+        start, end = week_dates(week, session)
+        phase, _, _ = get_phase(week, session)
+        lo = max(series.index(start), series.index(tomorrow), 0)
+        hi = series.index(end)
+        tsb = [series.ctl[i] - series.atl[i] for i in range(lo, hi + 1)]
+        tsb_min = min(tsb) if tsb else 0.0
+        forecasts.append(WeekForecast(
+            week_number=week,
+            start_date=start,
+            end_date=end,
+            phase=phase,
+            planned_tss=planned_by_week.get(week, 0.0),
+            ctl_end=series.ctl[hi],
+            atl_end=series.atl[hi],
+            tsb_end=series.ctl[hi] - series.atl[hi],
+            tsb_min=tsb_min,
+            flagged=tsb_min < tsb_warning,
+        ))
+    return series, forecasts
@@ -0,0 +1,63 @@
+"""On-disk cache of GET responses for conditional requests."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class ResponseCache:
+    """One JSON file per URL+params holding the body and its validators.
+
+    Entries: {"url", "params", "etag", "last_modified", "stored_at", "body"}.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    @staticmethod
+    def key(url: str, params: dict | None) -> str:
+        raw = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def get(self, url: str, params: dict | None) -> dict | None:
+        path = self.directory / f"{self.key(url, params)}.json"
+        try:
+            return json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(
+        self,
+        url: str,
+        params: dict | None,
+        body: dict | list,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self.key(url, params)}.json"
+        entry = {
+            "url": url,
+            "params": params,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+            "body": body,
+        }
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, default=str))
+        tmp.replace(path)
+
+    def touch(self, url: str, params: dict | None, entry: dict) -> None:
+        """Mark a revalidated (304) entry as fresh."""
+        self.put(url, params, entry["body"], entry.get("etag"), entry.get("last_modified"))
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink()
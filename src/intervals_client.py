@@ -2,17 +2,134 @@
 
 from __future__ import annotations
 
+import functools
 import os
+import random
+import re
+import threading
 import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 
 import requests
-from dotenv import load_dotenv
 
-load_dotenv()
+from http_cache import ResponseCache
+from profiler import span
 
-BASE_URL = "https://intervals.icu/api/v1"
-REQUEST_INTERVAL = 0.12  # ~8 req/s, well under the 30/s limit
+BASE_URL = "https://intervals.icu/api/v1"  # overridden by INTERVALS_BASE_URL, e.g. for a mock server
+REQUEST_RATE = 10.0  # starting req/s shared by all threads, well under the 30/s limit
+REQUEST_RATE_MAX = 20.0  # ceiling the adaptive throttle may speed up to
+REQUEST_RATE_MIN = 0.5  # floor after repeated 429s
+REQUEST_BURST = 5  # requests allowed back-to-back before the rate applies
+REQUEST_TIMEOUT = 30.0  # seconds per request (connect + read)
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5  # seconds; doubles per attempt, with full jitter
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+PROFILE_TTL = 24 * 3600  # seconds a cached profile/sport settings response is reused
+POWER_CURVES_TTL = 3600  # curves change after every ride
+
+
+@functools.cache
+def load_env() -> None:
+    """Load .env into os.environ (once; variables already set win).
+
+    Called when credentials are first needed rather than at import, so
+    offline commands never import python-dotenv.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every request of one or more clients.
+
+    The rate adapts: each success nudges it up towards ``max_rate`` and each
+    429 halves it (down to REQUEST_RATE_MIN) and pauses all callers until the
+    server's Retry-After has passed.
+    """
+
+    def __init__(
+        self,
+        rate: float = REQUEST_RATE,
+        burst: int = REQUEST_BURST,
+        max_rate: float | None = None,
+    ):
+        self.rate = rate
+        self.max_rate = max_rate or rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request may be sent. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 0.1)
+
+    def rate_limited(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            self.rate = max(REQUEST_RATE_MIN, self.rate / 2)
+            self._tokens = 0.0
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+
+@dataclass
+class ClientStats:
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0  # 429 responses
+    failures: int = 0  # requests that gave up
+    bytes_received: int = 0
+    cache_hits: int = 0  # served from the response cache without a request
+    not_modified: int = 0  # 304s served from the response cache
+    throttle_wait: float = 0.0  # seconds blocked in the rate limiter
+    backoff_wait: float = 0.0  # seconds slept between retries
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} requests, {self.retries} retries "
+            f"({self.rate_limited}× 429), {self.failures} failed | "
+            f"{self.bytes_received / 1024:.0f} KiB, "
+            f"cache {self.cache_hits} hit / {self.not_modified} not modified | "
+            f"waited {self.throttle_wait:.1f}s throttled + {self.backoff_wait:.1f}s backoff"
+        )
+
+
+def _retry_after(resp: requests.Response) -> float | None:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date)."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 class IntervalsClient:
@@ -20,9 +137,16 @@ class IntervalsClient:
         self,
         api_key: str | None = None,
         athlete_id: str | None = None,
+        limiter: RateLimiter | None = None,
+        timeout: float = REQUEST_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+        cache_dir: Path | None = None,
+        base_url: str | None = None,
     ):
+        load_env()
         self.api_key = api_key or os.getenv("INTERVALS_API_KEY", "")
         self.athlete_id = athlete_id or os.getenv("INTERVALS_ATHLETE_ID", "0")
+        self.base_url = (base_url or os.getenv("INTERVALS_BASE_URL") or BASE_URL).rstrip("/")
         if not self.api_key:
             raise ValueError(
                 "INTERVALS_API_KEY not set. "
@@ -31,39 +155,149 @@ class IntervalsClient:
         self._session = requests.Session()
         self._session.auth = ("API_KEY", self.api_key)
         self._session.headers["Content-Type"] = "application/json"
-        self._last_request = 0.0
+        self.limiter = limiter or RateLimiter(max_rate=REQUEST_RATE_MAX)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.stats = ClientStats()
+        self._stats_lock = threading.Lock()
 
     def _url(self, path: str) -> str:
-        return f"{BASE_URL}/athlete/{self.athlete_id}/{path}"
+        return f"{self.base_url}/athlete/{self.athlete_id}/{path}"
+
+    def _count(self, **deltas: float) -> None:
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                setattr(self.stats, name, getattr(self.stats, name) + delta)
 
-    def _throttle(self) -> None:
-        elapsed = time.monotonic() - self._last_request
-        if elapsed < REQUEST_INTERVAL:
-            time.sleep(REQUEST_INTERVAL - elapsed)
-        self._last_request = time.monotonic()
+    def _throttle(self) -> float:
+        waited = self.limiter.acquire()
+        self._count(throttle_wait=waited)
+        return waited
+
+    def _route(self, url: str) -> str:
+        """Endpoint of a URL for profiling, e.g. "events/{id}"."""
+        path = url.removeprefix(self.base_url).removeprefix(f"/athlete/{self.athlete_id}")
+        return re.sub(r"/\d+(?=/|$)", "/{id}", path).strip("/") or "profile"
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> requests.Response:
+        """Send a request with timeout, retries and 429-aware backoff.
+
+        429s are always retried (the server did not process the request);
+        5xx responses and network errors only for idempotent requests.
+        """
+        with span(f"api {method} {self._route(url)}") as attrs:
+            return self._send(method, url, idempotent, attrs, **kwargs)
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        idempotent: bool,
+        attrs: dict,
+        **kwargs,
+    ) -> requests.Response:
+        attempt = 0
+        attrs.update(retries=0, throttle_wait=0.0, backoff_wait=0.0)
+        while True:
+            attrs["throttle_wait"] += self._throttle()
+            self._count(requests=1)
+            retry_after = None
+            try:
+                resp = self._session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or attempt >= self.max_retries:
+                    self._count(failures=1)
+                    raise
+            else:
+                attrs["status"] = resp.status_code
+                if resp.status_code not in RETRY_STATUSES:
+                    self.limiter.success()
+                    self._count(bytes_received=len(resp.content))
+                    attrs["bytes"] = len(resp.content)
+                    resp.raise_for_status()
+                    return resp
+                if resp.status_code == 429:
+                    retry_after = _retry_after(resp)
+                    self.limiter.rate_limited(retry_after)
+                    self._count(rate_limited=1)
+                elif not idempotent:
+                    attempt = self.max_retries
+                if attempt >= self.max_retries:
+                    self._count(failures=1)
+                    resp.raise_for_status()
+
+            if retry_after is not None:
+                delay = retry_after + random.uniform(0, BACKOFF_BASE)
+            else:
+                delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+            attempt += 1
+            self._count(retries=1, backoff_wait=delay)
+            attrs["retries"] += 1
+            attrs["backoff_wait"] += delay
+            time.sleep(delay)
 
     def _get(self, path: str, params: dict | None = None) -> dict | list:
-        self._throttle()
-        resp = self._session.get(self._url(path), params=params)
-        resp.raise_for_status()
-        return resp.json()
+        return self._request("GET", self._url(path), params=params).json()
+
+    def _get_cached(self, url: str, params: dict | None = None, ttl: float = 0) -> dict | list:
+        """GET through the response cache.
+
+        Responses with an ETag/Last-Modified are revalidated with a conditional
+        request (a 304 is served from cache); responses without validators are
+        reused for ``ttl`` seconds without contacting the server.
+        """
+        if self.cache is None:
+            return self._request("GET", url, params=params).json()
 
-    def _post(self, path: str, json_data: dict | list, params: dict | None = None) -> dict | list:
-        self._throttle()
-        resp = self._session.post(self._url(path), json=json_data, params=params)
-        resp.raise_for_status()
+        entry = self.cache.get(url, params)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            if not headers and time.time() - entry["stored_at"] < ttl:
+                self._count(cache_hits=1)
+                return entry["body"]
+
+        resp = self._request("GET", url, params=params, headers=headers)
+        if resp.status_code == 304 and entry:
+            self._count(not_modified=1)
+            self.cache.touch(url, params, entry)
+            return entry["body"]
+
+        body = resp.json()
+        self.cache.put(
+            url, params, body,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        return body
+
+    def _post(
+        self,
+        path: str,
+        json_data: dict | list,
+        params: dict | None = None,
+        idempotent: bool = False,
+    ) -> dict | list:
+        resp = self._request(
+            "POST", self._url(path), idempotent=idempotent, json=json_data, params=params,
+        )
         return resp.json()
 
     def _put(self, path: str, json_data: dict) -> dict:
-        self._throttle()
-        resp = self._session.put(self._url(path), json=json_data)
-        resp.raise_for_status()
-        return resp.json()
+        return self._request("PUT", self._url(path), json=json_data).json()
 
     def _delete(self, path: str) -> None:
-        self._throttle()
-        resp = self._session.delete(self._url(path))
-        resp.raise_for_status()
+        self._request("DELETE", self._url(path))
 
     # ── Activities ──────────────────────────────────────────
 
@@ -78,18 +312,29 @@ class IntervalsClient:
     # ── Athlete profile (sport settings, zones) ─────────────
 
     def get_profile(self) -> dict:
-        self._throttle()
-        resp = self._session.get(f"{BASE_URL}/athlete/{self.athlete_id}")
-        resp.raise_for_status()
-        return resp.json()
+        return self._get_cached(f"{self.base_url}/athlete/{self.athlete_id}", ttl=PROFILE_TTL)
 
     def get_sport_settings(self, sport: str = "Ride") -> dict:
-        return self._get(f"sport-settings/{sport}")
+        return self._get_cached(self._url(f"sport-settings/{sport}"), ttl=PROFILE_TTL)
 
     # ── Power curves ────────────────────────────────────────
 
     def get_power_curves(self, sport: str = "Ride", curves: str = "42d") -> dict | list:
-        return self._get("power-curves", {"type": sport, "curves": curves})
+        return self._get_cached(
+            self._url("power-curves"),
+            {"type": sport, "curves": curves},
+            ttl=POWER_CURVES_TTL,
+        )
+
+    # ── Activity streams ────────────────────────────────────
+
+    def get_activity_streams(self, activity_id: str, types: list[str]) -> list[dict]:
+        """Per-second streams of one activity as [{"type", "data"}, ...]."""
+        return self._request(
+            "GET",
+            f"{self.base_url}/activity/{activity_id}/streams",
+            params={"types": ",".join(types)},
+        ).json()
 
     # ── Events (calendar workouts) ──────────────────────────
 
@@ -105,8 +350,15 @@ class IntervalsClient:
     def delete_event(self, event_id: str) -> None:
         self._delete(f"events/{event_id}")
 
+    def bulk_delete_events(self, event_ids: list[str]) -> None:
+        """Delete many events in one request. Deleting by id is idempotent."""
+        self._request(
+            "PUT", self._url("events/bulk-delete"), json=[{"id": i} for i in event_ids],
+        )
+
     def bulk_upsert_events(self, events: list[dict]) -> list[dict]:
-        return self._post("events/bulk", events, params={"upsert": "true"})
+        # Upserts match on external_id, so repeating the call is safe
+        return self._post("events/bulk", events, params={"upsert": "true"}, idempotent=True)
 
     # ── Convenience ─────────────────────────────────────────
 
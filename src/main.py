@@ -5,81 +5,249 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from analyzer import (
-    analyze_week,
-    check_zones,
-    current_week_number,
-    get_latest_fitness,
-    load_config,
-)
-from display import (
-    bad,
-    bold,
-    header,
-    ok,
-    print_planned_workouts,
-    print_status_dashboard,
-    print_week_summary,
-    section,
-    warn,
-)
-from fetcher import fetch_all
-from intervals_client import IntervalsClient
-from planner import parse_week
-from pusher import clean_week, push_week
+# Handlers import what they use so that e.g. `status` never loads requests
+from profiler import span, start_profiling, stop_profiling, summarize, write_trace
+
+if TYPE_CHECKING:
+    from session import Session
 
 
 def cmd_fetch(args: argparse.Namespace) -> None:
-    client = IntervalsClient()
-    fetch_all(client, days=args.days)
+    from fetcher import DATA_DIR, HTTP_CACHE_DIR, SYNC_OVERLAP_DAYS, fetch_all
+    from intervals_client import IntervalsClient
+
+    # --full bypasses the HTTP response cache as well as the sync watermarks
+    client = IntervalsClient(cache_dir=None if args.full else DATA_DIR / HTTP_CACHE_DIR)
+    fetch_all(
+        client,
+        days=args.days,
+        full=args.full,
+        overlap=SYNC_OVERLAP_DAYS if args.overlap is None else args.overlap,
+        export_json=args.export_json,
+        streams=args.streams,
+    )
+    print(f"  API: {client.stats.summary()}")
 
 
 def cmd_analyze(args: argparse.Namespace) -> None:
-    week = args.week or current_week_number()
-    summary = analyze_week(week)
+    from analyzer import analyze_week, analyze_weeks, current_week_number
+    from display import print_season_table, print_stream_metrics, print_week_summary
+    from session import Session
+    from stream_metrics import stream_metrics
+
+    session = Session()
+    weeks = _selected_weeks(args, session)
+    if weeks:
+        print_season_table(analyze_weeks(*weeks, session))
+        return
+
+    week = current_week_number(session) if args.week is None else args.week
+    summary = analyze_week(week, session)
     print_week_summary(summary)
+    metrics = stream_metrics(summary.start_date.isoformat(), summary.end_date.isoformat(), session)
+    if metrics:
+        print_stream_metrics(metrics)
+
+
+def cmd_compliance(args: argparse.Namespace) -> None:
+    from analyzer import current_week_number
+    from compliance import compliance_report
+    from display import header, print_compliance_sessions, print_compliance_summary, section
+    from session import Session
+
+    session = Session()
+    weeks = _selected_weeks(args, session)
+    if weeks:
+        first, last = weeks
+    else:
+        first = last = current_week_number(session) if args.week is None else args.week
+
+    matches, weeks, phases = compliance_report(first, last, session)
+    if first == last:
+        print(header(f"Week {first} Compliance"))
+        print_compliance_sessions(matches)
+    else:
+        print(header(f"Weeks {first}–{last} Compliance"))
+        print_compliance_summary(weeks, "Week")
+        print(section("\nBy phase:"))
+        print_compliance_summary(phases, "Phase")
+    if args.sessions and first != last:
+        print(section("\nSessions:"))
+        print_compliance_sessions(matches)
 
 
 def cmd_plan_week(args: argparse.Namespace) -> None:
-    week = args.week or current_week_number() + 1
+    from analyzer import current_week_number
+    from display import bad, bold, print_planned_workouts, section, warn
+    from planned_load import workout_loads
+    from planner import parse_week
+    from session import Session
+    from workout import validate_workout
+
+    session = Session()
+    week = args.week or current_week_number(session) + 1
     workouts = parse_week(week)
     if not workouts:
         print(bad(f"No workouts found for week {week}."))
         print("  Check that a plan/block_*.md file covers this week.")
         sys.exit(1)
 
-    print_planned_workouts(workouts, week)
+    cfg = session.config
+    print_planned_workouts(workouts, week, workout_loads(workouts, cfg["athlete"]["ftp"], cfg["zones"]))
 
     # Show structured workout details
     for w in workouts:
         if w.workout_text:
             print(section(f"\n{w.date} — {w.name}"))
             print(w.workout_text)
+            for problem in validate_workout(w.workout_text):
+                print(warn(f"  ⚠ {problem}"))
 
     if args.dry_run:
         print(f"\n  {bold('Dry run')} — workouts parsed but not pushed.")
 
 
 def cmd_push(args: argparse.Namespace) -> None:
-    week = args.week or current_week_number() + 1
+    from analyzer import current_week_number
+    from display import bad
+    from intervals_client import IntervalsClient
+    from planner import parse_week
+    from pusher import push_week
+    from session import Session
+
+    session = Session()
+    if args.all or args.weeks:
+        _push_range(args, session)
+        return
+
+    week = args.week or current_week_number(session) + 1
     workouts = parse_week(week)
     if not workouts:
         print(bad(f"No workouts found for week {week}."))
         sys.exit(1)
 
     client = IntervalsClient()
-    push_week(client, workouts, week, dry_run=args.dry_run)
+    push_week(client, workouts, week, dry_run=args.dry_run, session=session, force=args.force)
+    print(f"  API: {client.stats.summary()}")
+
+
+def _push_range(args: argparse.Namespace, session: Session) -> None:
+    from analyzer import current_week_number
+    from display import bad
+    from intervals_client import IntervalsClient
+    from planner import parse_weeks
+    from pusher import push_weeks
+
+    if args.weeks:
+        first, last = args.weeks
+    else:
+        first = current_week_number(session) + 1
+        last = session.config["plan"]["weeks"]
+    workouts_by_week = parse_weeks(list(range(first, last + 1)))
+    if not any(workouts_by_week.values()):
+        print(bad(f"No workouts found for weeks {first}–{last}."))
+        sys.exit(1)
+
+    client = IntervalsClient()
+    push_weeks(client, workouts_by_week, dry_run=args.dry_run, session=session, force=args.force)
+    print(f"  API: {client.stats.summary()}")
+
+
+def _durations(text: str) -> tuple[int, ...]:
+    """argparse type: '5,60,1200' as positive durations in seconds."""
+    try:
+        durations = tuple(int(d) for d in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid durations '{text}' (expected seconds, e.g. 5,60,1200)") from None
+    if any(d <= 0 for d in durations):
+        raise argparse.ArgumentTypeError(f"durations must be positive seconds, got '{text}'")
+    return durations
+
+
+def _week_range(text: str) -> tuple[int, int]:
+    """argparse type: '5-12' (or a single '7') as (first, last)."""
+    first, _, last = text.partition("-")
+    try:
+        first, last = int(first), int(last or first)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid week range '{text}' (expected e.g. 5-12)") from None
+    _check_week_order(first, last)
+    return first, last
+
+
+def _check_week_order(first: int, last: int) -> None:
+    if first > last:
+        raise argparse.ArgumentTypeError(f"week range {first}-{last} is reversed (did you mean {last}-{first}?)")
+
+
+def _week_number(text: str) -> int:
+    """argparse type: a plan week, counted from 1."""
+    try:
+        week = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid week '{text}'") from None
+    if week < 1:
+        raise argparse.ArgumentTypeError(f"weeks are numbered from 1, got {week}")
+    return week
+
+
+def _add_week_options(p: argparse.ArgumentParser, season_help: str) -> None:
+    """--week | --season | --from-week/--to-week, checked by _check_week_options."""
+    which = p.add_mutually_exclusive_group()
+    which.add_argument("--week", type=_week_number, help="Week number (default: current)")
+    which.add_argument("--season", action="store_true", help=season_help)
+    p.add_argument("--from-week", type=_week_number, help="First week of a range (default: 1)")
+    p.add_argument("--to-week", type=_week_number, help="Last week of a range (default: current)")
+
+
+def _check_week_options(p: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    # A group can't hold the --from-week/--to-week pair, so the range is checked here
+    if (args.from_week is not None or args.to_week is not None) and (args.week is not None or args.season):
+        p.error("--from-week/--to-week not allowed with --week or --season")
+    if args.from_week is not None and args.to_week is not None:
+        try:
+            _check_week_order(args.from_week, args.to_week)
+        except argparse.ArgumentTypeError as e:
+            p.error(str(e))
+
+
+def _selected_weeks(args: argparse.Namespace, session: Session) -> tuple[int, int] | None:
+    """(first, last) for --season or --from-week/--to-week; None for a single week."""
+    from analyzer import current_week_number, season_weeks
+
+    if not args.season and args.from_week is None and args.to_week is None:
+        return None
+    first, last = season_weeks(session)
+    if args.season:
+        return first, last
+    if args.from_week is not None:
+        first = args.from_week
+    if args.to_week is not None:
+        return first, args.to_week
+    return first, max(first, current_week_number(session))
 
 
 def cmd_clean(args: argparse.Namespace) -> None:
-    week = args.week or current_week_number() + 1
+    from analyzer import current_week_number
+    from display import bold, ok
+    from intervals_client import IntervalsClient
+    from planner import parse_week
+    from pusher import clean_week
+    from session import Session
+
+    session = Session()
+    week = args.week or current_week_number(session) + 1
     workouts = parse_week(week)
     current_ids = {w.external_id for w in workouts if w.external_id}
 
     client = IntervalsClient()
-    stale = clean_week(client, week, current_ids, dry_run=args.dry_run)
+    stale = clean_week(client, week, current_ids, dry_run=args.dry_run, session=session)
 
     if not stale:
         print(ok(f"No stale events for week {week}."))
@@ -91,9 +259,13 @@ def cmd_clean(args: argparse.Namespace) -> None:
 
 
 def cmd_status(args: argparse.Namespace) -> None:
-    cfg = load_config()
-    config_ftp = cfg["athlete"]["ftp"]
-    fitness = get_latest_fitness()
+    from analyzer import current_week_number, get_latest_fitness
+    from display import print_status_dashboard, warn
+    from session import Session
+
+    session = Session()
+    config_ftp = session.config["athlete"]["ftp"]
+    fitness = get_latest_fitness(session)
 
     if not fitness:
         print(warn("No fitness data cached. Run 'python main.py fetch' first."))
@@ -109,16 +281,88 @@ def cmd_status(args: argparse.Namespace) -> None:
     )
 
     print(f"\n  Data from: {fitness.date}")
-    print(f"  Current training week: {current_week_number()}")
+    print(f"  Current training week: {current_week_number(session)}")
+
+
+def cmd_batch(args: argparse.Namespace) -> None:
+    from batch import BATCH_WORKERS, ROSTER_PATH, load_roster, run_batch
+    from display import bad
+    from intervals_client import REQUEST_RATE
+
+    roster = Path(args.roster) if args.roster else ROSTER_PATH
+    if not roster.exists():
+        print(bad(f"Roster {roster} not found (see roster.example.toml)."))
+        sys.exit(1)
+    athletes, settings = load_roster(roster)
+    if not athletes:
+        print(bad(f"No athletes in {roster}."))
+        sys.exit(1)
+
+    results = run_batch(
+        args.batch_command,
+        athletes,
+        options={
+            "days": args.days,
+            "full": args.full,
+            "week": args.week,
+            "dry_run": args.dry_run,
+        },
+        workers=args.workers or settings.get("workers", BATCH_WORKERS),
+        rate=args.rate or settings.get("rate", REQUEST_RATE),
+        verbose=args.verbose,
+    )
+    if any(row is None for _, row, _ in results):
+        sys.exit(1)
+
+
+def cmd_fitness(args: argparse.Namespace) -> None:
+    from analyzer import load_wellness, local_fitness
+    from display import print_fitness_comparison
+    from fitness import validate
+    from session import Session
+
+    session = Session()
+    series = local_fitness(session=session)
+    wellness = load_wellness(series.start, series.end, session) if len(series) else []
+    print_fitness_comparison(series, wellness, validate(series, wellness), days=args.days)
+
+
+def cmd_forecast(args: argparse.Namespace) -> None:
+    from display import print_forecast
+    from forecast import forecast_plan
+    from session import Session
+
+    session = Session()
+    _, forecasts = forecast_plan(session)
+    print_forecast(forecasts, session.config["fatigue"]["tsb_warning"])
+
+
+def cmd_curves(args: argparse.Namespace) -> None:
+    from curves import analyze_curves, cached_curves, load_curves
+    from display import print_power_curves
+    from session import Session
+
+    session = Session()
+    athlete = session.config["athlete"]
+    if args.durations:
+        analysis = analyze_curves(load_curves(session.power_curves), args.durations)
+    else:
+        analysis = cached_curves(session)
+    print_power_curves(analysis, athlete["ftp"], athlete.get("weight"))
 
 
 def cmd_zones(args: argparse.Namespace) -> None:
-    cfg = load_config()
+    from analyzer import check_zones
+    from display import header, ok, section
+    from session import Session
+
+    session = Session()
+    cfg = session.config
     config_ftp = cfg["athlete"]["ftp"]
 
     print(header("Zone Check"))
 
-    result = check_zones(config_ftp)
+    result = check_zones(config_ftp, session)
     print(f"\n  {result['message']}")
 
     if result["eftp"] and abs(result["drift"]) > cfg["fatigue"]["eftp_drift_threshold"]:
@@ -137,15 +381,99 @@ def cmd_zones(args: argparse.Namespace) -> None:
             print("  No changes made.")
 
 
+def cmd_mock_server(args: argparse.Namespace) -> None:
+    from display import bold, header, section, warn
+    from intervals_client import load_env
+    from mock_server import DEFAULT_PORT, Faults, MockAthlete, MockIntervals
+    from session import Session
+
+    load_env()
+    session = Session()
+    athlete_id = os.getenv("INTERVALS_ATHLETE_ID", "0")
+    port = DEFAULT_PORT if args.port is None else args.port
+    server = MockIntervals(args.host, port, Faults(
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+        fail_every=args.fail_every,
+        failure_status=args.failure_status,
+    ))
+    # Serve the local store's history so fetch has something to sync
+    store = session.store
+    server.add_athlete(MockAthlete(
+        athlete_id,
+        store.records("activities"),
+        store.records("wellness"),
+        session.config["athlete"]["ftp"],
+    ))
+    print(header("Mock Intervals.icu API"))
+    print(f"\n  Serving athlete {athlete_id} at {bold(server.base_url)}")
+    print(f"  export INTERVALS_BASE_URL={server.base_url}")
+    print("  Ctrl-C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    print(section("\nRequests:"))
+    for route, count in sorted(server.counts().items()):
+        print(f"  {route:<28} {count}")
+    for status, count in sorted(server.injected_counts().items()):
+        print(warn(f"  injected {status}: {count}"))
+
+
+def cmd_serve(args: argparse.Namespace) -> None:
+    from daemon import DEFAULT_PORT, Daemon, make_server, write_token
+    from display import bold, header
+    from fetcher import DATA_DIR, HTTP_CACHE_DIR
+    from intervals_client import IntervalsClient
+    from session import Session
+
+    client = IntervalsClient(cache_dir=DATA_DIR / HTTP_CACHE_DIR)
+    daemon = Daemon(Session(), client, interval=args.interval, days=args.days)
+    socket_path = Path(args.socket) if args.socket else None
+    port = DEFAULT_PORT if args.port is None else args.port
+    # The Unix socket is mode 0600; TCP is reachable from any local process or browser
+    token, token_path = (None, None) if socket_path else write_token(DATA_DIR)
+    server = make_server(daemon, args.host, port, socket_path, token)
+    if socket_path:
+        address = f"unix:{socket_path}"
+    else:
+        address = "http://{}:{}".format(*server.server_address[:2])
+    print(header("Intervals.icu daemon"))
+    print(f"\n  Serving {bold(address)}")
+    print("  GET /status, GET /analyze, POST /push, POST /sync, GET /health")
+    if token_path:
+        print(f"  POST routes need 'Authorization: Bearer <token>' from {token_path}")
+    if args.interval > 0:
+        print(f"  Syncing every {args.interval:g}s")
+    print("  Ctrl-C to stop.\n")
+    daemon.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+        server.server_close()
+        if socket_path:
+            socket_path.unlink(missing_ok=True)
+        if token_path:
+            token_path.unlink(missing_ok=True)
+    print(f"\n  API: {client.stats.summary()}")
+
+
 def _update_config_ftp(new_ftp: int) -> None:
     """Update the ftp value in config.toml (preserves file structure)."""
     import re
-    from pathlib import Path
 
-    config_path = Path(__file__).parent.parent / "config.toml"
-    text = config_path.read_text()
+    from session import CONFIG_PATH
+
+    text = CONFIG_PATH.read_text()
     text = re.sub(r"^(ftp\s*=\s*)\d+", rf"\g<1>{new_ftp}", text, count=1, flags=re.MULTILINE)
-    config_path.write_text(text)
+    CONFIG_PATH.write_text(text)
 
 
 def main() -> None:
@@ -154,6 +482,10 @@ def main() -> None:
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="Workflow: fetch → analyze → plan-week --dry-run → push | clean",
     )
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a per-phase timing and API request summary after the command")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Write profiling spans as a JSON trace (implies --profile)")
     sub = parser.add_subparsers(dest="command", required=True)
 
     # fetch
@@ -161,10 +493,24 @@ def main() -> None:
     p_fetch = sub.add_parser("fetch", help="Pull data from Intervals.icu")
     p_fetch.add_argument("--days", type=int, default=fetch_days_default,
                          help=f"Days of history (default: {fetch_days_default})")
+    p_fetch.add_argument("--full", action="store_true",
+                         help="Re-download the whole window instead of syncing from the last fetch")
+    # Default lives in fetcher.SYNC_OVERLAP_DAYS; importing it here would load sqlite3 for --help
+    p_fetch.add_argument("--overlap", type=int,
+                         help="Days re-fetched behind the last sync for late edits (default: 3)")
+    p_fetch.add_argument("--export-json", action="store_true",
+                         help="Also write data/activities.json and data/wellness.json")
+    p_fetch.add_argument("--streams", action="store_true",
+                         help="Also download per-second power/HR/cadence streams of new rides")
 
     # analyze
     p_analyze = sub.add_parser("analyze", help="Show weekly training summary")
-    p_analyze.add_argument("--week", type=int, help="Week number (default: current)")
+    _add_week_options(p_analyze, "Summarize every plan week")
+
+    # compliance
+    p_compliance = sub.add_parser("compliance", help="Match planned workouts to completed activities")
+    _add_week_options(p_compliance, "Every plan week, with per-phase totals")
+    p_compliance.add_argument("--sessions", action="store_true", help="List every session for a range")
 
     # plan-week
     p_plan = sub.add_parser("plan-week", help="Parse block markdown into workouts")
@@ -173,8 +519,12 @@ def main() -> None:
 
     # push
     p_push = sub.add_parser("push", help="Push workouts to Intervals.icu calendar")
-    p_push.add_argument("--week", type=int, help="Week number (default: next week)")
+    p_push_which = p_push.add_mutually_exclusive_group()
+    p_push_which.add_argument("--week", type=int, help="Week number (default: next week)")
+    p_push_which.add_argument("--weeks", type=_week_range, help="Range of weeks to push, e.g. 5-12")
+    p_push_which.add_argument("--all", action="store_true", help="Push every remaining plan week")
     p_push.add_argument("--dry-run", action="store_true", help="Preview API payloads without sending")
+    p_push.add_argument("--force", action="store_true", help="Send every event, even unchanged ones")
 
     # clean
     p_clean = sub.add_parser("clean", help="Remove stale events from Intervals.icu calendar")
@@ -187,18 +537,91 @@ def main() -> None:
     # zones
     sub.add_parser("zones", help="Compare configured FTP vs detected eFTP")
 
+    # fitness
+    p_fitness = sub.add_parser("fitness", help="Local CTL/ATL/TSB model vs Intervals.icu values")
+    p_fitness.add_argument("--days", type=int, default=14, help="Days to list (default: 14)")
+
+    # curves
+    p_curves = sub.add_parser("curves", help="Best efforts, CP/W' and deltas across cached power curves")
+    p_curves.add_argument("--durations", type=_durations,
+                          help="Comma-separated durations in seconds (default: 5s–1h)")
+
+    # forecast
+    sub.add_parser("forecast", help="Project CTL/ATL/TSB through the rest of the plan")
+
+    # mock-server
+    p_mock = sub.add_parser("mock-server", help="Serve a local mock of the Intervals.icu API for offline testing")
+    p_mock.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    p_mock.add_argument("--port", type=int, help="Port (default: 8765)")
+    p_mock.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    p_mock.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Requests/second before answering 429 (default: unlimited)")
+    p_mock.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with 429")
+    p_mock.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    p_mock.add_argument("--fail-every", type=int, default=0, help="Answer every Nth request with an error")
+    p_mock.add_argument("--failure-status", type=int, default=503, help="Status for --fail-every (default: 503)")
+
+    # serve
+    p_serve = sub.add_parser("serve", help="Keep data warm and answer status/analyze/push over a local HTTP API")
+    p_serve.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    p_serve.add_argument("--port", type=int, help="Port (default: 8766)")
+    p_serve.add_argument("--socket", help="Listen on this Unix socket instead of TCP")
+    p_serve.add_argument("--interval", type=float, default=900,
+                         help="Seconds between incremental syncs; 0 disables polling (default: 900)")
+    p_serve.add_argument("--days", type=int, default=fetch_days_default,
+                         help=f"Days of history for a first sync (default: {fetch_days_default})")
+
+    # batch
+    p_batch = sub.add_parser("batch", help="Run fetch/analyze/compliance/push/status for every athlete in a roster")
+    p_batch.add_argument("batch_command", choices=["fetch", "analyze", "compliance", "push", "status"])
+    p_batch.add_argument("--roster", help="Roster file (default: roster.toml in the repository root)")
+    p_batch.add_argument("--workers", type=int, help="Athletes processed in parallel")
+    p_batch.add_argument("--rate", type=float, help="Total requests/second across all athletes")
+    p_batch.add_argument("--days", type=int, default=fetch_days_default,
+                         help=f"fetch: days of history (default: {fetch_days_default})")
+    p_batch.add_argument("--full", action="store_true", help="fetch: re-download the whole window")
+    p_batch.add_argument("--week", type=int, help="analyze/push: week number (default: current/next)")
+    p_batch.add_argument("--dry-run", action="store_true", help="push: preview without sending")
+    p_batch.add_argument("--verbose", action="store_true", help="Show each athlete's output")
+
     args = parser.parse_args()
+    if args.command in ("analyze", "compliance"):
+        _check_week_options(sub.choices[args.command], args)
 
     commands = {
         "fetch": cmd_fetch,
         "analyze": cmd_analyze,
+        "compliance": cmd_compliance,
         "plan-week": cmd_plan_week,
         "push": cmd_push,
         "clean": cmd_clean,
         "status": cmd_status,
         "zones": cmd_zones,
+        "fitness": cmd_fitness,
+        "forecast": cmd_forecast,
+        "curves": cmd_curves,
+        "mock-server": cmd_mock_server,
+        "serve": cmd_serve,
+        "batch": cmd_batch,
     }
-    commands[args.command](args)
+    if not (args.profile or args.trace):
+        commands[args.command](args)
+        return
+
+    from display import print_profile
+
+    start_profiling()
+    started = time.perf_counter()
+    try:
+        with span(f"command {args.command}"):
+            commands[args.command](args)
+    finally:
+        wall = time.perf_counter() - started
+        spans = stop_profiling()
+        print_profile(summarize(spans), wall)
+        if args.trace:
+            path = write_trace(Path(args.trace), spans, {"command": args.command, "wall_s": wall})
+            print(f"\n  Trace written to {path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,299 @@
+"""In-process mock of the Intervals.icu API for offline load and retry testing.
+
+Serves the endpoints IntervalsClient calls (profile, activities, wellness,
+sport settings, power curves and events, including bulk upsert/delete)
+from in-memory data on a local ThreadingHTTPServer. Point a client at it
+with INTERVALS_BASE_URL (or IntervalsClient(base_url=...)).
+
+Faults (latency, 429s, server errors) are injected by request arrival
+order rather than at random, so a run with the same settings sees the same
+number of retries every time. An optional token-bucket rate limit answers
+429s like the real API does when a client sends too fast.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/api/v1"
+DEFAULT_PORT = 8765
+CURVE_SECS = (1, 5, 15, 30, 60, 120, 180, 300, 600, 900, 1200, 1800, 2700, 3600)
+
+
+@dataclass
+class Faults:
+    """What to inject; every request is numbered 1, 2, 3... as it arrives."""
+
+    latency: float = 0.0  # seconds added to every response
+    rate_limit: float = 0.0  # requests/second served before answering 429 (0 = no limit)
+    rate_limit_every: int = 0  # answer every Nth request with 429
+    retry_after: float = 1.0  # Retry-After seconds sent with 429s
+    fail_every: int = 0  # answer every Nth request with failure_status
+    failure_status: int = 503
+
+
+class MockAthlete:
+    """One athlete's server-side data, sorted by date for range queries."""
+
+    def __init__(
+        self,
+        athlete_id: str,
+        activities: list[dict] | None = None,
+        wellness: list[dict] | None = None,
+        ftp: int = 250,
+    ):
+        self.athlete_id = athlete_id
+        self.ftp = ftp
+        self.activities = sorted(activities or [], key=lambda a: a["start_date_local"])
+        self.activity_days = [a["start_date_local"][:10] for a in self.activities]
+        self.wellness = sorted(wellness or [], key=lambda w: w["id"])
+        self.wellness_days = [w["id"] for w in self.wellness]
+        self.events: dict[int, dict] = {}
+        self.external_ids: dict[str, int] = {}
+        self.next_event_id = 1
+
+    def activities_between(self, oldest: str, newest: str) -> list[dict]:
+        days = self.activity_days
+        return self.activities[bisect_left(days, oldest):bisect_right(days, newest)]
+
+    def wellness_between(self, oldest: str, newest: str) -> list[dict]:
+        days = self.wellness_days
+        return self.wellness[bisect_left(days, oldest):bisect_right(days, newest)]
+
+    def power_curves(self, windows: list[str]) -> dict:
+        """Two-parameter CP curves (CP ≈ 0.95 FTP, W' 20 kJ) per window."""
+        cp = self.ftp * 0.95
+        curves = []
+        for i, window in enumerate(windows):
+            scale = 1 - 0.02 * i
+            curves.append({
+                "id": window,
+                "label": window,
+                "secs": list(CURVE_SECS),
+                "watts": [round(scale * (cp + 20000 / max(s, 30))) for s in CURVE_SECS],
+            })
+        return {"list": curves}
+
+
+class MockIntervals:
+    """Local HTTP server emulating the subset of Intervals.icu the CLI uses.
+
+    ``start()`` returns the base URL to point IntervalsClient at. Unknown
+    athlete ids get an empty account on first use. Requests are counted per
+    route (``"GET activities"``, ``"POST events/bulk"``...) and injected
+    faults per status code.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Faults | None = None,
+    ):
+        self.faults = faults or Faults()
+        self.athletes: dict[str, MockAthlete] = {}
+        self.requests: Counter[str] = Counter()
+        self.injected: Counter[int] = Counter()
+        self._lock = threading.Lock()
+        self._arrivals = 0
+        self._tokens = max(1.0, self.faults.rate_limit)
+        self._updated = time.monotonic()
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def add_athlete(self, athlete: MockAthlete) -> None:
+        with self._lock:
+            self.athletes[athlete.athlete_id] = athlete
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.injected.clear()
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.requests)
+
+    def injected_counts(self) -> dict[int, int]:
+        with self._lock:
+            return dict(self.injected)
+
+    def _admit(self, route: str) -> int | None:
+        """Count a request and return the status to fail it with, if any."""
+        faults = self.faults
+        with self._lock:
+            self.requests[route] += 1
+            self._arrivals += 1
+            n = self._arrivals
+            status = None
+            if faults.rate_limit:
+                now = time.monotonic()
+                burst = max(1.0, faults.rate_limit)
+                self._tokens = min(burst, self._tokens + (now - self._updated) * faults.rate_limit)
+                self._updated = now
+                if self._tokens < 1:
+                    status = 429
+                else:
+                    self._tokens -= 1
+            if status is None and faults.rate_limit_every and n % faults.rate_limit_every == 0:
+                status = 429
+            if status is None and faults.fail_every and n % faults.fail_every == 0:
+                status = faults.failure_status
+            if status:
+                self.injected[status] += 1
+            return status
+
+    def __enter__(self) -> MockIntervals:
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+_ATHLETE_PATH = re.compile(rf"^{API_PREFIX}/athlete/([^/]+)(?:/(.*))?$")
+
+
+def _handler(server: MockIntervals) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+        def do_PUT(self) -> None:
+            self._dispatch("PUT")
+
+        def do_DELETE(self) -> None:
+            self._dispatch("DELETE")
+
+        def _dispatch(self, method: str) -> None:
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+
+            match = _ATHLETE_PATH.match(url.path)
+            path = (match.group(2) or "") if match else None
+            route = "unknown" if path is None else re.sub(r"/\d+$", "/{id}", path) or "profile"
+            status = server._admit(f"{method} {route}")
+            if server.faults.latency:
+                time.sleep(server.faults.latency)
+            if status == 429:
+                retry_after = f"{server.faults.retry_after:g}"
+                return self._send(429, {"error": "Too many requests"}, {"Retry-After": retry_after})
+            if status:
+                return self._send(status, {"error": "Injected failure"})
+            if path is None:
+                return self._send(404, {"error": "Not found"})
+
+            with server._lock:
+                athlete = server.athletes.setdefault(match.group(1), MockAthlete(match.group(1)))
+                status, payload = _route(athlete, method, path, params, body)
+                # Serialize under the lock: payloads share the athlete's lists
+                data = json.dumps(payload).encode()
+            if status == 200 and method == "GET" and route == "power-curves":
+                etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, None)
+                return self._send(200, data, {"ETag": etag})
+            self._send(status, data)
+
+        def _send(self, status: int, payload, headers: dict | None = None) -> None:
+            if isinstance(payload, bytes):
+                data = payload
+            else:
+                data = b"" if payload is None else json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+def _route(athlete: MockAthlete, method: str, path: str, params: dict, body) -> tuple[int, object]:
+    oldest, newest = params.get("oldest", ""), params.get("newest", "9999")
+    if method == "GET" and path == "":
+        return 200, {"id": athlete.athlete_id, "name": f"Athlete {athlete.athlete_id}"}
+    if method == "GET" and path == "activities":
+        return 200, athlete.activities_between(oldest, newest)
+    if method == "GET" and path == "wellness":
+        return 200, athlete.wellness_between(oldest, newest)
+    if method == "GET" and path.startswith("sport-settings/"):
+        return 200, {"types": [path.split("/", 1)[1]], "ftp": athlete.ftp, "lthr": 160, "max_hr": 175}
+    if method == "GET" and path == "power-curves":
+        return 200, athlete.power_curves(params.get("curves", "42d").split(","))
+    if method == "GET" and path == "events":
+        # Event dates are local datetimes; compare on the date part
+        return 200, [e for e in athlete.events.values()
+                     if oldest <= e.get("start_date_local", "")[:10] <= newest]
+    if method == "POST" and path == "events/bulk":
+        return 200, [_upsert(athlete, event) for event in body or []]
+    if method == "POST" and path == "events":
+        return 200, _upsert(athlete, body or {})
+    if method == "PUT" and re.fullmatch(r"events/\d+", path):
+        event = athlete.events.get(int(path.rsplit("/", 1)[1]))
+        if event is None:
+            return 404, {"error": "Event not found"}
+        event.update(body or {})
+        return 200, event
+    if method == "PUT" and path == "events/bulk-delete":
+        for ref in body or []:
+            athlete.events.pop(int(ref["id"]), None)
+        return 200, {"eventsDeleted": len(body or [])}
+    if method == "DELETE" and re.fullmatch(r"events/\d+", path):
+        found = athlete.events.pop(int(path.rsplit("/", 1)[1]), None)
+        return (200, {}) if found else (404, {"error": "Event not found"})
+    return 404, {"error": "Not found"}
+
+
+def _upsert(athlete: MockAthlete, event: dict) -> dict:
+    """Create an event, or update the one with the same external_id."""
+    external_id = event.get("external_id")
+    existing = athlete.events.get(athlete.external_ids.get(external_id, 0))
+    if existing:
+        existing.update(event)
+        return {**existing, "updated": True}
+    stored = {**event, "id": athlete.next_event_id}
+    athlete.events[stored["id"]] = stored
+    if external_id:
+        athlete.external_ids[external_id] = stored["id"]
+    athlete.next_event_id += 1
+    return dict(stored)
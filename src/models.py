@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import date, datetime
 
+from workout import Workout, normalize_durations
+
 
 @dataclass
 class Activity:
@@ -103,6 +105,7 @@ class PlannedWorkout:
     workout_type: str = "Ride"  # Ride, VirtualRide, WeightTraining
     zones: str = ""  # e.g. "Z2-Z4"
     external_id: str = ""  # for upsert matching
+    steps: Workout | None = None  # parsed workout_text, None if absent or unparseable
 
     def to_event(self) -> dict:
         """Convert to Intervals.icu event API payload."""
@@ -113,10 +116,11 @@ class PlannedWorkout:
             "name": self.name,
             "external_id": self.external_id,
         }
-        if self.workout_text:
-            event["description"] = self.workout_text
+        if self.steps:
+            event["description"] = self.steps.to_text()
         else:
-            event["description"] = self.description
+            # Unparsed text still needs 'min' → 'm' for Intervals.icu to build steps
+            event["description"] = normalize_durations(self.workout_text or self.description)
         if self.duration_minutes:
             event["moving_time"] = self.duration_minutes * 60
         return event
@@ -134,6 +138,7 @@ class WeekSummary:
     strength_count: int = 0
     planned_hours_min: float = 0.0
     planned_hours_max: float = 0.0
+    planned_tss: float = 0.0  # estimated from the plan's workouts
     ctl_start: float | None = None
     ctl_end: float | None = None
     atl_end: float | None = None
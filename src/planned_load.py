@@ -0,0 +1,144 @@
+"""Expected TSS / IF / NP / time-in-zone for planned workouts.
+
+Steps from every workout in a batch are flattened into one set of array
+columns (owning workout, expanded seconds, low/high fraction of FTP) and
+reduced back per workout, so a whole block costs a few passes
+over flat arrays rather than per-workout text handling.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from dataclasses import dataclass, field
+
+from models import PlannedWorkout
+from workout import TARGET_ZONE
+
+# Typical intensity factor per power zone, for the table's zones column
+ZONE_IF = {1: 0.50, 2: 0.68, 3: 0.83, 4: 0.95, 5: 1.08, 6: 1.30, 7: 1.60}
+DEFAULT_RIDE_IF = 0.65  # HR-only or untargeted steps, unstructured rides with no zone hint
+STRENGTH_TSS_PER_HOUR = 30.0
+TOP_ZONE_SPAN = 0.25  # width assumed for the open-ended top zone
+
+
+@dataclass
+class WorkoutLoad:
+    seconds: int
+    tss: float
+    intensity: float  # IF = NP / FTP
+    normalized_power: float
+    zone_seconds: list[float] = field(default_factory=list)  # Z1..Zn
+
+
+def zone_bounds(zones: dict) -> list[float]:
+    """config [zones] upper bounds (% FTP) as ascending fractions of FTP."""
+    return sorted(pct / 100 for pct in zones.values())
+
+
+def workout_loads(
+    workouts: list[PlannedWorkout],
+    ftp: float,
+    zones: dict,
+) -> list[WorkoutLoad | None]:
+    """Load figures for each workout with parsed steps (None for the rest).
+
+    Power per step is the %FTP/watt target, the middle of the config band
+    for zone targets, or DEFAULT_RIDE_IF for HR/untargeted steps. Ramps
+    vary linearly from low to high; ranges are ridden at their midpoint.
+    NP is the fourth-power mean of planned power (30 s smoothing is moot
+    for steps this long) and TSS = hours × IF² × 100.
+    """
+    bounds = zone_bounds(zones)
+    edges = array("d", [0.0] + bounds + [bounds[-1] + TOP_ZONE_SPAN if bounds else 2.0])
+    n_zones = len(edges) - 1
+
+    # Flatten every step of every workout into columns
+    owner = array("I")
+    seconds = array("d")
+    low = array("d")
+    high = array("d")
+    for index, w in enumerate(workouts):
+        steps = w.steps
+        if not steps:
+            continue
+        for i, count in enumerate(steps.counts()):
+            fraction = steps.ftp_fraction(i, ftp)
+            if fraction:
+                lo, hi = fraction
+                if not steps.ramp[i]:
+                    lo = hi = (lo + hi) / 2
+            elif steps.target[i] == TARGET_ZONE:
+                lo = hi = _zone_middle(edges, int(steps.low[i]), int(steps.high[i]))
+            else:
+                lo = hi = DEFAULT_RIDE_IF
+            owner.append(index)
+            seconds.append(steps.seconds[i] * count)
+            low.append(lo)
+            high.append(hi)
+
+    total = array("d", bytes(8 * len(workouts)))
+    fourth = array("d", bytes(8 * len(workouts)))
+    in_zone = array("d", bytes(8 * len(workouts) * n_zones))
+    for owner_i, t, lo, hi in zip(owner, seconds, low, high):
+        total[owner_i] += t
+        span = hi - lo
+        if span:
+            # Mean of p⁴ over a linear ramp: (hi⁵ - lo⁵) / (5 · span)
+            fourth[owner_i] += t * (hi ** 5 - lo ** 5) / (5 * span)
+        else:
+            fourth[owner_i] += t * lo ** 4
+        base = owner_i * n_zones
+        for z in range(n_zones):
+            if span:
+                upper = edges[z + 1] if z < n_zones - 1 else hi
+                overlap = min(hi, upper) - max(lo, edges[z])
+                if overlap > 0:
+                    in_zone[base + z] += t * overlap / span
+            elif lo <= edges[z + 1] or z == n_zones - 1:
+                in_zone[base + z] += t
+                break
+
+    loads: list[WorkoutLoad | None] = []
+    for index, w in enumerate(workouts):
+        t = total[index]
+        if not t:
+            loads.append(None)
+            continue
+        intensity = (fourth[index] / t) ** 0.25
+        loads.append(WorkoutLoad(
+            seconds=int(t),
+            tss=t / 3600 * intensity ** 2 * 100,
+            intensity=intensity,
+            normalized_power=intensity * ftp,
+            zone_seconds=list(in_zone[index * n_zones:(index + 1) * n_zones]),
+        ))
+    return loads
+
+
+def _zone_middle(edges: array, first: int, last: int) -> float:
+    first = max(1, min(first, len(edges) - 1))
+    last = max(first, min(last, len(edges) - 1))
+    # Z1 has no floor; take easy spinning as 80% of its ceiling
+    lower = edges[first - 1] or edges[first] * 0.8
+    return (lower + edges[last]) / 2
+
+
+def estimate_tss(workout: PlannedWorkout, load: WorkoutLoad | None) -> float:
+    """TSS from the structured load, else table duration and zones column."""
+    minutes = workout.duration_minutes
+    if workout.workout_type == "WeightTraining":
+        return minutes / 60 * STRENGTH_TSS_PER_HOUR
+    if load:
+        return load.tss
+    zone_numbers = [int(z) for z in re.findall(r"Z(\d)", workout.zones)]
+    intensity = (
+        (ZONE_IF.get(min(zone_numbers), DEFAULT_RIDE_IF) + ZONE_IF.get(max(zone_numbers), DEFAULT_RIDE_IF)) / 2
+        if zone_numbers else DEFAULT_RIDE_IF
+    )
+    return minutes / 60 * intensity ** 2 * 100
+
+
+def planned_tss(workouts: list[PlannedWorkout], ftp: float, zones: dict) -> list[float]:
+    """estimate_tss for a batch of workouts."""
+    return [estimate_tss(w, load) for w, load in zip(workouts, workout_loads(workouts, ftp, zones))]
@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import pickle
 import re
+import threading
+from dataclasses import replace
 from datetime import date, timedelta
 from pathlib import Path
 
 from models import PlannedWorkout
+from profiler import span
+from workout import WorkoutParseError, parse_workout
 
 PLAN_DIR = Path(__file__).parent.parent / "plan"
+DATA_DIR = Path(__file__).parent.parent / "data"  # same default as fetcher.DATA_DIR
+PLAN_CACHE_FILE = "plan_cache.pickle"  # under each athlete's data dir
+# Bump when parsing logic or PlannedWorkout fields change to drop stale caches
+PLAN_CACHE_VERSION = 4
 
 # Maps day names from the markdown tables to weekday indices
 DAY_MAP = {
@@ -22,21 +33,108 @@ DAY_MAP = {
 }
 
 
-def find_block_file(week: int) -> Path | None:
+# ── Compiled-plan cache ─────────────────────────────────
+#
+# One cache per data dir (one per athlete), pickled there as
+# {"version": int, "blocks": {abs path: entry}} where each entry holds the
+# file's mtime_ns, size and sha1 plus its week references and parsed
+# workouts. Loaded once per process; a block is only re-read when its
+# mtime/size change and only re-parsed when its content hash changes.
+# Misses mark the cache dirty and each parse pass saves it once.
+
+class _PlanCache:
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.blocks: dict[str, dict] | None = None
+        self.dirty = False
+
+    def _load(self) -> dict[str, dict]:
+        if self.blocks is None:
+            with span("plan.cache.load"):
+                try:
+                    cached = pickle.loads(self.path.read_bytes())
+                    if cached.get("version") != PLAN_CACHE_VERSION:
+                        raise ValueError("stale plan cache")
+                    self.blocks = cached["blocks"]
+                except Exception:  # missing, corrupt or from older code: the cache is disposable
+                    self.blocks = {}
+        return self.blocks
+
+    def entry(self, path: Path) -> dict:
+        """Return the cached entry for a block file, re-parsing only if edited."""
+        stat = path.stat()
+        key = str(path.resolve())
+        with self.lock:
+            entry = self._load().get(key)
+            if entry and (entry["mtime_ns"], entry["size"]) == (stat.st_mtime_ns, stat.st_size):
+                return entry
+
+            text = path.read_text()
+            digest = hashlib.sha1(text.encode()).hexdigest()
+            if not entry or entry["sha1"] != digest:
+                # Look for "Week N" references anywhere in the block
+                week_refs = {int(w) for w in re.findall(r"Week\s+(\d+)", text)}
+                with span("plan.parse", file=path.name):
+                    workouts = _parse_block_text(text)
+                entry = {"sha1": digest, "weeks": week_refs, "workouts": workouts}
+            # Entries are replaced, never mutated, so save() can pickle a snapshot
+            entry = {**entry, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            self.blocks[key] = entry
+            self.dirty = True
+            return entry
+
+    def save(self) -> None:
+        """Write the cache if a miss changed it since the last save."""
+        with self.lock:
+            if not self.dirty:
+                return
+            snapshot = {"version": PLAN_CACHE_VERSION, "blocks": dict(self.blocks)}
+            self.dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        with span("plan.cache.save") as attrs:
+            data = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.write_bytes(data)
+            tmp.replace(self.path)
+            attrs["bytes"] = len(data)
+
+
+_caches_lock = threading.Lock()
+_caches: dict[Path, _PlanCache] = {}
+
+
+def _plan_cache(data_dir: Path | None) -> _PlanCache:
+    path = (data_dir or DATA_DIR) / PLAN_CACHE_FILE
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = _PlanCache(path)
+        return cache
+
+
+def find_block_file(week: int, plan_dir: Path = PLAN_DIR, data_dir: Path | None = None) -> Path | None:
     """Find the block markdown file that contains a given week."""
-    for path in sorted(PLAN_DIR.glob("block_*.md")):
-        text = path.read_text()
-        # Look for "Week N" references in headers
-        week_refs = re.findall(r"Week\s+(\d+)", text)
-        weeks_in_block = [int(w) for w in week_refs]
-        if week in weeks_in_block:
-            return path
-    return None
-
-
-def parse_block(path: Path) -> list[PlannedWorkout]:
-    """Parse an entire block file into PlannedWorkout objects."""
-    text = path.read_text()
+    cache = _plan_cache(data_dir)
+    found = None
+    for path in sorted(plan_dir.glob("block_*.md")):
+        if week in cache.entry(path)["weeks"]:
+            found = path
+            break
+    cache.save()
+    return found
+
+
+def parse_block(path: Path, data_dir: Path | None = None) -> list[PlannedWorkout]:
+    """Parse an entire block file into PlannedWorkout objects (cached)."""
+    cache = _plan_cache(data_dir)
+    workouts = [replace(w) for w in cache.entry(path)["workouts"]]
+    cache.save()
+    return workouts
+
+
+def _parse_block_text(text: str) -> list[PlannedWorkout]:
+    """Parse the markdown of a block file into PlannedWorkout objects."""
     workouts = []
 
     # Split into week sections by ## Week N headers
@@ -69,20 +167,50 @@ def parse_block(path: Path) -> list[PlannedWorkout]:
                     and not w.workout_text
                     and w.workout_type != "WeightTraining"):
                 w.workout_text = structured[w.day_of_week]
+                try:
+                    w.steps = parse_workout(w.workout_text)
+                except WorkoutParseError:
+                    pass  # pushed as text (min → m); plan-week reports the problems
             workouts.append(w)
 
     return workouts
 
 
-def parse_week(week: int) -> list[PlannedWorkout]:
-    """Parse workouts for a specific week."""
-    path = find_block_file(week)
+def parse_week(week: int, plan_dir: Path = PLAN_DIR, data_dir: Path | None = None) -> list[PlannedWorkout]:
+    """Parse workouts for a specific week (plan cache kept in data_dir)."""
+    path = find_block_file(week, plan_dir, data_dir)
     if not path:
         return []
-    all_workouts = parse_block(path)
+    all_workouts = parse_block(path, data_dir)
     return [w for w in all_workouts if w.week == week]
 
 
+def parse_weeks(
+    weeks: list[int],
+    plan_dir: Path = PLAN_DIR,
+    data_dir: Path | None = None,
+) -> dict[int, list[PlannedWorkout]]:
+    """Parse workouts for several weeks, reading each block once.
+
+    Like parse_week, each week comes from the first block that references it.
+    Returns {week: workouts} for every requested week (empty if unplanned).
+    """
+    cache = _plan_cache(data_dir)
+    remaining = set(weeks)
+    by_week: dict[int, list[PlannedWorkout]] = {week: [] for week in weeks}
+    for path in sorted(plan_dir.glob("block_*.md")):
+        entry = cache.entry(path)
+        claimed = remaining & entry["weeks"]
+        if not claimed:
+            continue
+        remaining -= claimed
+        for w in entry["workouts"]:
+            if w.week in claimed:
+                by_week[w.week].append(replace(w))
+    cache.save()
+    return by_week
+
+
 def _parse_week_start(start_str: str, end_str: str) -> date | None:
     """Parse 'Feb 11' or 'Mar 3' into a date, inferring year from context."""
     months = {
@@ -0,0 +1,171 @@
+"""Timing spans for `--profile`: where a command spends its time.
+
+Code marks phases with ``with span("plan.parse", file=...) as attrs:``;
+attrs is a dict the block may add results to (bytes, status, rows...).
+Spans cost one flag check until start_profiling() is called. The current
+span depth is kept in a context variable, so work submitted with
+copy_context() (fetch and batch pools) nests under the span that
+submitted it.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Numeric attributes summed per span name in the summary
+SUMMED_ATTRS = ("bytes", "rows", "retries", "throttle_wait", "backoff_wait")
+
+
+@dataclass
+class Span:
+    name: str
+    start: float  # perf_counter seconds
+    duration: float
+    thread: int
+    depth: int
+    attrs: dict = field(default_factory=dict)
+
+
+@dataclass
+class SpanSummary:
+    name: str
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    sums: Counter = field(default_factory=Counter)
+    statuses: Counter = field(default_factory=Counter)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+class _Recorder:
+    def __init__(self):
+        self.enabled = False
+        self.origin = 0.0
+        self.spans: list[Span] = []
+        self.lock = threading.Lock()
+
+
+_recorder = _Recorder()
+_depth: contextvars.ContextVar[int] = contextvars.ContextVar("span_depth", default=0)
+
+
+class span:
+    """Context manager timing one phase; a no-op unless profiling is enabled."""
+
+    __slots__ = ("name", "attrs", "_start", "_token")
+
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self) -> dict:
+        if _recorder.enabled:
+            self._token = _depth.set(_depth.get() + 1)
+            self._start = time.perf_counter()
+        else:
+            self._token = None
+        return self.attrs
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._token is None:
+            return
+        duration = time.perf_counter() - self._start
+        depth = _depth.get() - 1
+        _depth.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        record = Span(self.name, self._start, duration, threading.get_ident(), depth, self.attrs)
+        with _recorder.lock:
+            _recorder.spans.append(record)
+
+
+def start_profiling() -> None:
+    with _recorder.lock:
+        _recorder.spans = []
+        _recorder.origin = time.perf_counter()
+        _recorder.enabled = True
+
+
+def stop_profiling() -> list[Span]:
+    """Stop recording and return the spans recorded since start_profiling()."""
+    with _recorder.lock:
+        _recorder.enabled = False
+        return list(_recorder.spans)
+
+
+def profiling() -> bool:
+    return _recorder.enabled
+
+
+def summarize(spans: list[Span]) -> list[SpanSummary]:
+    """Per-name totals, slowest first."""
+    by_name: dict[str, SpanSummary] = {}
+    for s in spans:
+        summary = by_name.get(s.name)
+        if summary is None:
+            summary = by_name[s.name] = SpanSummary(s.name)
+        summary.calls += 1
+        summary.total += s.duration
+        summary.max = max(summary.max, s.duration)
+        for name in SUMMED_ATTRS:
+            if name in s.attrs:
+                summary.sums[name] += s.attrs[name]
+        if "status" in s.attrs:
+            summary.statuses[s.attrs["status"]] += 1
+        if "error" in s.attrs:
+            summary.statuses[s.attrs["error"]] += 1
+    return sorted(by_name.values(), key=lambda x: x.total, reverse=True)
+
+
+def write_trace(path: Path, spans: list[Span], meta: dict | None = None) -> Path:
+    """Write spans as a Chrome trace (chrome://tracing, Perfetto) plus a summary.
+
+    The per-name "summary" block lets runs be aggregated without replaying
+    every event.
+    """
+    origin = _recorder.origin
+    pid = os.getpid()
+    events = [
+        {
+            "name": s.name,
+            "ph": "X",
+            "ts": round((s.start - origin) * 1e6, 1),
+            "dur": round(s.duration * 1e6, 1),
+            "pid": pid,
+            "tid": s.thread,
+            "args": s.attrs,
+        }
+        for s in spans
+    ]
+    summary = [
+        {
+            "name": s.name,
+            "calls": s.calls,
+            "total_s": round(s.total, 6),
+            "mean_s": round(s.mean, 6),
+            "max_s": round(s.max, 6),
+            **{k: v for k, v in s.sums.items()},
+            **({"statuses": {str(k): v for k, v in s.statuses.items()}} if s.statuses else {}),
+        }
+        for s in summarize(spans)
+    ]
+    trace = {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "metadata": {"argv": sys.argv, **(meta or {})},
+        "summary": summary,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(trace, default=str))
+    return path
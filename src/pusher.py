@@ -2,40 +2,63 @@
 
 from __future__ import annotations
 
-from analyzer import check_fatigue, week_dates
+import contextvars
+import hashlib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from analyzer import check_fatigue, check_fatigue_weeks, week_dates
 from display import (
     bad, bold, header, ok, print_clean_preview, print_push_preview, warn,
 )
-from intervals_client import IntervalsClient
 from models import PlannedWorkout
+from profiler import span
+from session import Session
+from workout import scale_power_text
+
+if TYPE_CHECKING:  # requests is only imported by the functions that call the API
+    from intervals_client import IntervalsClient
 
 EXTERNAL_ID_PREFIX = "block-w"
+BULK_CHUNK_SIZE = 50  # events per events/bulk request
+DELETE_WORKERS = 4  # concurrent single deletes when bulk delete is unavailable
+
+_EXTERNAL_ID_WEEK = re.compile(rf"^{EXTERNAL_ID_PREFIX}(\d+)-")
 
 
 def prepare_events(
     workouts: list[PlannedWorkout],
     fatigue_adjust: bool = True,
     week: int | None = None,
+    session: Session | None = None,
+    fatigue: dict | None = None,
 ) -> list[dict]:
     """Convert PlannedWorkout list to API event payloads.
 
     If fatigue_adjust is True, checks TSB and reduces power targets when fatigued.
+    A precomputed check_fatigue result for the previous week may be passed in.
     """
     events = []
     reduction = 0.0
 
     if fatigue_adjust and week:
-        fatigue = check_fatigue(week - 1)  # check previous week
+        if fatigue is None:
+            fatigue = check_fatigue(week - 1, session)  # check previous week
         if fatigue["fatigued"]:
             reduction = fatigue["power_reduction"]
             print(warn(f"  ⚠ {fatigue['message']}"))
 
     for w in workouts:
         event = w.to_event()
-        if event.get("description"):
-            event["description"] = _normalize_durations(event["description"])
         if reduction > 0 and w.workout_text:
-            event["description"] = _reduce_power(event["description"], reduction)
+            if w.steps:
+                event["description"] = w.steps.scaled(1 - reduction).to_text()
+            else:
+                event["description"] = scale_power_text(event["description"], 1 - reduction)
+                print(warn(f"  ⚠ {w.date} {w.name}: workout text did not parse "
+                           "(see plan-week); power targets reduced in the raw text"))
             event["name"] = f"{w.name} (adjusted -{reduction * 100:.0f}%)"
         events.append(event)
 
@@ -47,36 +70,121 @@ def push_week(
     workouts: list[PlannedWorkout],
     week: int,
     dry_run: bool = False,
-) -> None:
-    """Push a week of workouts to Intervals.icu calendar."""
-    if not workouts:
+    session: Session | None = None,
+    force: bool = False,
+) -> dict:
+    """Push a week of workouts to Intervals.icu calendar.
+
+    Returns counts of created/updated/unchanged/deleted events.
+    """
+    return push_weeks(client, {week: workouts}, dry_run=dry_run, session=session, force=force)
+
+
+def push_weeks(
+    client: IntervalsClient,
+    workouts_by_week: dict[int, list[PlannedWorkout]],
+    dry_run: bool = False,
+    session: Session | None = None,
+    force: bool = False,
+) -> dict:
+    """Push several weeks of workouts in one batched operation.
+
+    Fatigue is checked for every week from one analyze_weeks pass and remote
+    events for the whole range are fetched with a single query. Each prepared
+    event is compared to its remote copy (by external_id) and only creates
+    and real updates are sent, in BULK_CHUNK_SIZE events/bulk calls, unless
+    ``force`` is set. Stale events are found in the same pass. Weeks without
+    planned workouts are skipped entirely (nothing sent or deleted).
+
+    Returns counts of created/updated/unchanged/deleted events (what would
+    happen, for a dry run).
+    """
+    counts = {"created": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+    weeks = sorted(week for week, workouts in workouts_by_week.items() if workouts)
+    if not weeks:
         print("No workouts to push.")
-        return
+        return counts
 
-    events = prepare_events(workouts, fatigue_adjust=True, week=week)
-    current_ids = {w.external_id for w in workouts if w.external_id}
+    events = []
+    current_ids = set()
+    with span("push.prepare", weeks=len(weeks)):
+        fatigue = check_fatigue_weeks(weeks[0] - 1, weeks[-1] - 1, session)
+        for week in weeks:
+            workouts = workouts_by_week[week]
+            events += prepare_events(
+                workouts, fatigue_adjust=True, week=week, session=session,
+                fatigue=fatigue[week - 1],
+            )
+            current_ids |= {w.external_id for w in workouts if w.external_id}
+
+    remote = _remote_events(client, weeks, session)
+    stale = _find_stale(remote, set(weeks), current_ids)
+    actions = _diff_events(events, remote)
+    if force:
+        actions = ["updated" if a == "unchanged" else a for a in actions]
+    changed = [e for e, action in zip(events, actions) if action != "unchanged"]
+    for action in actions:
+        counts[action] += 1
+    counts["deleted"] = len(stale)
+    summary = (
+        f"{counts['created']} new, {counts['updated']} changed, "
+        f"{counts['unchanged']} unchanged, {counts['deleted']} stale"
+    )
 
     if dry_run:
-        print_push_preview(events)
-        print(f"\n  {bold('Dry run')} — {len(events)} events would be sent.")
-        stale = clean_week(client, week, current_ids, dry_run=True)
-        if not stale:
+        print_push_preview(events, actions)
+        print(f"\n  {bold('Dry run')} — {len(changed)} of {len(events)} events would be sent ({summary}).")
+        if stale:
+            print_clean_preview(stale)
+        else:
             print("  No stale events to clean.")
         print("  Run without --dry-run to push to Intervals.icu.")
-        return
-
-    print(f"Pushing {len(events)} events to Intervals.icu...")
-    result = client.bulk_upsert_events(events)
-    print(ok(f"  Done. {len(result)} events created/updated."))
+        return counts
 
-    for e in result:
-        status = "updated" if e.get("updated") else "created"
-        print(f"    {e.get('start_date_local', '')[:10]} — {e.get('name', '')} [{status}]")
+    if changed:
+        print(f"Pushing {len(changed)} of {len(events)} events to Intervals.icu...")
+        result = []
+        for i in range(0, len(changed), BULK_CHUNK_SIZE):
+            result += client.bulk_upsert_events(changed[i:i + BULK_CHUNK_SIZE])
+        for e in result:
+            status = "updated" if e.get("updated") else "created"
+            print(f"    {e.get('start_date_local', '')[:10]} — {e.get('name', '')} [{status}]")
+    print(ok(f"  Done. {summary}."))
 
     # Auto-clean stale events
-    stale = clean_week(client, week, current_ids)
-    if stale:
-        print(ok(f"  Cleaned {len(stale)} stale event(s)."))
+    deleted = _report_deletions(delete_events(client, stale))
+    counts["deleted"] = len(deleted)
+    if deleted:
+        print(ok(f"  Cleaned {len(deleted)} stale event(s)."))
+    return counts
+
+
+# Event fields compared between a prepared payload and its remote copy
+DIFF_FIELDS = ("name", "description", "type", "moving_time")
+
+
+def _content_hash(event: dict, fields: list[str]) -> str:
+    """Hash the event date plus the given fields (strings whitespace-trimmed)."""
+    content = [event.get("start_date_local", "")[:10]]
+    for field in fields:
+        value = event.get(field)
+        content.append(value.strip() if isinstance(value, str) else value)
+    return hashlib.sha1(json.dumps(content, default=str).encode()).hexdigest()
+
+
+def _diff_events(events: list[dict], remote: list[dict]) -> list[str]:
+    """Classify each prepared event as 'created', 'updated' or 'unchanged'."""
+    remote_by_id = {e["external_id"]: e for e in remote if e.get("external_id")}
+    actions = []
+    for event in events:
+        existing = remote_by_id.get(event.get("external_id"))
+        if existing is None:
+            actions.append("created")
+            continue
+        fields = [f for f in DIFF_FIELDS if f in event]
+        same = _content_hash(existing, fields) == _content_hash(event, fields)
+        actions.append("unchanged" if same else "updated")
+    return actions
 
 
 def clean_week(
@@ -84,17 +192,14 @@ def clean_week(
     week: int,
     current_ids: set[str],
     dry_run: bool = False,
+    session: Session | None = None,
 ) -> list[dict]:
-    """Delete remote events for this week that aren't in current_ids."""
-    monday, sunday = week_dates(week)
-    remote = client.get_events(monday.isoformat(), sunday.isoformat())
+    """Delete remote events for this week that aren't in current_ids.
 
-    prefix = f"{EXTERNAL_ID_PREFIX}{week}-"
-    stale = [
-        e for e in remote
-        if e.get("external_id", "").startswith(prefix)
-        and e["external_id"] not in current_ids
-    ]
+    Returns the stale events (would-be deleted for a dry run, otherwise the
+    ones actually deleted; failures are reported and left out).
+    """
+    stale = _find_stale(_remote_events(client, [week], session), {week}, current_ids)
 
     if not stale:
         return []
@@ -103,33 +208,75 @@ def clean_week(
         print_clean_preview(stale)
         return stale
 
-    for e in stale:
-        client.delete_event(str(e["id"]))
-        print(f"    Deleted: {e.get('start_date_local', '')[:10]} — {e.get('name', '')} [{e['external_id']}]")
+    return _report_deletions(delete_events(client, stale))
+
 
+def _remote_events(
+    client: IntervalsClient,
+    weeks: list[int],
+    session: Session | None = None,
+) -> list[dict]:
+    """Fetch remote events spanning the given weeks with one query."""
+    monday, _ = week_dates(min(weeks), session)
+    _, sunday = week_dates(max(weeks), session)
+    return client.get_events(monday.isoformat(), sunday.isoformat())
+
+
+def _find_stale(remote: list[dict], weeks: set[int], current_ids: set[str]) -> list[dict]:
+    """Remote plan events in ``weeks`` whose external_id is no longer planned."""
+    stale = []
+    for e in remote:
+        external_id = e.get("external_id") or ""
+        match = _EXTERNAL_ID_WEEK.match(external_id)
+        if match and int(match.group(1)) in weeks and external_id not in current_ids:
+            stale.append(e)
     return stale
 
 
-def _normalize_durations(text: str) -> str:
-    """Normalize duration format: 'min' → 'm' for Intervals.icu compatibility.
+def delete_events(
+    client: IntervalsClient,
+    events: list[dict],
+) -> list[tuple[dict, str | None]]:
+    """Delete events, returning (event, error) per event; error is None on success.
 
-    '10min 55%' → '10m 55%' (Intervals.icu needs 'm' not 'min' to generate steps).
+    Tries a single events/bulk-delete request first. If the server rejects
+    it, falls back to a pool of DELETE_WORKERS single deletes sharing the
+    client's rate limiter, so one failing event doesn't stop the rest.
     """
-    import re
-    return re.sub(r"(\d+)min\b", r"\1m", text)
+    import requests
 
+    if not events:
+        return []
+    try:
+        client.bulk_delete_events([str(e["id"]) for e in events])
+        return [(e, None) for e in events]
+    except requests.RequestException:
+        pass
 
-def _reduce_power(workout_text: str, reduction: float) -> str:
-    """Reduce percentage targets in workout text.
+    def delete_one(e: dict) -> tuple[dict, str | None]:
+        try:
+            client.delete_event(str(e["id"]))
+            return e, None
+        except requests.HTTPError as exc:
+            if exc.response is not None and exc.response.status_code == 404:
+                return e, None  # already gone (e.g. a partially applied bulk delete)
+            return e, str(exc)
+        except requests.RequestException as exc:
+            return e, str(exc)
 
-    E.g., with reduction=0.05: '88%' becomes '84%', '100%' becomes '95%'.
-    """
-    import re
+    with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, delete_one, e) for e in events]
+        return [future.result() for future in futures]
 
-    def adjust(match: re.Match) -> str:
-        pct = int(match.group(1))
-        new_pct = int(pct * (1 - reduction))
-        return f"{new_pct}%"
 
-    # Match standalone percentages (not part of other patterns)
-    return re.sub(r"(\d+)%", adjust, workout_text)
+def _report_deletions(results: list[tuple[dict, str | None]]) -> list[dict]:
+    """Print per-event deletion results and return the deleted events."""
+    deleted = []
+    for e, error in results:
+        label = f"{e.get('start_date_local', '')[:10]} — {e.get('name', '')} [{e.get('external_id', '')}]"
+        if error:
+            print(bad(f"    Failed:  {label} ({error})"))
+        else:
+            print(f"    Deleted: {label}")
+            deleted.append(e)
+    return deleted
@@ -0,0 +1,118 @@
+"""Per-process cache of config and local data, invalidated by file mtime.
+
+A command creates one Session and passes it through analyzer and pusher so
+config.toml and the local store are read at most once per change.
+"""
+
+from __future__ import annotations
+
+import tomllib
+from collections.abc import Callable
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from fetcher import DATA_DIR, get_store, load_json
+from planner import PLAN_DIR
+from profiler import span
+from store import DB_FILE, Store
+from streams import StreamStore
+
+CONFIG_PATH = Path(__file__).parent.parent / "config.toml"
+
+
+def load_config(path: Path = CONFIG_PATH) -> dict:
+    with span("config.load", file=path.name):
+        return tomllib.loads(path.read_text())
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class Session:
+    def __init__(
+        self,
+        config_path: Path = CONFIG_PATH,
+        data_dir: Path = DATA_DIR,
+        plan_dir: Path = PLAN_DIR,
+    ):
+        self.config_path = config_path
+        self.data_dir = data_dir
+        self.plan_dir = plan_dir
+        self._cache: dict[Any, tuple[int | None, Any]] = {}
+        self._store: Store | None = None
+        self._streams: StreamStore | None = None
+
+    def cached(self, key: Any, path: Path, loader: Callable[[], Any]) -> Any:
+        """Return loader() memoized under key until path's mtime changes."""
+        mtime = _mtime(path)
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        value = loader()
+        self._cache[key] = (mtime, value)
+        return value
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+    # ── Config ──────────────────────────────────────────────
+
+    @property
+    def config(self) -> dict:
+        return self.cached("config", self.config_path, lambda: load_config(self.config_path))
+
+    # ── Local store ─────────────────────────────────────────
+
+    @property
+    def store(self) -> Store:
+        if self._store is None:
+            self._store = get_store(self.data_dir)
+        return self._store
+
+    @property
+    def streams(self) -> StreamStore:
+        if self._streams is None:
+            self._streams = StreamStore(self.data_dir)
+        return self._streams
+
+    def records(self, dataset: str, start: date | None = None, end: date | None = None) -> list[dict]:
+        """Raw records for a date range (inclusive), cached per range."""
+        return self.cached(
+            (dataset, start, end),
+            self.data_dir / DB_FILE,
+            lambda: self.store.records(
+                dataset,
+                start.isoformat() if start else None,
+                end.isoformat() if end else None,
+            ),
+        )
+
+    def query(self, key: Any, loader: Callable[[Store], Any]) -> Any:
+        """Memoize an arbitrary store query until the database changes."""
+        return self.cached(key, self.data_dir / DB_FILE, lambda: loader(self.store))
+
+    # ── Other cached files ──────────────────────────────────
+
+    @property
+    def power_curves(self) -> dict | list | None:
+        return self.cached(
+            "power_curves",
+            self.data_dir / "power_curves.json",
+            lambda: load_json("power_curves.json", self.data_dir),
+        )
+
+
+_default: Session | None = None
+
+
+def default_session() -> Session:
+    """Process-wide session used when callers don't pass one explicitly."""
+    global _default
+    if _default is None:
+        _default = Session()
+    return _default
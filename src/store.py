@@ -0,0 +1,116 @@
+"""SQLite-backed local store for cached activities and wellness.
+
+Each dataset is a table of raw API records keyed by id and indexed by day,
+so analysis can read a date range without parsing the whole history.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing
+from pathlib import Path
+
+from profiler import span
+
+DB_FILE = "training.db"
+
+
+def _activity_key(record: dict) -> str:
+    return str(record["id"])
+
+
+def _activity_day(record: dict) -> str:
+    return record.get("start_date_local", "")[:10]
+
+
+def _wellness_key(record: dict) -> str:
+    return record["id"]
+
+
+# dataset name → (key, day) extractors over raw API records
+DATASETS = {
+    "activities": (_activity_key, _activity_day),
+    "wellness": (_wellness_key, _wellness_key),
+}
+
+
+class Store:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        for name in DATASETS:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} ("
+                "key TEXT PRIMARY KEY, day TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name}_day ON {name} (day)")
+        return conn
+
+    def replace_range(
+        self,
+        dataset: str,
+        records: list[dict],
+        oldest: str | None = None,
+        newest: str | None = None,
+    ) -> None:
+        """Make ``records`` the authoritative content for [oldest, newest].
+
+        Rows in the range that are not in ``records`` are deleted (removed
+        upstream). Without bounds the whole table is replaced.
+        """
+        key, day = DATASETS[dataset]
+        rows = [(key(r), day(r), json.dumps(r, default=str)) for r in records]
+        with span("store.write", dataset=dataset, rows=len(rows)):
+            with closing(self._connect()) as conn, conn:
+                if oldest is None and newest is None:
+                    conn.execute(f"DELETE FROM {dataset}")
+                else:
+                    conn.execute(
+                        f"DELETE FROM {dataset} WHERE day BETWEEN ? AND ?",
+                        (oldest or "", newest or "9999-12-31"),
+                    )
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {dataset} (key, day, data) VALUES (?, ?, ?)",
+                    rows,
+                )
+
+    def iter_records(
+        self,
+        dataset: str,
+        start: str | None = None,
+        end: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict]:
+        """Yield raw records for a day range (inclusive), ordered by day."""
+        order = "DESC" if newest_first else "ASC"
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                f"SELECT data FROM {dataset} WHERE day BETWEEN ? AND ? "
+                f"ORDER BY day {order}, key {order}",
+                (start or "", end or "9999-12-31"),
+            )
+            for (data,) in cursor:
+                yield json.loads(data)
+
+    def records(
+        self,
+        dataset: str,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> list[dict]:
+        with span("store.read", dataset=dataset) as attrs:
+            records = list(self.iter_records(dataset, start, end))
+            attrs["rows"] = len(records)
+        return records
+
+    def count(self, dataset: str) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {dataset}").fetchone()[0]
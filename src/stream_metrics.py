@@ -0,0 +1,239 @@
+"""Time in zone, NP/IF and aerobic decoupling from stored activity streams.
+
+Each activity is scanned once, chunk by chunk, over its memory-mapped
+power/HR channels using C-level iterator reductions (NumPy is not a
+dependency). Zone times come from sorting a chunk once and bisecting at
+the zone edges, and results are cached per activity id in
+data/streams/metrics.json so only new rides are ever scanned.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from bisect import bisect_right
+from dataclasses import asdict, dataclass, field
+from itertools import accumulate, compress, repeat
+from operator import and_, or_, sub
+
+from planned_load import zone_bounds
+from session import Session, default_session
+from streams import STREAMS_DIR
+
+METRICS_FILE = "metrics.json"
+CHUNK = 8192  # samples per slice of the mapped channels
+NP_WINDOW = 30  # seconds of rolling average for normalized power
+MIN_DECOUPLING_SECONDS = 1200  # shorter rides don't give a meaningful Pa:HR drift
+METRICS_VERSION = 2  # bump when analyze_streams changes to recompute cached entries
+
+
+@dataclass
+class StreamMetrics:
+    activity_id: str
+    date: str
+    seconds: int  # samples with a power or HR value
+    average_power: float | None = None
+    normalized_power: float | None = None
+    intensity: float | None = None
+    average_hr: float | None = None
+    decoupling: float | None = None  # Pa:HR drift, % (positive = HR rose relative to power)
+    power_zone_seconds: list[int] = field(default_factory=list)  # Z1..Zn from [zones]
+    hr_zone_seconds: list[int] = field(default_factory=list)  # < LT1, LT1–LTHR, > LTHR
+
+
+def analyze_streams(
+    streams,
+    date: str,
+    ftp: float,
+    zones: dict,
+    lt1: float,
+    lthr: float,
+) -> StreamMetrics:
+    """Chunked pass over an ActivityStreams' watts/heartrate channels.
+
+    Each chunk is cleaned once (gaps -> 0 plus a validity mask) and then
+    reduced with C-level builtins: accumulate for the NP rolling window,
+    sort + bisect for zone times, compress for the Pa:HR halves.
+    """
+    watts = streams.get("watts")
+    heart = streams.get("heartrate")
+    n = len(streams)
+    power_edges = [b * ftp for b in zone_bounds(zones)]
+    power_zones = [0] * (len(power_edges) + 1)
+    hr_zones = [0] * 3
+
+    tail: list[float] = []  # last NP_WINDOW - 1 cleaned samples of the previous chunk
+    fourth = 0.0
+    rolled = 0
+    power_sum = hr_sum = 0.0
+    power_n = hr_n = active = 0
+    half = n // 2
+    halves = [[0.0, 0.0, 0], [0.0, 0.0, 0]]  # (power sum, hr sum, samples) with both present
+
+    # Channels are stored as recorded and may be shorter than the activity
+    p_len = len(watts) if watts is not None else 0
+
+    for start in range(0, n, CHUNK):
+        stop = min(start + CHUNK, n)
+        p_clean, p_valid = _clean(watts, start, stop)
+        h_clean, h_valid = _clean(heart, start, stop)
+        active += sum(map(or_, p_valid, h_valid))
+
+        if watts is not None:
+            valid = sum(p_valid)
+            power_sum += sum(p_clean)
+            power_n += valid
+            _count_zones(power_zones, power_edges, p_clean, len(p_clean) - valid)
+            # The rolling window stops where the recording does, not at the padding
+            seq = tail + p_clean[:max(0, min(stop, p_len) - start)]
+            cumulative = list(accumulate(seq, initial=0.0))
+            sums = list(map(sub, cumulative[NP_WINDOW:], cumulative[:-NP_WINDOW]))
+            fourth += sum(map(pow, sums, repeat(4)))
+            rolled += len(sums)
+            tail = seq[-(NP_WINDOW - 1):]
+
+        if heart is not None:
+            valid = sum(h_valid)
+            hr_sum += sum(h_clean)
+            hr_n += valid
+            _count_zones(hr_zones, [lt1, lthr], h_clean, len(h_clean) - valid)
+            if watts is not None:
+                both = list(map(and_, p_valid, h_valid))
+                split = min(max(half - start, 0), stop - start)
+                for acc, lo, hi in ((halves[0], 0, split), (halves[1], split, stop - start)):
+                    mask = both[lo:hi]
+                    acc[0] += sum(compress(p_clean[lo:hi], mask))
+                    acc[1] += sum(compress(h_clean[lo:hi], mask))
+                    acc[2] += sum(mask)
+
+    metrics = StreamMetrics(
+        activity_id=streams.activity_id,
+        date=date,
+        seconds=active,
+        power_zone_seconds=power_zones if power_n else [],
+        hr_zone_seconds=hr_zones if hr_n else [],
+    )
+    if power_n:
+        metrics.average_power = power_sum / power_n
+        if rolled:
+            metrics.normalized_power = (fourth / rolled) ** 0.25 / NP_WINDOW
+            metrics.intensity = metrics.normalized_power / ftp if ftp else None
+    if hr_n:
+        metrics.average_hr = hr_sum / hr_n
+    (p1, h1, n1), (p2, h2, n2) = halves
+    if n1 + n2 >= MIN_DECOUPLING_SECONDS and h1 and h2 and p1:
+        first, second = p1 / h1, p2 / h2
+        metrics.decoupling = (first - second) / first * 100
+    return metrics
+
+
+def _clean(channel, start: int, stop: int) -> tuple[list[float], list[bool]]:
+    """Slice of a channel with gaps (NaN) as 0.0, plus the validity mask.
+
+    Both are padded to ``stop - start`` with invalid zeros where the
+    channel ends before the activity does.
+    """
+    if channel is None:
+        return [], [False] * (stop - start)
+    values = channel[start:stop].tolist()
+    valid = [v == v for v in values]
+    missing = (stop - start) - len(values)
+    if all(valid) and not missing:
+        return values, valid
+    return [v if ok else 0.0 for v, ok in zip(values, valid)] + [0.0] * missing, valid + [False] * missing
+
+
+def _count_zones(counts: list[int], edges: list[float], values: list[float], gaps: int) -> None:
+    """Add samples per zone (upper edges inclusive) to counts."""
+    ordered = sorted(values)
+    below = 0
+    for zone, edge in enumerate(edges):
+        upto = bisect_right(ordered, edge)
+        counts[zone] += upto - below
+        below = upto
+    counts[-1] += len(ordered) - below
+    counts[0] -= gaps  # gaps were cleaned to 0 and counted in the bottom zone
+
+
+class MetricsCache:
+    """Per-activity StreamMetrics persisted as JSON.
+
+    Entries carry the fingerprint of the config they were computed with
+    (FTP, zones, LT1, LTHR, plus METRICS_VERSION) and are recomputed only
+    when that changes.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.path = session.data_dir / STREAMS_DIR / METRICS_FILE
+        self._lock = threading.Lock()
+        self._entries: dict | None = None
+        self._dirty = False
+
+    @property
+    def entries(self) -> dict[str, dict]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def fingerprint(self) -> str:
+        cfg = self.session.config
+        athlete = cfg["athlete"]
+        return json.dumps([METRICS_VERSION, athlete["ftp"], athlete.get("lt1"), athlete.get("lthr"),
+                           sorted(cfg["zones"].items())])
+
+    def get(self, activity_id: str) -> StreamMetrics | None:
+        """Cached metrics, computing (and remembering) them if missing or stale."""
+        fingerprint = self.fingerprint()
+        entry = self.entries.get(activity_id)
+        if entry and entry.get("fingerprint") == fingerprint:
+            return StreamMetrics(**entry["metrics"])
+
+        store = self.session.streams
+        if not store.available(activity_id):
+            return None
+        cfg = self.session.config
+        athlete = cfg["athlete"]
+        with store.open(activity_id) as streams:
+            metrics = analyze_streams(
+                streams,
+                store.index[activity_id]["date"],
+                athlete["ftp"],
+                cfg["zones"],
+                athlete.get("lt1", athlete["lthr"] * 0.85),
+                athlete["lthr"],
+            )
+        with self._lock:
+            self.entries[activity_id] = {"fingerprint": fingerprint, "metrics": asdict(metrics)}
+            self._dirty = True
+        return metrics
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            text = json.dumps(self.entries)
+            self._dirty = False
+        tmp = self.path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp.write_text(text)
+        tmp.replace(self.path)
+
+
+def stream_metrics(
+    start: str | None = None,
+    end: str | None = None,
+    session: Session | None = None,
+) -> list[StreamMetrics]:
+    """Metrics for every stored activity in [start, end] (ISO dates)."""
+    session = session or default_session()
+    cache = MetricsCache(session)
+    results = [
+        m for m in (cache.get(aid) for aid in session.streams.activity_ids(start, end)) if m
+    ]
+    cache.save()
+    return results
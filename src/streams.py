@@ -0,0 +1,147 @@
+"""Columnar on-disk store for per-activity streams (power, HR, cadence, time).
+
+Layout under data/streams/:
+    index.json                  {activity_id: {"date", "type", "samples", "channels"}}
+    <activity_id>/<channel>.bin raw native-endian array, one value per sample
+
+Channel files are memory-mapped on read, so an analysis touches only the
+pages it scans and never builds Python lists of samples.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import threading
+from array import array
+from pathlib import Path
+
+STREAMS_DIR = "streams"
+INDEX_FILE = "index.json"
+# Channel -> array typecode. Gaps in float channels are stored as NaN.
+CHANNELS = {"time": "I", "watts": "f", "heartrate": "f", "cadence": "f"}
+STREAM_ACTIVITY_TYPES = {"Ride", "VirtualRide", "MountainBikeRide", "GravelRide"}
+
+
+class ActivityStreams:
+    """Memory-mapped channels of one activity. Close (or use as a context
+    manager) to release the maps; the memoryviews are invalid afterwards."""
+
+    def __init__(self, activity_id: str, directory: Path, channels: list[str]):
+        self.activity_id = activity_id
+        self._maps: list[mmap.mmap] = []
+        self._views: dict[str, memoryview] = {}
+        for name in channels:
+            path = directory / f"{name}.bin"
+            size = path.stat().st_size
+            if not size:
+                self._views[name] = memoryview(array(CHANNELS[name]))
+                continue
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mapped)
+            self._views[name] = memoryview(mapped).cast(CHANNELS[name])
+
+    def __contains__(self, channel: str) -> bool:
+        return channel in self._views
+
+    def __getitem__(self, channel: str) -> memoryview:
+        return self._views[channel]
+
+    def get(self, channel: str) -> memoryview | None:
+        return self._views.get(channel)
+
+    def __len__(self) -> int:
+        return max((len(v) for v in self._views.values()), default=0)
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._views.clear()
+        self._maps.clear()
+
+    def __enter__(self) -> ActivityStreams:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class StreamStore:
+    def __init__(self, data_dir: Path):
+        self.root = data_dir / STREAMS_DIR
+        self._lock = threading.Lock()
+        self._index: dict | None = None
+
+    @property
+    def index(self) -> dict[str, dict]:
+        if self._index is None:
+            try:
+                self._index = json.loads((self.root / INDEX_FILE).read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    def has(self, activity_id: str) -> bool:
+        return activity_id in self.index
+
+    def available(self, activity_id: str) -> bool:
+        entry = self.index.get(activity_id)
+        return bool(entry) and "error" not in entry
+
+    def write(self, activity_id: str, meta: dict, streams: list[dict]) -> int:
+        """Store an API streams response ([{"type", "data"}, ...]); returns samples."""
+        directory = self.root / activity_id
+        directory.mkdir(parents=True, exist_ok=True)
+        channels = []
+        samples = 0
+        for stream in streams:
+            name = stream.get("type")
+            if name not in CHANNELS or not stream.get("data"):
+                continue
+            typecode = CHANNELS[name]
+            fill = math.nan if typecode == "f" else 0
+            values = array(typecode, (fill if v is None else v for v in stream["data"]))
+            tmp = directory / f".{name}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                values.tofile(f)
+            tmp.replace(directory / f"{name}.bin")
+            channels.append(name)
+            samples = max(samples, len(values))
+        with self._lock:
+            self.index[activity_id] = {**meta, "samples": samples, "channels": channels}
+        return samples
+
+    def mark_unavailable(self, activity_id: str, meta: dict, reason: str) -> None:
+        """Remember activities without streams so syncs don't keep asking."""
+        with self._lock:
+            self.index[activity_id] = {**meta, "error": reason}
+
+    def save_index(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            text = json.dumps(self.index, indent=1, sort_keys=True)
+        path = self.root / INDEX_FILE
+        tmp = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp.write_text(text)
+        tmp.replace(path)
+
+    def open(self, activity_id: str) -> ActivityStreams:
+        entry = self.index.get(activity_id)
+        if not entry or "error" in entry:
+            raise KeyError(f"No streams stored for activity {activity_id}")
+        return ActivityStreams(activity_id, self.root / activity_id, entry["channels"])
+
+    def activity_ids(self, start: str | None = None, end: str | None = None) -> list[str]:
+        """Stored activities with streams, optionally within [start, end] (ISO dates)."""
+        return sorted(
+            (aid for aid, e in self.index.items()
+             if "error" not in e
+             and (start is None or e["date"] >= start)
+             and (end is None or e["date"] <= end)),
+            key=lambda aid: (self.index[aid]["date"], aid),
+        )
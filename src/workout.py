@@ -0,0 +1,299 @@
+"""Parse Intervals.icu workout text into a compact step list and back.
+
+See plan/intervals_format.md for the format. A Workout keeps its steps
+column-wise in flat arrays (duration, target kind, low/high target, ramp,
+cadence, repeat block), so a block file's worth of workouts pickles small
+and duration/load/scaling are loops over numbers rather than regexes.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+
+# Target kinds
+TARGET_NONE = 0
+TARGET_FTP = 1  # % of FTP
+TARGET_WATTS = 2
+TARGET_HR = 3  # % of max HR
+TARGET_LTHR = 4  # % of threshold HR
+TARGET_ZONE = 5  # power zone
+TARGET_HR_ZONE = 6
+
+_DURATION = re.compile(r"(?:(\d+)h)?(?:(\d+)(min|m))?(?:(\d+)s)?")
+_PERCENT = re.compile(r"(\d+(?:\.\d+)?)(?:-(\d+(?:\.\d+)?))?%(HR|LTHR)?", re.IGNORECASE)
+_WATTS = re.compile(r"(\d+)(?:-(\d+))?w", re.IGNORECASE)
+_ZONE = re.compile(r"Z(\d)(?:-Z?(\d))?", re.IGNORECASE)
+_CADENCE = re.compile(r"(\d+)(?:-(\d+))?rpm", re.IGNORECASE)
+_REPEAT = re.compile(r"(-\s*)?(?:(.*?)\s+)?(\d+)x")
+_MIN_DURATION = re.compile(r"(\d+)min\b")
+_TARGET_LIKE = re.compile(r"\d(?:w|%)", re.IGNORECASE)  # catches target typos like 200w-250w
+_POWER_TEXT = re.compile(r"(\d+)(?:-(\d+))?(%|w)(?!\s*(?:HR|LTHR)\b)", re.IGNORECASE)
+
+
+class WorkoutParseError(ValueError):
+    pass
+
+
+class Workout:
+    """Workout steps stored as parallel arrays.
+
+    Step i belongs to repeat block ``block[i]``; ``blocks[b]`` is that block's
+    repeat count, or 0 for a run of plain steps outside any repeat, and
+    ``titles[b]`` its section header ("Warmup", "Main set" in "Main set 3x").
+    """
+
+    def __init__(self):
+        self.seconds = array("I")
+        self.target = array("B")
+        self.low = array("d")
+        self.high = array("d")
+        self.ramp = array("B")
+        self.cadence_low = array("H")  # 0 = no cadence target
+        self.cadence_high = array("H")
+        self.block = array("H")
+        self.blocks = array("H")
+        self.titles: list[str] = []
+        self.labels: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.seconds)
+
+    def _append(
+        self,
+        seconds: int,
+        target: int,
+        low: float,
+        high: float,
+        ramp: bool,
+        cadence: tuple[int, int],
+        label: str,
+    ) -> None:
+        self.seconds.append(seconds)
+        self.target.append(target)
+        self.low.append(low)
+        self.high.append(high)
+        self.ramp.append(ramp)
+        self.cadence_low.append(cadence[0])
+        self.cadence_high.append(cadence[1])
+        self.block.append(len(self.blocks) - 1)
+        self.labels.append(label)
+
+    def counts(self) -> array:
+        """How many times each step is ridden once repeats are expanded."""
+        blocks = self.blocks
+        return array("I", (blocks[b] or 1 for b in self.block))
+
+    @property
+    def total_seconds(self) -> int:
+        return sum(s * n for s, n in zip(self.seconds, self.counts()))
+
+    def ftp_fraction(self, i: int, ftp: float) -> tuple[float, float] | None:
+        """Step i's (low, high) power as a fraction of FTP, if it has a power target."""
+        if self.target[i] == TARGET_FTP:
+            return self.low[i] / 100, self.high[i] / 100
+        if self.target[i] == TARGET_WATTS and ftp:
+            return self.low[i] / ftp, self.high[i] / ftp
+        return None
+
+    def copy(self) -> Workout:
+        other = Workout()
+        for name in ("seconds", "target", "low", "high", "ramp",
+                     "cadence_low", "cadence_high", "block", "blocks"):
+            setattr(other, name, array(getattr(self, name).typecode, getattr(self, name)))
+        other.titles = list(self.titles)
+        other.labels = list(self.labels)
+        return other
+
+    def scaled(self, factor: float) -> Workout:
+        """Copy with %FTP and watt targets scaled (rounded down); HR and zones untouched."""
+        other = self.copy()
+        for i, kind in enumerate(other.target):
+            if kind in (TARGET_FTP, TARGET_WATTS):
+                other.low[i] = int(other.low[i] * factor)
+                other.high[i] = int(other.high[i] * factor)
+        return other
+
+    def to_text(self) -> str:
+        """Serialize back to Intervals.icu workout text."""
+        lines: list[str] = []
+        previous = 0
+        for b, repeat in enumerate(self.blocks):
+            title = self.titles[b]
+            # Repeat blocks and sections are set off by blank lines on both sides
+            if lines and (repeat or title or previous):
+                lines.append("")
+            if repeat:
+                lines.append(f"{title} {repeat}x" if title else f"{repeat}x")
+            elif title:
+                lines.append(title)
+            lines += [self._step_text(i) for i in range(len(self)) if self.block[i] == b]
+            previous = repeat
+        return "\n".join(lines)
+
+    def _step_text(self, i: int) -> str:
+        parts = ["-"]
+        if self.labels[i]:
+            parts.append(self.labels[i])
+        if self.ramp[i]:
+            parts.append("Ramp")
+        parts.append(_format_duration(self.seconds[i]))
+        low, high, kind = self.low[i], self.high[i], self.target[i]
+        span = _num(low) if low == high else f"{_num(low)}-{_num(high)}"
+        if kind == TARGET_FTP:
+            parts.append(f"{span}%")
+        elif kind == TARGET_WATTS:
+            parts.append(f"{span}w")
+        elif kind in (TARGET_HR, TARGET_LTHR):
+            parts.append(f"{span}% {'HR' if kind == TARGET_HR else 'LTHR'}")
+        elif kind in (TARGET_ZONE, TARGET_HR_ZONE):
+            zone = f"Z{_num(low)}" if low == high else f"Z{_num(low)}-Z{_num(high)}"
+            parts.append(f"{zone} HR" if kind == TARGET_HR_ZONE else zone)
+        if self.cadence_low[i]:
+            c_low, c_high = self.cadence_low[i], self.cadence_high[i]
+            parts.append(f"{c_low}rpm" if c_low == c_high else f"{c_low}-{c_high}rpm")
+        return " ".join(parts)
+
+
+def _num(value: float) -> str:
+    return str(int(value)) if value == int(value) else f"{value:g}"
+
+
+def _format_duration(seconds: int) -> str:
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    text = (f"{h}h" if h else "") + (f"{m}m" if m else "") + (f"{s}s" if s else "")
+    return text or "0s"
+
+
+def normalize_durations(text: str) -> str:
+    """'10min 55%' → '10m 55%' in free text (Intervals.icu needs 'm' to build steps)."""
+    return _MIN_DURATION.sub(r"\1m", text)
+
+
+def scale_power_text(text: str, factor: float) -> str:
+    """Scale %FTP and watt targets in text the parser rejected (rounded down).
+
+    The fallback for scaled(): HR and LTHR percentages are left alone, and
+    both bounds of a range are scaled.
+    """
+    def scale(match: re.Match) -> str:
+        low = int(int(match.group(1)) * factor)
+        high = f"-{int(int(match.group(2)) * factor)}" if match.group(2) else ""
+        return f"{low}{high}{match.group(3)}"
+
+    return _POWER_TEXT.sub(scale, text)
+
+
+def parse_workout(text: str) -> Workout:
+    """Parse workout text, raising WorkoutParseError on lines that aren't steps."""
+    workout, errors, _ = _parse(text)
+    if errors:
+        raise WorkoutParseError("; ".join(errors))
+    return workout
+
+
+def validate_workout(text: str) -> list[str]:
+    """Every problem found in the text: unparseable lines plus format slips
+    Intervals.icu would mis-render (``min`` units, ``- 3x`` headers, nesting)."""
+    _, errors, warnings = _parse(text)
+    return errors + warnings
+
+
+def _parse(text: str) -> tuple[Workout, list[str], list[str]]:
+    workout = Workout()
+    errors: list[str] = []
+    warnings: list[str] = []
+    in_repeat = False
+    block_steps = 0
+
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line:
+            if in_repeat and not block_steps:
+                warnings.append(f"line {lineno}: repeat block has no steps")
+            in_repeat = False
+            continue
+
+        repeat = _REPEAT.fullmatch(line)
+        if repeat:
+            if repeat.group(1):
+                warnings.append(f"line {lineno}: repeat header '{line}' must not start with '-'")
+            if in_repeat:
+                warnings.append(f"line {lineno}: nested repeats are not supported")
+            workout.blocks.append(int(repeat.group(3)))
+            workout.titles.append(repeat.group(2) or "")
+            in_repeat, block_steps = True, 0
+            continue
+
+        if not line.startswith("-"):
+            # A section header such as "Warmup" or "Main set"
+            first = _DURATION.fullmatch(line.split()[0])
+            if first and any(first.groups()):
+                warnings.append(f"line {lineno}: '{line}' looks like a step but has no '-' prefix")
+            workout.blocks.append(0)
+            workout.titles.append(line)
+            in_repeat = False
+            continue
+
+        step = _parse_step(line[1:].split(), lineno, errors, warnings)
+        if step is None:
+            continue
+        if not in_repeat and (not workout.blocks or workout.blocks[-1]):
+            workout.blocks.append(0)  # start a run of plain steps
+            workout.titles.append("")
+        workout._append(*step)
+        block_steps += 1
+
+    return workout, errors, warnings
+
+
+def _parse_step(tokens: list[str], lineno: int, errors: list[str], warnings: list[str]) -> tuple | None:
+    seconds = None
+    target, low, high = TARGET_NONE, 0.0, 0.0
+    ramp = False
+    cadence = (0, 0)
+    label: list[str] = []
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        following = tokens[i + 1].upper() if i + 1 < len(tokens) else ""
+        duration = _DURATION.fullmatch(token)
+        if seconds is None and duration and any(duration.groups()):
+            h, m, unit, s = duration.groups()
+            if unit == "min":
+                warnings.append(f"line {lineno}: use 'm' not 'min' in '{token}'")
+            seconds = int(h or 0) * 3600 + int(m or 0) * 60 + int(s or 0)
+        elif token.lower() == "ramp":
+            ramp = True
+        elif (match := _CADENCE.fullmatch(token)):
+            cadence = (int(match.group(1)), int(match.group(2) or match.group(1)))
+        elif (match := _PERCENT.fullmatch(token) or _WATTS.fullmatch(token) or _ZONE.fullmatch(token)):
+            if target != TARGET_NONE:
+                errors.append(f"line {lineno}: more than one target")
+                return None
+            low = float(match.group(1))
+            high = float(match.group(2) or match.group(1))
+            if match.re is _PERCENT:
+                suffix = (match.group(3) or "").upper() or (following if following in ("HR", "LTHR") else "")
+                target = {"HR": TARGET_HR, "LTHR": TARGET_LTHR}.get(suffix, TARGET_FTP)
+                if suffix and not match.group(3):
+                    i += 1
+            elif match.re is _WATTS:
+                target = TARGET_WATTS
+            else:
+                target = TARGET_HR_ZONE if following == "HR" else TARGET_ZONE
+                if following == "HR":
+                    i += 1
+        elif _TARGET_LIKE.search(token):
+            errors.append(f"line {lineno}: unrecognized target '{token}' (expected e.g. 88-93% or 200-250w)")
+            return None
+        else:
+            label.append(token)
+        i += 1
+
+    if seconds is None:
+        errors.append(f"line {lineno}: step has no duration")
+        return None
+    return seconds, target, low, high, ramp, cadence, " ".join(label)
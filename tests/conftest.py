@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The CLI runs from src/ with flat imports; do the same for tests
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
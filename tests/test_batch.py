@@ -0,0 +1,38 @@
+"""Roster parsing."""
+
+from pathlib import Path
+
+import pytest
+
+from batch import load_roster
+from intervals_client import RateLimiter
+
+
+def test_paths_resolve_against_the_roster_directory(tmp_path, monkeypatch):
+    coach = tmp_path / "coach"
+    coach.mkdir()
+    (coach / "roster.toml").write_text(
+        '[[athlete]]\nname = "alice"\nathlete_id = "i1"\napi_key = "k"\ndir = "athletes/alice"\n\n'
+        '[[athlete]]\nname = "bob"\nathlete_id = "i2"\napi_key = "k"\n'
+        'config = "shared/config.toml"\nplan_dir = "shared/plan"\n'
+    )
+    monkeypatch.chdir(tmp_path)
+
+    alice, bob = load_roster(Path("coach/roster.toml"))[0]
+    assert alice.config_path == Path("coach/athletes/alice/config.toml")
+    assert alice.data_dir == Path("coach/athletes/alice/data")
+    assert alice.plan_dir == Path("coach/athletes/alice/plan")
+    assert bob.config_path == Path("coach/shared/config.toml")
+    assert bob.data_dir == Path("coach/bob/data")
+    assert bob.plan_dir == Path("coach/shared/plan")
+
+
+def test_api_key_is_only_needed_to_reach_the_api(tmp_path, monkeypatch):
+    roster = tmp_path / "roster.toml"
+    roster.write_text('[[athlete]]\nname = "carol"\nathlete_id = "i3"\napi_key_env = "CAROL_KEY_UNSET"\n')
+    monkeypatch.delenv("CAROL_KEY_UNSET", raising=False)
+
+    (carol,), _ = load_roster(roster)
+    assert carol.api_key == ""
+    with pytest.raises(ValueError, match="no API key for athlete 'carol'"):
+        carol.client(RateLimiter())
@@ -0,0 +1,56 @@
+"""Planned-to-actual session matching."""
+
+from datetime import date
+
+import pytest
+
+from compliance import match_sessions
+from models import Activity, PlannedWorkout
+
+DAY = date(2026, 3, 4)
+ZONES = {"z1": 55, "z2": 75, "z3": 90, "z4": 105, "z5": 120, "z6": 150}
+
+
+def _plan(name: str, minutes: int, kind: str = "Ride", day: date = DAY) -> PlannedWorkout:
+    return PlannedWorkout(week=3, day_of_week=day.weekday(), date=day, name=name, description="",
+                          duration_minutes=minutes, workout_type=kind)
+
+
+def _activity(aid: str, minutes: float, kind: str = "Ride", day: date = DAY) -> Activity:
+    return Activity(id=aid, date=day, name=aid, type=kind, moving_time=int(minutes * 60), distance=0.0,
+                    icu_training_load=50.0, icu_intensity=70.0)
+
+
+def _pairs(matches):
+    return [(m.planned and m.planned.name, m.activity and m.activity.id, m.status) for m in matches]
+
+
+def test_each_activity_matches_one_plan():
+    matches = match_sessions(
+        [_plan("long", 180), _plan("short", 60)],
+        [_activity("a1", 58)],
+        250, ZONES,
+    )
+    assert _pairs(matches) == [("long", None, "missed"), ("short", "a1", "done")]
+
+
+def test_unplanned_and_other_kinds_are_extra():
+    matches = match_sessions(
+        [_plan("gym", 45, "WeightTraining"), _plan("rest", 0)],
+        [_activity("ride", 60, "VirtualRide"), _activity("lift", 40, "WeightTraining")],
+        250, ZONES,
+    )
+    # The rest day (no duration) is not a session; VirtualRide is a ride, not strength
+    assert _pairs(matches) == [("gym", "lift", "done"), (None, "ride", "extra")]
+
+
+def test_matches_stay_on_their_day():
+    monday = date(2026, 3, 2)
+    matches = match_sessions([_plan("mon", 60, day=monday)], [_activity("wed", 60)], 250, ZONES)
+    assert _pairs(matches) == [("mon", None, "missed"), (None, "wed", "extra")]
+
+
+@pytest.mark.parametrize("minutes, status", [(47, "partial"), (48, "done"), (72, "done"), (73, "over")])
+def test_duration_thresholds(minutes, status):
+    (match,) = match_sessions([_plan("ride", 60)], [_activity("a", minutes)], 250, ZONES)
+    assert match.status == status
@@ -0,0 +1,53 @@
+"""Power-curve sampling and the CP/W' fit."""
+
+import pytest
+
+from curves import PowerCurve, analyze_curves, fit_critical_power, load_curves
+
+
+def _curve(secs, watts, **extra) -> PowerCurve:
+    return PowerCurve.from_api({"id": "c", "secs": list(secs), "watts": list(watts), **extra})
+
+
+def _hyperbolic(cp: float, w_prime: float) -> PowerCurve:
+    # Two-parameter model: P(t) = CP + W'/t, i.e. work = CP·t + W'
+    secs = range(60, 1801, 30)
+    return _curve(secs, (cp + w_prime / t for t in secs))
+
+
+def test_fit_recovers_cp_and_w_prime():
+    (fit,) = fit_critical_power([_hyperbolic(280, 20000)])
+    assert fit.cp == pytest.approx(280)
+    assert fit.w_prime == pytest.approx(20000)
+    assert fit.r2 == pytest.approx(1.0)
+    assert fit.points == 35  # 180–1200 s every 30 s
+
+
+def test_fit_r2_drops_with_noise():
+    curve = _hyperbolic(250, 15000)
+    for i in range(len(curve.watts)):
+        curve.watts[i] += 15 if i % 2 else -15
+    (fit,) = fit_critical_power([curve])
+    assert fit.cp == pytest.approx(250, abs=5)
+    assert 0.9 < fit.r2 < 1.0
+
+
+def test_fit_needs_three_points_in_the_window():
+    # A curve ending at 200 s reaches only the 180 s grid point
+    assert fit_critical_power([_curve([120, 200], [400, 350])]) == [None]
+
+
+def test_interpolation_and_deltas():
+    older = _curve([5, 60, 300], [900, 500, 300])
+    newer = _curve([5, 60, 300], [990, 450, 330])
+    analysis = analyze_curves([newer, older], (5, 30, 300, 600))
+
+    assert older.at(30) == pytest.approx(900 + (500 - 900) * 25 / 55)
+    assert analysis.effort(0, 3) is None  # beyond the recorded curve
+    assert analysis.delta(0, 1, 0) == pytest.approx(0.1)
+    assert analysis.delta(0, 1, 2) == pytest.approx(0.1)
+
+
+def test_load_curves_skips_empty_entries():
+    curves = load_curves({"list": [{"id": "a", "secs": [5], "watts": [800]}, {"id": "b"}]})
+    assert [c.id for c in curves] == ["a"]
@@ -0,0 +1,67 @@
+"""Local CTL/ATL recurrence."""
+
+import math
+from datetime import date, timedelta
+
+import pytest
+
+from fitness import FitnessSeries, compute_fitness, validate
+from models import Activity, WellnessDay
+
+START = date(2026, 1, 1)
+
+
+def _ride(day: int, load: float) -> Activity:
+    return Activity(id=str(day), date=START + timedelta(days=day), name="", type="Ride",
+                    moving_time=3600, distance=0.0, icu_training_load=load, icu_intensity=0.0)
+
+
+def test_ctl_and_atl_decay_without_load():
+    series = FitnessSeries(START, ctl=100.0, atl=100.0)
+    series.extend([0.0] * 10)
+    # 100 · exp(-10/42) and 100 · exp(-10/7)
+    assert series.ctl[-1] == pytest.approx(78.8128, abs=1e-4)
+    assert series.atl[-1] == pytest.approx(23.9651, abs=1e-4)
+
+
+def test_one_day_of_load():
+    series = FitnessSeries(START)
+    series.extend([100.0])
+    assert series.ctl[0] == pytest.approx(100 * (1 - math.exp(-1 / 42)))
+    assert series.latest().date == START
+
+
+def test_extend_in_pieces_matches_one_pass():
+    loads = [50.0, 0.0, 120.0, 80.0, 0.0, 200.0, 30.0]
+    whole = FitnessSeries(START, 40.0, 55.0)
+    whole.extend(loads)
+    pieces = FitnessSeries(START, 40.0, 55.0)
+    pieces.extend(loads[:3])
+    pieces.extend(loads[3:])
+    assert pieces.ctl == whole.ctl and pieces.atl == whole.atl
+    assert pieces.end == START + timedelta(days=6)
+
+
+def test_recompute_from_replaces_the_tail():
+    series = compute_fitness([_ride(0, 100), _ride(3, 90)], START, START + timedelta(days=5), 30.0, 30.0)
+    series.recompute_from(START + timedelta(days=3), [60.0, 0.0, 0.0, 10.0])
+
+    expected = FitnessSeries(START, 30.0, 30.0)
+    expected.extend([100.0, 0.0, 0.0, 60.0, 0.0, 0.0, 10.0])
+    assert series.load == expected.load
+    assert series.ctl == expected.ctl and series.atl == expected.atl
+
+
+def test_validate_compares_overlapping_days_only():
+    series = FitnessSeries(START, 50.0, 50.0)
+    series.extend([0.0, 0.0])
+    wellness = [
+        WellnessDay(START, ctl=series.ctl[0] + 1, atl=series.atl[0] - 3),
+        WellnessDay(START + timedelta(days=1), ctl=series.ctl[1] - 2, atl=series.atl[1] + 1),
+        WellnessDay(START + timedelta(days=2), ctl=10.0, atl=10.0),  # after the series
+        WellnessDay(START - timedelta(days=1), ctl=None, atl=None),
+    ]
+    report = validate(series, wellness)
+    assert report.days == 2
+    assert report.ctl_mae == pytest.approx(1.5) and report.ctl_max_error == pytest.approx(2)
+    assert report.atl_mae == pytest.approx(2) and report.atl_max_error == pytest.approx(3)
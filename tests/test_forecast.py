@@ -0,0 +1,21 @@
+"""Plan forecast seeding."""
+
+import math
+from datetime import date, timedelta
+
+import forecast
+from fitness import CTL_DAYS, FitnessSeries
+from session import Session
+
+
+def test_forecast_keeps_a_seed_from_today(tmp_path, monkeypatch):
+    today = date(2026, 3, 2)
+    tomorrow = today + timedelta(days=1)
+    # Wellness seeded today: local_fitness has no days yet, only initial values
+    monkeypatch.setattr(forecast, "local_fitness", lambda end, session: FitnessSeries(tomorrow, 60.0, 80.0))
+
+    series, _ = forecast.forecast_plan(Session(data_dir=tmp_path), today)
+
+    assert series.start == tomorrow
+    assert series.initial_ctl == 60.0 and series.initial_atl == 80.0
+    assert series.ctl[0] >= 60.0 * math.exp(-1 / CTL_DAYS)
@@ -0,0 +1,33 @@
+"""Plan block cache."""
+
+import pickle
+
+import planner
+
+
+class Gone:
+    pass
+
+
+def test_unloadable_cache_starts_empty(tmp_path, monkeypatch):
+    path = tmp_path / planner.PLAN_CACHE_FILE
+    # A pickle referencing a class whose module has since been renamed
+    data = pickle.dumps({"version": planner.PLAN_CACHE_VERSION, "blocks": {"x": Gone()}}, protocol=0)
+    path.write_bytes(data.replace(f"{__name__}\nGone".encode(), b"renamed_module\nGone"))
+
+    cache = planner._PlanCache(path)
+    assert cache._load() == {}
+
+
+def test_cache_round_trip(tmp_path):
+    block = tmp_path / "block_1.md"
+    block.write_text("# Week 1\n")
+    path = tmp_path / planner.PLAN_CACHE_FILE
+
+    cache = planner._PlanCache(path)
+    entry = cache.entry(block)
+    cache.save()
+
+    reloaded = planner._PlanCache(path)
+    assert reloaded.entry(block) == entry
+    assert not reloaded.dirty
@@ -0,0 +1,152 @@
+"""Event payloads built from planned workouts, and what a push sends."""
+
+from datetime import date
+
+import requests
+
+import pusher
+from models import PlannedWorkout
+from pusher import _content_hash, _diff_events, delete_events, prepare_events, push_weeks
+from session import Session
+from workout import parse_workout
+
+FATIGUED = {"fatigued": True, "power_reduction": 0.1, "message": "TSB low"}
+
+
+def _workout(text: str | None, description: str = "Easy ride") -> PlannedWorkout:
+    w = PlannedWorkout(week=2, day_of_week=1, date=date(2026, 3, 3), name="Intervals",
+                       description=description, workout_text=text)
+    try:
+        w.steps = parse_workout(text) if text else None
+    except ValueError:
+        pass
+    return w
+
+
+def test_parsed_workout_is_reduced():
+    (event,) = prepare_events([_workout("- Ramp 10m 50-75%\n\n3x\n- 5m 100%\n- 3m 55%")], week=2, fatigue=FATIGUED)
+    assert event["description"] == "- Ramp 10m 45-67%\n\n3x\n- 5m 90%\n- 3m 49%"
+    assert event["name"] == "Intervals (adjusted -10%)"
+
+
+def test_unparsed_workout_falls_back_to_text(capsys):
+    w = _workout("- Warmup 10min 55%\n- Main 55%\n- 5min 60% HR")
+    assert w.steps is None
+    (event,) = prepare_events([w], week=2, fatigue=FATIGUED)
+    assert event["description"] == "- Warmup 10m 49%\n- Main 49%\n- 5m 60% HR"
+    assert event["name"] == "Intervals (adjusted -10%)"
+    assert "did not parse" in capsys.readouterr().out
+
+
+def test_descriptions_are_normalized_without_fatigue():
+    events = prepare_events([_workout(None, "Spin 45min"), _workout("- Main 55%\n- 10min 60%")],
+                            fatigue_adjust=False)
+    assert [e["description"] for e in events] == ["Spin 45m", "- Main 55%\n- 10m 60%"]
+
+
+class FakeClient:
+    """Records the calls push_weeks makes against a fixed remote calendar."""
+
+    def __init__(self, remote: list[dict]):
+        self.remote = remote
+        self.upserts: list[list[dict]] = []
+
+    def get_events(self, oldest: str, newest: str) -> list[dict]:
+        return self.remote
+
+    def bulk_upsert_events(self, events: list[dict]) -> list[dict]:
+        self.upserts.append(events)
+        return events
+
+
+def _event(external_id: str, **fields) -> dict:
+    return {"start_date_local": "2026-03-03T00:00:00", "type": "Ride", "name": "Endurance",
+            "description": "- 60m 65%", "external_id": external_id, **fields}
+
+
+def test_content_hash_ignores_whitespace_and_time_of_day():
+    fields = ["name", "description"]
+    remote = _event("x", description="- 60m 65%\n", start_date_local="2026-03-03T06:30:00")
+    assert _content_hash(remote, fields) == _content_hash(_event("x"), fields)
+    assert _content_hash(_event("x", name="Tempo"), fields) != _content_hash(_event("x"), fields)
+
+
+def test_diff_events_classifies_by_external_id():
+    remote = [_event("a", id=1), _event("b", id=2, name="Old name"), _event("", id=3)]
+    events = [_event("a"), _event("b"), _event("c")]
+    assert _diff_events(events, remote) == ["unchanged", "updated", "created"]
+
+
+def test_diff_events_compares_only_fields_the_payload_sets():
+    # The server adds moving_time; a payload without it isn't a change
+    assert _diff_events([_event("a")], [_event("a", id=1, moving_time=3600)]) == ["unchanged"]
+
+
+def _push(monkeypatch, tmp_path, client, force=False) -> dict:
+    monkeypatch.setattr(pusher, "check_fatigue_weeks",
+                        lambda first, last, session: {week: {"fatigued": False} for week in range(first, last + 1)})
+    w = _workout("- 60m 65%")
+    w.external_id = "block-w2-tue"
+    return push_weeks(client, {2: [w]}, session=Session(data_dir=tmp_path), force=force)
+
+
+def test_unchanged_payload_sends_no_bulk_call(monkeypatch, tmp_path):
+    client = FakeClient([])
+    _push(monkeypatch, tmp_path, client)
+    assert len(client.upserts) == 1
+    client.remote = [{**client.upserts[0][0], "id": 7}]
+    client.upserts.clear()
+
+    counts = _push(monkeypatch, tmp_path, client)
+    assert client.upserts == []
+    assert counts == {"created": 0, "updated": 0, "unchanged": 1, "deleted": 0}
+
+    counts = _push(monkeypatch, tmp_path, client, force=True)
+    assert len(client.upserts) == 1 and counts["updated"] == 1
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+class DeleteClient:
+    def __init__(self, bulk_error: Exception | None = None, errors: dict[str, Exception] | None = None):
+        self.bulk_error = bulk_error
+        self.errors = errors or {}
+        self.bulk: list[list[str]] = []
+        self.single: list[str] = []
+
+    def bulk_delete_events(self, event_ids: list[str]) -> None:
+        self.bulk.append(event_ids)
+        if self.bulk_error:
+            raise self.bulk_error
+
+    def delete_event(self, event_id: str) -> None:
+        self.single.append(event_id)
+        if event_id in self.errors:
+            raise self.errors[event_id]
+
+
+def test_delete_events_uses_one_bulk_request():
+    client = DeleteClient()
+    events = [{"id": 1}, {"id": 2}]
+    assert delete_events(client, events) == [(events[0], None), (events[1], None)]
+    assert client.bulk == [["1", "2"]] and client.single == []
+
+
+def test_delete_events_falls_back_to_single_deletes():
+    client = DeleteClient(bulk_error=_http_error(405), errors={"2": _http_error(404), "3": _http_error(500)})
+    events = [{"id": 1}, {"id": 2}, {"id": 3}]
+    results = delete_events(client, events)
+
+    assert sorted(client.single) == ["1", "2", "3"]
+    # Results keep the input order; a 404 means the event is already gone
+    assert [(e["id"], error) for e, error in results] == [(1, None), (2, None), (3, "500 error")]
+
+
+def test_delete_events_without_events_sends_nothing():
+    client = DeleteClient()
+    assert delete_events(client, []) == []
+    assert client.bulk == []
@@ -0,0 +1,33 @@
+"""Stream metrics over stored activity streams."""
+
+import pytest
+
+from stream_metrics import analyze_streams
+from streams import StreamStore
+
+ZONES = {"z1": 55, "z2": 75, "z3": 90, "z4": 105, "z5": 120}
+
+
+def _analyze(tmp_path, watts: list | None, heartrate: list | None):
+    store = StreamStore(tmp_path)
+    channels = [{"type": "watts", "data": watts}, {"type": "heartrate", "data": heartrate}]
+    store.write("a1", {"date": "2026-03-03"}, [c for c in channels if c["data"]])
+    with store.open("a1") as streams:
+        return analyze_streams(streams, "2026-03-03", ftp=250, zones=ZONES, lt1=140, lthr=165)
+
+
+def test_power_channel_shorter_than_heart_rate(tmp_path):
+    metrics = _analyze(tmp_path, [200.0] * 600, [130.0] * 3600)
+    assert metrics.seconds == 3600
+    assert metrics.power_zone_seconds == [0, 0, 600, 0, 0, 0]
+    assert metrics.hr_zone_seconds == [3600, 0, 0]
+    assert metrics.average_power == pytest.approx(200)
+    assert metrics.normalized_power == pytest.approx(200)
+
+
+def test_gaps_are_not_counted_in_zones(tmp_path):
+    watts = ([None] * 100 + [300.0] * 900) * 10
+    metrics = _analyze(tmp_path, watts, None)
+    assert metrics.seconds == 9000
+    assert metrics.power_zone_seconds == [0, 0, 0, 0, 9000, 0]
+    assert metrics.hr_zone_seconds == []
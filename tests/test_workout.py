@@ -0,0 +1,121 @@
+"""Workout text parser and serializer."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from planner import _parse_workout_blocks
+from workout import (
+    TARGET_FTP,
+    TARGET_HR,
+    WorkoutParseError,
+    normalize_durations,
+    parse_workout,
+    scale_power_text,
+    validate_workout,
+)
+
+PLAN_DIR = Path(__file__).resolve().parent.parent / "plan"
+
+
+def _plan_workouts() -> list[str]:
+    texts = []
+    for path in sorted(PLAN_DIR.glob("block_*.md")):
+        for section in re.split(r"(?=^## Week \d+)", path.read_text(), flags=re.MULTILINE):
+            texts += _parse_workout_blocks(section).values()
+    return texts
+
+
+def _steps(workout) -> list[tuple]:
+    return [
+        (workout.seconds[i], workout.target[i], workout.low[i], workout.high[i], workout.ramp[i],
+         workout.cadence_low[i], workout.cadence_high[i], workout.labels[i],
+         workout.blocks[workout.block[i]], workout.titles[workout.block[i]])
+        for i in range(len(workout))
+    ]
+
+
+PLAN_WORKOUTS = _plan_workouts()
+
+
+def test_plan_has_workouts():
+    assert PLAN_WORKOUTS
+
+
+@pytest.mark.parametrize("text", PLAN_WORKOUTS)
+def test_plan_workouts_round_trip(text):
+    workout = parse_workout(text)
+    serialized = workout.to_text()
+    again = parse_workout(serialized)
+    assert _steps(again) == _steps(workout)
+    assert again.total_seconds == workout.total_seconds
+    assert again.to_text() == serialized
+    assert validate_workout(serialized) == []
+
+
+def test_repeat_block():
+    workout = parse_workout("- Warmup 10m 55%\n\n3x\n- Work 5m 100% 90rpm\n- 3m 55%\n\n- Cooldown 5m 50%")
+    assert list(workout.blocks) == [0, 3, 0]
+    assert list(workout.counts()) == [1, 3, 3, 1]
+    assert workout.total_seconds == 10 * 60 + 3 * 8 * 60 + 5 * 60
+    assert workout.to_text() == "- Warmup 10m 55%\n\n3x\n- Work 5m 100% 90rpm\n- 3m 55%\n\n- Cooldown 5m 50%"
+
+
+def test_section_headers():
+    text = "Warmup\n- 10m 55%\n\nMain set 3x\n- 5m 100%\n- 3m 55%\n\nCooldown\n- 5m 50%"
+    workout = parse_workout(text)
+    assert workout.titles == ["Warmup", "Main set", "Cooldown"]
+    assert list(workout.blocks) == [0, 3, 0]
+    assert workout.total_seconds == 10 * 60 + 3 * 8 * 60 + 5 * 60
+    assert workout.to_text() == text
+    assert validate_workout(text) == []
+
+
+def test_min_durations_normalized():
+    workout = parse_workout("- Warmup 10min 55%\n- 1h5min 70%")
+    assert workout.to_text() == "- Warmup 10m 55%\n- 1h5m 70%"
+    assert validate_workout("- 10min 55%") == ["line 1: use 'm' not 'min' in '10min'"]
+
+
+def test_unparseable_step_raises():
+    with pytest.raises(WorkoutParseError):
+        parse_workout("- Warmup 55%")
+
+
+@pytest.mark.parametrize("target", ["200w-250w", "88%-93%"])
+def test_malformed_target_is_an_error(target):
+    assert validate_workout(f"- 10m {target}") == [
+        f"line 1: unrecognized target '{target}' (expected e.g. 88-93% or 200-250w)"
+    ]
+    with pytest.raises(WorkoutParseError):
+        parse_workout(f"- 10m {target}")
+
+
+def test_step_without_dash_warns():
+    assert validate_workout("10m 55%") == ["line 1: '10m 55%' looks like a step but has no '-' prefix"]
+
+
+def test_scaled_reduces_both_ramp_bounds():
+    workout = parse_workout("- Warmup Ramp 10m 50-75%\n- 5m 200-220w\n- 20m 60% HR")
+    scaled = workout.scaled(0.9)
+    assert scaled.ramp[0]
+    assert (scaled.low[0], scaled.high[0]) == (45, 67)
+    assert (scaled.low[1], scaled.high[1]) == (180, 198)
+    assert scaled.target[2] == TARGET_HR and (scaled.low[2], scaled.high[2]) == (60, 60)
+    assert scaled.to_text() == "- Warmup Ramp 10m 45-67%\n- 5m 180-198w\n- 20m 60% HR"
+    assert workout.low[0] == 50  # the original is untouched
+
+
+def test_scaled_keeps_structure():
+    workout = parse_workout("Main set 4x\n- 3m 115%\n- 3m 50%")
+    scaled = workout.scaled(0.95)
+    assert scaled.titles == ["Main set"] and list(scaled.blocks) == [4]
+    assert scaled.target[0] == TARGET_FTP and scaled.low[0] == 109
+
+
+def test_text_fallbacks():
+    assert normalize_durations("Easy 45min, then 10min at 90%") == "Easy 45m, then 10m at 90%"
+    assert scale_power_text("- Ramp 10m 50-75%\n- 5m 250w\n- 20m 60% HR", 0.9) == (
+        "- Ramp 10m 45-67%\n- 5m 225w\n- 20m 60% HR"
+    )